@@ -0,0 +1,66 @@
+"""Núcleo de cálculo da auditoria previdenciária da Oliveira Office Law
+
+O pacote não depende do Streamlit. Os nomes abaixo podem ser importados
+direto de ``auditoria``; o submódulo correspondente só é carregado no
+primeiro acesso (PEP 562), então ``import auditoria`` não traz pandas nem
+matplotlib para processos que só fazem cálculo.
+"""
+
+import importlib
+
+# Nome exportado -> submódulo que o define
+_EXPORTACOES = {
+    'analisar_contribuicoes': 'cnis',
+    'analisar_lote': 'cnis',
+    'empilhar_historicos': 'cnis',
+    'calcular_fator_previdenciario': 'fator',
+    'calcular_fatores': 'fator',
+    'fator_previdenciario': 'fator',
+    'TabelaExpectativa': 'fator',
+    'tabela_expectativa': 'fator',
+    'MotorAtrasados': 'atrasados',
+    'parcelas_mensais': 'atrasados',
+    'SerieIndice': 'indices',
+    'TabelaIndices': 'indices',
+    'tabela_indices': 'indices',
+    'analisar_vinculos': 'vinculos',
+    'Caso': 'casos',
+    'analisar_fonte': 'casos',
+    'montar_caso': 'casos',
+    'resumir_caso': 'casos',
+    'obter_caso': 'casos',
+    'registrar_fonte': 'casos',
+    'Simulador': 'simulacao',
+    'Carteira': 'carteira',
+    'carteira_padrao': 'carteira',
+    'IndiceBusca': 'busca',
+    'indice_padrao': 'busca',
+    'gerar_html_relatorio': 'relatorio',
+    'escrever_relatorio': 'relatorio',
+    'convert_df_to_csv': 'exportacao',
+    'escrever_csv': 'exportacao',
+    'FilaTarefas': 'tarefas',
+    'fila_tarefas': 'tarefas',
+    'tarefa_relatorio': 'tarefas',
+    'tarefa_csv': 'tarefas',
+    'tarefa_pdf': 'tarefas',
+    'escrever_pdf': 'pdf',
+    'escrever_relatorio_pdf': 'pdf',
+    'ler_extrato': 'extrato',
+    'renderizar_grafico': 'graficos'
+}
+
+__all__ = sorted(_EXPORTACOES)
+
+
+def __getattr__(nome):
+    modulo = _EXPORTACOES.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module 'auditoria' has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f'auditoria.{modulo}'), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTACOES))
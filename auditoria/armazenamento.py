@@ -0,0 +1,210 @@
+"""Armazenamento colunar dos casos em disco, com uma partição por benefício
+
+Cada caso fica em ``<raiz>/numBeneficio=<número>/``: ``caso.json`` guarda os
+dados escalares (segurado, comparativo, parâmetros do fator, total devido e
+versão) e as tabelas ficam em arquivos Arrow IPC sem compressão, lidos por
+mapeamento de memória. As colunas são tipadas: competência como número do
+mês (int32), dinheiro em centavos (int64) e status como categoria
+(dicionário). Uso:
+
+    armazem = ArmazemCasos('casos_arrow')
+    armazem.salvar(fonte)
+    cache = CacheCasos(armazem.carregar_caso)
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from auditoria.casos import Caso, TABELAS_CASO, montar_caso, versao_fonte
+from auditoria.registros import (
+    centavos_para_reais, competencias_para_meses, reais_para_centavos
+)
+
+PREFIXO_PARTICAO = 'numBeneficio='
+ARQUIVO_CASO = 'caso.json'
+CHAVES_ESCALARES = ('segurado', 'comparativo', 'fator_previdenciario', 'total_devido')
+
+# Tipos lógicos das colunas: 'mes' (competência), 'centavos' (dinheiro),
+# 'categoria' (status), 'inteiro', 'real' e 'texto'
+ESQUEMAS = {
+    'contribuicoes_cnis': {
+        'competencia': 'mes', 'salario': 'centavos', 'indice': 'real',
+        'corrigido': 'centavos', 'status': 'categoria'
+    },
+    'vinculos_empregaticos': {
+        'seq': 'inteiro', 'nit': 'texto', 'empresa': 'texto', 'cnpj': 'texto',
+        'inicio': 'texto', 'fim': 'texto', 'status': 'categoria'
+    },
+    'evolucao_beneficio': {
+        'ano': 'inteiro', 'inss': 'centavos', 'auditoria': 'centavos',
+        'reajuste': 'real', 'indiceSinapi': 'real'
+    },
+    'diferencas_acumuladas': {
+        'ano': 'inteiro', 'mensal': 'centavos', 'meses': 'inteiro', 'acumuladoAno': 'centavos',
+        'correcao': 'centavos', 'juros': 'centavos', 'totalAno': 'centavos', 'indiceSelic': 'real'
+    }
+}
+
+_TIPOS_ARROW = {
+    'mes': pa.int32(),
+    'centavos': pa.int64(),
+    'categoria': pa.dictionary(pa.int8(), pa.string()),
+    'inteiro': pa.int64(),
+    'real': pa.float64(),
+    'texto': pa.string()
+}
+
+
+def _esquema_arrow(tabela):
+    """Esquema Arrow de uma tabela, com o tipo lógico nos metadados de cada campo"""
+    return pa.schema([
+        pa.field(coluna, _TIPOS_ARROW[tipo], metadata={'tipo': tipo})
+        for coluna, tipo in ESQUEMAS[tabela].items()
+    ])
+
+
+def _coluna_arrow(valores, tipo):
+    """Converte os valores de uma coluna dos dados de origem no array Arrow tipado"""
+    if tipo == 'mes':
+        return pa.array(competencias_para_meses(valores), type=pa.int32())
+    if tipo == 'centavos':
+        return pa.array(reais_para_centavos(valores), type=pa.int64())
+    if tipo == 'categoria':
+        return pa.array(valores, type=pa.string()).dictionary_encode().cast(_TIPOS_ARROW['categoria'])
+    return pa.array(valores, type=_TIPOS_ARROW[tipo])
+
+
+def tabela_arrow(tabela, linhas):
+    """Monta a tabela Arrow tipada a partir da lista de dicionários de origem"""
+    esquema = _esquema_arrow(tabela)
+    colunas = [
+        _coluna_arrow([linha[coluna] for linha in linhas], tipo)
+        for coluna, tipo in ESQUEMAS[tabela].items()
+    ]
+    return pa.Table.from_arrays(colunas, schema=esquema)
+
+
+def _competencias(meses):
+    """Converte um array de meses em competências ``"MM/AAAA"`` de forma vetorizada"""
+    ano, indice = np.divmod(meses.astype(np.int64), 12)
+    mes = np.char.zfill((indice + 1).astype(str), 2)
+    return np.char.add(np.char.add(mes, '/'), ano.astype(str)).astype(object)
+
+
+def dataframe_tabela(tabela, arrow):
+    """Converte uma tabela Arrow tipada no DataFrame exibido pelo dashboard
+
+    Dinheiro volta a reais (float64), competências voltam a ``"MM/AAAA"`` e
+    o status vira ``pd.Categorical``; as demais colunas numéricas são
+    convertidas sem cópia sempre que possível.
+    """
+    colunas = {}
+    for coluna, tipo in ESQUEMAS[tabela].items():
+        valores = arrow.column(coluna).combine_chunks()
+        if tipo == 'mes':
+            colunas[coluna] = _competencias(valores.to_numpy())
+        elif tipo == 'centavos':
+            colunas[coluna] = centavos_para_reais(valores.to_numpy())
+        elif tipo == 'categoria':
+            colunas[coluna] = pd.Categorical.from_codes(
+                valores.indices.to_numpy(), categories=valores.dictionary.to_pylist()
+            )
+        elif tipo == 'texto':
+            colunas[coluna] = valores.to_numpy(zero_copy_only=False)
+        else:
+            colunas[coluna] = valores.to_numpy()
+    return pd.DataFrame(colunas)
+
+
+def _gravar_atomico(destino, gravar):
+    """Grava em arquivo temporário no mesmo diretório e o renomeia ao final"""
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            gravar(arquivo)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+class ArmazemCasos:
+    """Repositório colunar de casos em disco, particionado por número do benefício"""
+
+    def __init__(self, raiz):
+        self.raiz = Path(raiz)
+
+    def particao(self, num_beneficio):
+        """Diretório da partição de um caso"""
+        return self.raiz / f"{PREFIXO_PARTICAO}{num_beneficio}"
+
+    def numeros(self):
+        """Números de benefício dos casos armazenados, em ordem"""
+        if not self.raiz.is_dir():
+            return []
+        return sorted(
+            caminho.name[len(PREFIXO_PARTICAO):]
+            for caminho in self.raiz.iterdir()
+            if caminho.name.startswith(PREFIXO_PARTICAO) and (caminho / ARQUIVO_CASO).is_file()
+        )
+
+    def __contains__(self, num_beneficio):
+        return (self.particao(num_beneficio) / ARQUIVO_CASO).is_file()
+
+    def salvar(self, fonte):
+        """Grava os dados de origem de um caso e devolve a versão gravada
+
+        As tabelas são gravadas antes de ``caso.json``, que marca a partição
+        como completa; cada arquivo é substituído de forma atômica.
+        """
+        num_beneficio = fonte['segurado']['numBeneficio']
+        particao = self.particao(num_beneficio)
+        particao.mkdir(parents=True, exist_ok=True)
+
+        for tabela in TABELAS_CASO:
+            arrow = tabela_arrow(tabela, fonte[tabela])
+
+            def gravar(arquivo, arrow=arrow):
+                with ipc.new_file(arquivo, arrow.schema) as escritor:
+                    escritor.write_table(arrow)
+
+            _gravar_atomico(particao / f"{tabela}.arrow", gravar)
+
+        versao = versao_fonte(fonte)
+        escalares = {chave: fonte[chave] for chave in CHAVES_ESCALARES}
+        escalares['versao'] = versao
+        conteudo = json.dumps(escalares, ensure_ascii=False, indent=1).encode('utf-8')
+        _gravar_atomico(particao / ARQUIVO_CASO, lambda arquivo: arquivo.write(conteudo))
+        return versao
+
+    def ler_escalares(self, num_beneficio):
+        """Lê os dados escalares e a versão de um caso"""
+        caminho = self.particao(num_beneficio) / ARQUIVO_CASO
+        if not caminho.is_file():
+            raise KeyError(f"Caso com benefício {num_beneficio} não armazenado")
+        with open(caminho, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+    def abrir_tabela(self, num_beneficio, tabela):
+        """Abre uma tabela do caso por mapeamento de memória, sem copiar os dados"""
+        if tabela not in ESQUEMAS:
+            raise ValueError(f"Tabela desconhecida: {tabela}")
+        caminho = self.particao(num_beneficio) / f"{tabela}.arrow"
+        with pa.memory_map(str(caminho), 'r') as mapa:
+            return ipc.open_file(mapa).read_all()
+
+    def carregar_caso(self, num_beneficio):
+        """Monta o ``Caso`` a partir da partição; serve de carregador para ``CacheCasos``"""
+        escalares = self.ler_escalares(num_beneficio)
+        tabelas = {
+            tabela: dataframe_tabela(tabela, self.abrir_tabela(num_beneficio, tabela))
+            for tabela in TABELAS_CASO
+        }
+        return Caso(num_beneficio, escalares.pop('versao'), montar_caso(escalares, tabelas))
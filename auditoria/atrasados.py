@@ -0,0 +1,216 @@
+"""Cálculo incremental dos atrasados (diferenças, correção e juros)
+
+O motor guarda, por ano, somas já divididas pelo fator de correção
+acumulado até o mês de cada diferença. Com isso, lançar uma competência
+nova ou um novo mês de índice (correção monetária e juros) custa O(1), e os
+totais de ``total_devido`` saem em O(1), sem refazer o cálculo desde a DER.
+
+Para a diferença ``d`` da competência ``m`` e o último mês de índice ``T``:
+
+    corrigido = d * F(T) / F(m)          F = produto acumulado de (1 + correção)
+    juros     = corrigido * (J(T) - J(m)) J = soma acumulada das taxas de juros
+
+Competências posteriores ao último índice ficam pelo valor de face até a
+chegada do índice do seu mês.
+"""
+
+from collections import defaultdict
+
+from auditoria.registros import competencia_para_mes, mes_para_competencia
+
+PRAZOS_PARCELAMENTO = (24, 36, 60)
+TAXA_PARCELAMENTO = 0.005  # Tabela Price, 0,5% a.m.
+
+
+def _mes(competencia):
+    """Aceita competência ``"MM/AAAA"`` ou o número do mês"""
+    return competencia_para_mes(competencia) if isinstance(competencia, str) else int(competencia)
+
+
+def parcelas_mensais(total, prazos=PRAZOS_PARCELAMENTO, taxa=TAXA_PARCELAMENTO):
+    """Valor das parcelas de um total pela Tabela Price, para cada prazo"""
+    parcelas = {}
+    for prazo in prazos:
+        if taxa:
+            valor = total * taxa / (1 - (1 + taxa) ** -prazo)
+        else:
+            valor = total / prazo
+        parcelas[f"valor{prazo}"] = round(valor, 2)
+    return parcelas
+
+
+class _Ano:
+    """Acumuladores de um ano de competências"""
+
+    __slots__ = ('soma', 'pendente', 'a', 'c', 'meses', 'ultimo_mes', 'mensal', 'juros_ano')
+
+    def __init__(self):
+        self.soma = 0.0      # diferenças pelo valor de face
+        self.pendente = 0.0  # parte da soma ainda sem índice do mês
+        self.a = 0.0         # soma de d / F(m)
+        self.c = 0.0         # soma de d * J(m) / F(m)
+        self.meses = 0
+        self.ultimo_mes = None
+        self.mensal = 0.0
+        self.juros_ano = 0.0  # soma das taxas de juros dos meses do ano
+
+
+class MotorAtrasados:
+    """Motor incremental de atrasados de um benefício
+
+    ``mes_inicial`` é a primeira competência devida (em geral a DIB). Os
+    índices devem ser lançados mês a mês, sem lacunas, a partir dela.
+    """
+
+    def __init__(self, mes_inicial, prazos=PRAZOS_PARCELAMENTO, taxa_parcelamento=TAXA_PARCELAMENTO):
+        self.mes_inicial = _mes(mes_inicial)
+        self.prazos = tuple(prazos)
+        self.taxa_parcelamento = taxa_parcelamento
+        self._fatores = []  # F(m) por mês, a partir de mes_inicial
+        self._juros = []    # J(m) por mês, a partir de mes_inicial
+        self._diferencas = {}
+        self._pendentes = {}
+        self._anos = defaultdict(_Ano)
+        self._soma = self._pendente = self._a = self._c = 0.0
+
+    @property
+    def ultimo_indice(self):
+        """Último mês com índice lançado, ou None"""
+        return self.mes_inicial + len(self._fatores) - 1 if self._fatores else None
+
+    def _fator(self):
+        return self._fatores[-1] if self._fatores else 1.0
+
+    def _juros_acumulados(self):
+        return self._juros[-1] if self._juros else 0.0
+
+    def _aplicar(self, mes, valor, sinal):
+        """Soma (ou retira, com ``sinal=-1``) uma diferença dos acumuladores"""
+        ano = self._anos[mes // 12]
+        ano.soma += sinal * valor
+        ano.meses += sinal
+        self._soma += sinal * valor
+        indice = mes - self.mes_inicial
+        if indice < len(self._fatores):
+            a = valor / self._fatores[indice]
+            c = a * self._juros[indice]
+            ano.a += sinal * a
+            ano.c += sinal * c
+            self._a += sinal * a
+            self._c += sinal * c
+        else:
+            ano.pendente += sinal * valor
+            self._pendente += sinal * valor
+
+    def lancar_diferenca(self, competencia, valor):
+        """Lança (ou substitui) a diferença mensal devida em uma competência"""
+        mes = _mes(competencia)
+        if mes < self.mes_inicial:
+            raise ValueError(f"Competência {mes_para_competencia(mes)} anterior ao início dos atrasados")
+        anterior = self._diferencas.get(mes)
+        if anterior is not None:
+            self._aplicar(mes, anterior, -1)
+        self._diferencas[mes] = valor
+        if self.ultimo_indice is None or mes > self.ultimo_indice:
+            self._pendentes[mes] = valor
+        self._aplicar(mes, valor, 1)
+
+        ano = self._anos[mes // 12]
+        if ano.ultimo_mes is None or mes >= ano.ultimo_mes:
+            ano.ultimo_mes = mes
+            ano.mensal = valor
+
+    def lancar_indice(self, competencia, correcao, juros=0.0):
+        """Lança as taxas mensais de correção monetária e de juros do mês seguinte
+
+        As taxas são frações (0,005 = 0,5%). A diferença da própria
+        competência passa a ser corrigida a partir do mês seguinte.
+        """
+        mes = _mes(competencia)
+        esperado = self.mes_inicial if self.ultimo_indice is None else self.ultimo_indice + 1
+        if mes != esperado:
+            raise ValueError(
+                f"Índice de {mes_para_competencia(mes)} fora de sequência; "
+                f"esperado {mes_para_competencia(esperado)}"
+            )
+        # A diferença deste mês deixa de ser pendente e passa a ser corrigida
+        valor = self._pendentes.pop(mes, None)
+        if valor is not None:
+            self._aplicar(mes, valor, -1)
+        self._fatores.append(self._fator() * (1 + correcao))
+        self._juros.append(self._juros_acumulados() + juros)
+        self._anos[mes // 12].juros_ano += juros
+        if valor is not None:
+            self._aplicar(mes, valor, 1)
+
+    def lancar_indices_da_tabela(self, tabela, ate, correcao, juros=None):
+        """Lança os meses ainda sem índice até ``ate`` a partir de uma ``TabelaIndices``"""
+        serie_correcao = tabela[correcao]
+        serie_juros = tabela[juros] if juros is not None else None
+        inicio = self.mes_inicial if self.ultimo_indice is None else self.ultimo_indice + 1
+        for mes in range(inicio, _mes(ate) + 1):
+            taxa_juros = serie_juros.taxa_acumulada(mes - 1, mes) if serie_juros is not None else 0.0
+            self.lancar_indice(mes, serie_correcao.fator(mes - 1, mes) - 1, taxa_juros)
+
+    def _valores(self, soma, pendente, a, c):
+        """Correção e juros de um conjunto de diferenças a partir dos acumuladores"""
+        fator = self._fator()
+        correcao = fator * a - (soma - pendente)
+        juros = fator * (self._juros_acumulados() * a - c)
+        return correcao, juros
+
+    def total_devido(self):
+        """Totais no formato de ``total_devido``, calculados em O(1)"""
+        correcao, juros = self._valores(self._soma, self._pendente, self._a, self._c)
+        total = self._soma + correcao + juros
+        return {
+            "diferencasVencidas": round(self._soma, 2),
+            "correcaoMonetaria": round(correcao, 2),
+            "jurosLegais": round(juros, 2),
+            "totalGeral": round(total, 2),
+            "parcelasMensais": parcelas_mensais(total, self.prazos, self.taxa_parcelamento)
+        }
+
+    def diferencas_acumuladas(self):
+        """Linhas por ano no formato de ``diferencas_acumuladas``"""
+        linhas = []
+        for numero_ano in sorted(self._anos):
+            ano = self._anos[numero_ano]
+            if ano.meses == 0:
+                continue
+            correcao, juros = self._valores(ano.soma, ano.pendente, ano.a, ano.c)
+            linhas.append({
+                "ano": numero_ano,
+                "mensal": round(ano.mensal, 2),
+                "meses": ano.meses,
+                "acumuladoAno": round(ano.soma, 2),
+                "correcao": round(correcao, 2),
+                "juros": round(juros, 2),
+                "totalAno": round(ano.soma + correcao + juros, 2),
+                "indiceSelic": round(ano.juros_ano * 100, 2)
+            })
+        return linhas
+
+    def estado(self):
+        """Estado serializável em JSON, para retomar o cálculo no mês seguinte"""
+        return {
+            "mesInicial": self.mes_inicial,
+            "prazos": list(self.prazos),
+            "taxaParcelamento": self.taxa_parcelamento,
+            "fatores": list(self._fatores),
+            "juros": list(self._juros),
+            "diferencas": {str(mes): valor for mes, valor in self._diferencas.items()}
+        }
+
+    @classmethod
+    def de_estado(cls, estado):
+        """Reconstrói o motor a partir de ``estado()``"""
+        motor = cls(estado["mesInicial"], estado["prazos"], estado["taxaParcelamento"])
+        motor._fatores = list(estado["fatores"])
+        motor._juros = list(estado["juros"])
+        for mes, juros in enumerate(motor._juros):
+            anterior = motor._juros[mes - 1] if mes else 0.0
+            motor._anos[(motor.mes_inicial + mes) // 12].juros_ano += juros - anterior
+        for mes, valor in sorted((int(mes), valor) for mes, valor in estado["diferencas"].items()):
+            motor.lancar_diferenca(mes, valor)
+        return motor
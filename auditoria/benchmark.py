@@ -0,0 +1,505 @@
+"""Benchmark do pipeline de auditoria em carteiras sintéticas
+
+Uso:
+    python -m auditoria.benchmark [--tamanhos 10 100 1000 10000] [--repeticoes N]
+                                  [--linha-base benchmarks/linha_base.json] [--atualizar-linha-base]
+
+Gera históricos CNIS sintéticos e reprodutíveis (semente fixa, 50 a 400
+competências por segurado) e mede as etapas do dashboard: carga do caso,
+seleção dos 80% maiores salários, contagem dos períodos incorretos, fator
+previdenciário, totais de atrasados, relatório HTML e exportação CSV.
+
+Para cada etapa são informados o tempo (melhor de N repetições), a vazão em
+segurados por segundo e o pico de memória alocada (``tracemalloc``, medido
+em uma passada à parte para não distorcer os tempos). Com uma linha de
+base gravada, uma etapa mais lenta ou mais pesada que o tolerado faz o
+comando terminar com código 1 e a lista das regressões.
+
+Antes das carteiras é medida a importação a frio dos módulos de cálculo
+(``MODULOS_NUCLEO``), cada um em um interpretador novo: acima de
+``META_IMPORTACAO_SEGUNDOS``, ou trazendo Streamlit, matplotlib, pandas ou
+pyarrow, também conta como regressão.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from auditoria.atrasados import MotorAtrasados
+from auditoria.casos import Caso, montar_caso, versao_fonte
+from auditoria.cnis import _mascara_maiores, _resumir, empilhar_historicos, quantidade_considerada
+from auditoria.exemplo import CASO_EXEMPLO
+from auditoria.exportacao import escrever_csv, gravar_partes
+from auditoria.fator import TabelaExpectativa, calcular_fatores
+from auditoria.indices import indices_exemplo
+from auditoria.perfil import Perfilador, ativar, medir
+from auditoria.registros import (
+    DTYPE_CONTRIBUICAO, competencia_para_mes, dataframe_contribuicoes, mes_para_competencia, quadro_registros
+)
+from auditoria.relatorio import gerar_relatorio_bytes
+
+TAMANHOS = (10, 100, 1000, 10000)
+COMPETENCIAS = (50, 400)
+SEMENTE = 20250429
+ARQUIVO_LINHA_BASE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'linha_base.json'
+
+# Vazão pode cair até 30% e o pico de memória subir até 30% sem falhar
+TOLERANCIA = 0.3
+
+# Etapas mais rápidas que isso na linha de base ficam fora da comparação de
+# vazão, pois o ruído do relógio e do agendador domina a medida
+MINIMO_SEGUNDOS = 0.005
+
+# Folga absoluta do pico de memória: picos de poucos KiB variam mais que a
+# tolerância só pelo ruído do alocador
+MINIMO_BYTES = 64 * 1024
+
+# Carteiras maiores que isso são medidas uma única vez por padrão
+MAXIMO_REPETICOES_COMPLETAS = 1000
+
+# Casos usados na passada de memória das etapas feitas caso a caso
+AMOSTRA_MEMORIA = 200
+
+# Importação a frio do núcleo de cálculo, em um interpretador novo por medida
+MODULOS_NUCLEO = (
+    'auditoria', 'auditoria.cnis', 'auditoria.fator', 'auditoria.atrasados',
+    'auditoria.relatorio', 'auditoria.casos', 'auditoria.lote', 'auditoria.dossies'
+)
+MODULOS_PESADOS = ('streamlit', 'matplotlib', 'pandas', 'pyarrow')
+META_IMPORTACAO_SEGUNDOS = 0.25
+
+_CODIGO_IMPORTACAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+segundos = time.perf_counter() - inicio
+print(json.dumps({{"segundos": segundos, "pesados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+ETAPAS = (
+    "carga_caso", "selecao_80", "periodos_incorretos", "fator_previdenciario",
+    "atrasados", "relatorio_html", "exportacao_csv"
+)
+
+# Atrasados sintéticos: da primeira competência das séries de exemplo até a última do caso
+INICIO_ATRASADOS = "01/2015"
+FIM_ATRASADOS = "04/2025"
+
+
+class _Descarte:
+    """Destino de escrita que só conta os bytes recebidos"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, dados):
+        self.bytes += len(dados)
+        return len(dados)
+
+
+def tabela_expectativa_sintetica():
+    """Tábua de Es plausível para DER de 2010 a 2014 e idades de 50 a 75 anos"""
+    return TabelaExpectativa({
+        (ano, idade): round(21.8 + (60 - idade) * 0.8 + (ano - 2014) * 0.15, 1)
+        for ano in range(2010, 2015) for idade in range(50, 76)
+    })
+
+
+def gerar_fontes(quantidade, semente=SEMENTE, competencias=COMPETENCIAS):
+    """Gera ``quantidade`` casos sintéticos no formato de ``CASO_EXEMPLO``
+
+    Cada segurado tem entre ``competencias[0]`` e ``competencias[1]``
+    contribuições mensais terminando na DER, com cerca de 20% indeferidas.
+    A mesma semente produz sempre a mesma carteira.
+    """
+    rng = np.random.default_rng(semente)
+    base = {chave: valor for chave, valor in CASO_EXEMPLO.items() if chave != 'contribuicoes_cnis'}
+    for numero in range(quantidade):
+        fonte = copy.deepcopy(base)
+        ano_der = int(rng.integers(2010, 2015))
+        idade = float(np.round(rng.uniform(52, 70), 2))
+        tempo = float(np.round(rng.uniform(30, 40), 2))
+        total = int(rng.integers(competencias[0], competencias[1] + 1))
+
+        segurado = fonte['segurado']
+        segurado['numBeneficio'] = f"{900000000 + numero:09d}-{numero % 10}"
+        segurado['nome'] = f"SEGURADO SINTETICO {numero:05d}"
+        segurado['dataRequerimento'] = f"11/12/{ano_der}"
+        fonte['fator_previdenciario'].update(tempoContribuicao=tempo, idade=idade, expectativaSobrevida=None)
+
+        ultimo_mes = ano_der * 12 + 10
+        meses = np.arange(ultimo_mes - total + 1, ultimo_mes + 1)
+        salarios = np.round(rng.lognormal(8.2, 0.4, total), 2)
+        indices = np.round(1 + (ultimo_mes - meses) * 0.005, 3)
+        indeferidos = rng.random(total) < 0.2
+        fonte['contribuicoes_cnis'] = [
+            {
+                "competencia": mes_para_competencia(int(mes)),
+                "salario": float(salario),
+                "indice": float(indice),
+                "corrigido": float(round(salario * indice, 2)),
+                "status": "Indeferido" if indeferido else "Considerado"
+            }
+            for mes, salario, indice, indeferido in zip(meses, salarios, indices, indeferidos)
+        ]
+        fonte['comparativo']['inss']['totalContribuicoes'] = total
+        fonte['comparativo']['auditoria']['totalContribuicoes'] = total
+        yield fonte
+
+
+def _carregar(fonte, tabela):
+    """Carga do caso como em ``casos.carregar_caso``, com Es da tábua sintética"""
+    parametros = fonte['fator_previdenciario']
+    fonte = dict(fonte, fator_previdenciario=dict(
+        parametros,
+        expectativaSobrevida=float(tabela.expectativa(int(fonte['segurado']['dataRequerimento'][-4:]), parametros['idade']))
+    ))
+    return Caso(fonte['segurado']['numBeneficio'], versao_fonte(fonte), montar_caso(fonte))
+
+
+def _atrasados(diferenca_mensal, indices):
+    """Totais de atrasados de um segurado com diferença mensal constante"""
+    motor = MotorAtrasados(INICIO_ATRASADOS)
+    for mes in range(motor.mes_inicial, competencia_para_mes(FIM_ATRASADOS) + 1):
+        motor.lancar_diferenca(mes, diferenca_mensal)
+    motor.lancar_indices_da_tabela(indices, FIM_ATRASADOS, 'sinapi', 'selic')
+    return motor.total_devido()
+
+
+def _grupos_por_tamanho(valores, indeferidos, deslocamentos):
+    """Matrizes por tamanho de histórico, como em ``cnis.analisar_lote``"""
+    tamanhos = np.diff(deslocamentos)
+    grupos = []
+    for tamanho in np.unique(tamanhos):
+        linhas = np.flatnonzero(tamanhos == tamanho)
+        posicoes = deslocamentos[linhas][:, None] + np.arange(tamanho)
+        grupos.append((int(quantidade_considerada(tamanho)), valores[posicoes], indeferidos[posicoes]))
+    return grupos
+
+
+def _executar(fontes, tabela, indices, cronometro, limite_casos=None):
+    """Executa as etapas sobre a carteira; ``cronometro(etapa)`` é um gerenciador de contexto"""
+    # Etapas vetorizadas sobre a carteira inteira
+    historicos = [
+        (
+            np.fromiter((c['corrigido'] for c in fonte['contribuicoes_cnis']), dtype=np.float64),
+            np.fromiter((c['status'] == 'Indeferido' for c in fonte['contribuicoes_cnis']), dtype=bool)
+        )
+        for fonte in fontes
+    ]
+    grupos = _grupos_por_tamanho(*empilhar_historicos(historicos))
+    with cronometro("selecao_80"):
+        selecoes = [_mascara_maiores(matriz, k) for k, matriz, _ in grupos]
+    with cronometro("periodos_incorretos"):
+        for (_, matriz, indeferidos), selecionados in zip(grupos, selecoes):
+            _resumir(matriz, indeferidos, selecionados)
+
+    parametros = [fonte['fator_previdenciario'] for fonte in fontes]
+    tempo = np.array([p['tempoContribuicao'] for p in parametros])
+    idade = np.array([p['idade'] for p in parametros])
+    ano_der = np.array([int(fonte['segurado']['dataRequerimento'][-4:]) for fonte in fontes])
+    with cronometro("fator_previdenciario"):
+        calcular_fatores(tempo, idade, ano_der, tabela=tabela)
+
+    # Etapas feitas caso a caso, sem manter a carteira montada em memória
+    with cronometro("atrasados"):
+        for fonte in fontes[:limite_casos]:
+            _atrasados(fonte['diferencas_acumuladas'][0]['mensal'], indices)
+
+    for fonte in fontes[:limite_casos]:
+        with cronometro("carga_caso"):
+            caso = _carregar(fonte, tabela)
+        with cronometro("relatorio_html"):
+            gravar_partes(gerar_relatorio_bytes(caso), _Descarte())
+        with cronometro("exportacao_csv"):
+            escrever_csv(caso['contribuicoes_cnis'], _Descarte())
+
+
+def medir_carteira(tamanho, repeticoes=None, semente=SEMENTE):
+    """Tempo, vazão e pico de memória de cada etapa para uma carteira de ``tamanho`` segurados
+
+    Sem ``repeticoes``, carteiras de até ``MAXIMO_REPETICOES_COMPLETAS``
+    segurados são medidas três vezes e as maiores, uma.
+    """
+    if repeticoes is None:
+        repeticoes = 3 if tamanho <= MAXIMO_REPETICOES_COMPLETAS else 1
+    fontes = list(gerar_fontes(tamanho, semente))
+    competencias = sum(len(fonte['contribuicoes_cnis']) for fonte in fontes)
+    tabela = tabela_expectativa_sintetica()
+    indices = indices_exemplo()
+
+    melhores = dict.fromkeys(ETAPAS, float('inf'))
+    for _ in range(repeticoes):
+        perfilador = Perfilador()
+        with ativar(perfilador):
+            _executar(fontes, tabela, indices, medir)
+        for linha in perfilador.resumo():
+            melhores[linha["trecho"]] = min(melhores[linha["trecho"]], linha["segundos"])
+
+    # Passada de memória à parte: o tracemalloc deixa tudo mais lento
+    perfilador = Perfilador(memoria=True)
+    with ativar(perfilador):
+        _executar(fontes, tabela, indices, medir, AMOSTRA_MEMORIA)
+    picos = {linha["trecho"]: linha["picoBytes"] for linha in perfilador.resumo()}
+
+    return {
+        "segurados": tamanho,
+        "competencias": competencias,
+        "etapas": {
+            etapa: {
+                "segundos": melhores[etapa],
+                "seguradosPorSegundo": tamanho / melhores[etapa] if melhores[etapa] > 0 else float('inf'),
+                "picoBytes": picos.get(etapa, 0)
+            }
+            for etapa in ETAPAS
+        }
+    }
+
+
+def medir_importacao(modulo, repeticoes=5):
+    """Menor tempo de importação a frio de ``modulo`` e os módulos pesados que ele carrega"""
+    codigo = _CODIGO_IMPORTACAO.format(modulo=modulo, pesados=MODULOS_PESADOS)
+    raiz = Path(__file__).resolve().parent.parent
+    medidas = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', codigo], cwd=raiz, capture_output=True, text=True, check=True
+        ).stdout
+        medidas.append(json.loads(saida))
+    return {"segundos": min(medida["segundos"] for medida in medidas), "pesados": medidas[0]["pesados"]}
+
+
+def verificar_importacao(modulos=MODULOS_NUCLEO, meta=META_IMPORTACAO_SEGUNDOS, repeticoes=5):
+    """Mede a importação a frio do núcleo e lista os módulos acima da meta ou que trazem dependências pesadas"""
+    problemas = []
+    print(f"Importação a frio (meta {meta * 1000:.0f} ms)")
+    for modulo in modulos:
+        medida = medir_importacao(modulo, repeticoes)
+        print(f"  {modulo:<22} {medida['segundos'] * 1000:10.1f} ms  {', '.join(medida['pesados']) or '-'}")
+        if medida["segundos"] > meta:
+            problemas.append(f"importação de {modulo}: {medida['segundos'] * 1000:.1f} ms (meta {meta * 1000:.0f} ms)")
+        if medida["pesados"]:
+            problemas.append(f"importação de {modulo} carrega {', '.join(medida['pesados'])}")
+    return problemas
+
+
+def medir_memoria_registros(linhas=1_000_000, semente=SEMENTE):
+    """Bytes ocupados por ``linhas`` contribuições em cada representação
+
+    Compara a lista de dicionários da fonte, o DataFrame com colunas de
+    objetos montado a partir dela, o DataFrame do dashboard (status
+    categórico) e o array estruturado ``DTYPE_CONTRIBUICAO``, que também
+    serve de base, sem cópia, para ``quadro_registros``.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(semente)
+    registros = np.empty(linhas, dtype=DTYPE_CONTRIBUICAO)
+    registros['competencia'] = rng.integers(1994 * 12, 2025 * 12, linhas)
+    registros['salario'] = rng.integers(100_000, 1_000_000, linhas)
+    registros['indice'] = np.round(rng.uniform(1, 3, linhas), 3)
+    registros['corrigido'] = np.rint(registros['salario'] * registros['indice'])
+    registros['status'] = rng.random(linhas) < 0.2
+
+    dashboard = dataframe_contribuicoes(registros)
+    objetos = dashboard.astype({'competencia': object, 'status': object})
+
+    tracemalloc.start()
+    try:
+        lista = objetos.to_dict('records')
+        bytes_lista = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del lista
+
+    return {
+        "linhas": linhas,
+        "listaDicionarios": bytes_lista,
+        "dataframeObjetos": int(objetos.memory_usage(deep=True).sum()),
+        "dataframeDashboard": int(dashboard.memory_usage(deep=True).sum()),
+        "arrayEstruturado": registros.nbytes,
+        "quadroSemCopia": all(
+            np.shares_memory(coluna.to_numpy(), registros) for _, coluna in quadro_registros(registros).items()
+        )
+    }
+
+
+def medir_memoria_sessoes(sessoes=10, compartilhar=True):
+    """Memória retida por sessões simultâneas do dashboard (``AppTest``)
+
+    Abre ``sessoes`` sessões mantidas vivas ao mesmo tempo e mede, com
+    ``tracemalloc``, a memória retida após cada uma e o pico alocado em uma
+    reexecução. Com ``compartilhar=False`` os dados de referência são
+    montados de novo a cada uso. ``razaoLinear`` é a memória total dividida
+    por ``sessoes`` vezes a da primeira sessão: abaixo de 1, o crescimento
+    é sublinear.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from auditoria.casos import CACHE_CASOS
+    from auditoria.graficos import CACHE_GRAFICOS
+    from auditoria.referencia import compartilhar_referencia
+
+    arquivo_app = str(Path(__file__).resolve().parent.parent / 'app.py')
+    # Sessão de aquecimento, fora da medida: importações e código compilado
+    AppTest.from_file(arquivo_app, default_timeout=120).run()
+    anterior = compartilhar_referencia(compartilhar)
+    CACHE_CASOS.limpar()
+    CACHE_GRAFICOS.limpar()
+    abertas, retidos, picos = [], [], []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in range(sessoes):
+            sessao = AppTest.from_file(arquivo_app, default_timeout=120)
+            sessao.run()
+            abertas.append(sessao)
+            gc.collect()
+            retidos.append(tracemalloc.get_traced_memory()[0] - base)
+
+            antes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            sessao.run()
+            picos.append(tracemalloc.get_traced_memory()[1] - antes)
+        gc.collect()
+        total = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+        compartilhar_referencia(anterior)
+    return {
+        "sessoes": sessoes,
+        "compartilhado": compartilhar,
+        "bytesPrimeiraSessao": retidos[0],
+        "bytesPorSessaoAdicional": (total - retidos[0]) / (sessoes - 1) if sessoes > 1 else 0.0,
+        "bytesTotal": total,
+        "picoReexecucao": max(picos),
+        "razaoLinear": total / (sessoes * retidos[0]) if retidos[0] else 0.0
+    }
+
+
+def ambiente():
+    """Versões e máquina em que as medições foram feitas"""
+    import pandas
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pandas.__version__,
+        "maquina": platform.machine(),
+        "sistema": platform.system()
+    }
+
+
+def comparar(resultados, linha_base, tolerancia=TOLERANCIA):
+    """Lista as regressões em relação à linha de base (vazão menor ou memória maior)"""
+    regressoes = []
+    for resultado in resultados:
+        base = linha_base.get("carteiras", {}).get(str(resultado["segurados"]))
+        if base is None:
+            continue
+        for etapa, medida in resultado["etapas"].items():
+            referencia = base["etapas"].get(etapa)
+            if referencia is None:
+                continue
+            minimo = referencia["seguradosPorSegundo"] * (1 - tolerancia)
+            if referencia["segundos"] >= MINIMO_SEGUNDOS and medida["seguradosPorSegundo"] < minimo:
+                regressoes.append(
+                    f"{resultado['segurados']} segurados, {etapa}: {medida['seguradosPorSegundo']:.1f} segurados/s "
+                    f"(linha de base {referencia['seguradosPorSegundo']:.1f}, mínimo {minimo:.1f})"
+                )
+            maximo = max(referencia["picoBytes"] * (1 + tolerancia), referencia["picoBytes"] + MINIMO_BYTES)
+            if medida["picoBytes"] > maximo:
+                regressoes.append(
+                    f"{resultado['segurados']} segurados, {etapa}: pico de {medida['picoBytes'] / 2**20:.2f} MiB "
+                    f"(linha de base {referencia['picoBytes'] / 2**20:.2f} MiB, máximo {maximo / 2**20:.2f} MiB)"
+                )
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de auditoria previdenciária")
+    parser.add_argument('--tamanhos', type=int, nargs='*', default=list(TAMANHOS), help="segurados por carteira")
+    parser.add_argument('--repeticoes', type=int, default=None,
+                        help="repetições por carteira, vale o melhor tempo (padrão: 3 até 1000 segurados, 1 acima)")
+    parser.add_argument('--semente', type=int, default=SEMENTE, help="semente da carteira sintética")
+    parser.add_argument('--linha-base', default=str(ARQUIVO_LINHA_BASE), help="arquivo JSON da linha de base")
+    parser.add_argument('--atualizar-linha-base', action='store_true', help="grava as medições como nova linha de base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA, help="piora relativa aceita (0.3 = 30%%)")
+    parser.add_argument('--json', help="grava também os resultados neste arquivo")
+    parser.add_argument('--sem-importacao', action='store_true', help="não mede a importação a frio do núcleo")
+    parser.add_argument('--memoria-registros', type=int, nargs='?', const=1_000_000, metavar='LINHAS',
+                        help="informa a memória das representações das contribuições (padrão: 1 milhão de linhas)")
+    parser.add_argument('--sessoes', type=int, metavar='N',
+                        help="mede a memória de N sessões simultâneas, com e sem dados de referência compartilhados")
+    args = parser.parse_args(argv)
+
+    if args.sessoes:
+        print(f"Memória de {args.sessoes} sessões simultâneas do dashboard")
+        for compartilhar in (False, True):
+            medida = medir_memoria_sessoes(args.sessoes, compartilhar)
+            print(f"  {'com' if compartilhar else 'sem'} compartilhamento: "
+                  f"primeira sessão {medida['bytesPrimeiraSessao'] / 2**20:.2f} MiB, "
+                  f"cada sessão adicional {medida['bytesPorSessaoAdicional'] / 2**20:.2f} MiB, "
+                  f"total {medida['bytesTotal'] / 2**20:.2f} MiB (razão linear {medida['razaoLinear']:.2f}), "
+                  f"pico por reexecução {medida['picoReexecucao'] / 2**20:.2f} MiB")
+
+    if args.memoria_registros:
+        memoria = medir_memoria_registros(args.memoria_registros)
+        print(f"Memória de {memoria['linhas']} contribuições")
+        for chave, rotulo in (
+            ("listaDicionarios", "lista de dicionários"), ("dataframeObjetos", "DataFrame com objetos"),
+            ("dataframeDashboard", "DataFrame do dashboard"), ("arrayEstruturado", "array estruturado")
+        ):
+            print(f"  {rotulo:<24} {memoria[chave] / 2**20:10.1f} MiB")
+        print(f"  quadro_registros sem cópia: {'sim' if memoria['quadroSemCopia'] else 'não'}")
+
+    regressoes = [] if args.sem_importacao else verificar_importacao()
+
+    resultados = []
+    for tamanho in args.tamanhos:
+        resultado = medir_carteira(tamanho, args.repeticoes, args.semente)
+        resultados.append(resultado)
+        print(f"{tamanho} segurados ({resultado['competencias']} competências)")
+        for etapa, medida in resultado["etapas"].items():
+            print(f"  {etapa:<22} {medida['segundos'] * 1000:10.1f} ms "
+                  f"{medida['seguradosPorSegundo']:12.1f} segurados/s "
+                  f"{medida['picoBytes'] / 2**20:8.2f} MiB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump({"ambiente": ambiente(), "resultados": resultados}, arquivo, indent=2)
+
+    caminho = Path(args.linha_base)
+    if args.atualizar_linha_base:
+        linha_base = json.loads(caminho.read_text(encoding='utf-8')) if caminho.exists() else {}
+        linha_base["ambiente"] = ambiente()
+        carteiras = linha_base.setdefault("carteiras", {})
+        for resultado in resultados:
+            carteiras[str(resultado["segurados"])] = resultado
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(json.dumps(linha_base, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+        print(f"Linha de base atualizada em {caminho}")
+    elif not caminho.exists():
+        print(f"Sem linha de base em {caminho}; use --atualizar-linha-base para gravá-la", file=sys.stderr)
+    else:
+        regressoes += comparar(resultados, json.loads(caminho.read_text(encoding='utf-8')), args.tolerancia)
+
+    if regressoes:
+        print(f"REGRESSÃO DE DESEMPENHO em {len(regressoes)} medição(ões):", file=sys.stderr)
+        for regressao in regressoes:
+            print(f"  {regressao}", file=sys.stderr)
+        return 1
+    print("Sem regressões em relação à linha de base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""Índice de busca de casos por CPF, NIT, número do benefício e empregador
+
+Identificadores (``numBeneficio``, ``cpf``, ``nit`` do segurado e dos
+vínculos, ``cnpj`` e a raiz do CNPJ, que reúne as filiais da empresa) são
+guardados só com os dígitos em índices de hash. Os nomes das empresas dos
+vínculos são normalizados (sem acentos, caixa alta, sem pontuação) e
+quebrados em palavras, cada uma com o conjunto de empresas em que aparece;
+a busca por empresa intersecta os conjuntos das palavras, com a última
+valendo também como prefixo, e junta os casos das empresas encontradas.
+Exemplo:
+
+    indice = IndiceBusca('indice.jsonl')
+    indice.registrar_fonte(fonte, origem='casos/171516921-0.json')
+    indice.buscar('telemar')
+
+O índice é persistido em um arquivo JSON Lines só de acréscimos
+(``auditoria.diario``), atualizado a cada caso registrado. ``compactar()``
+regrava o arquivo com cada empresa escrita uma única vez, em uma linha
+inicial ``["#empresas", ...]``, e os casos apontando para elas pela posição,
+o que reduz bastante o arquivo e o tempo de abertura.
+"""
+
+import heapq
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+from auditoria.casos import versao_fonte
+from auditoria.diario import Diario
+
+CAMPOS_IDENTIFICADORES = ('numBeneficio', 'cpf', 'nit', 'cnpj', 'cnpjRaiz')
+
+# Palavras que não distinguem empresas e aparecem em quase todos os nomes
+PALAVRAS_IGNORADAS = frozenset({'DE', 'DA', 'DO', 'DAS', 'DOS', 'E', 'EM'})
+# Tamanho mínimo da última palavra da consulta para valer como prefixo
+MINIMO_PREFIXO = 3
+
+# Diretório padrão do índice; pode ser trocado pela variável de ambiente
+VARIAVEL_INDICE = 'AUDITORIA_INDICE'
+ARQUIVO_INDICE = 'indice_busca.jsonl'
+MARCA_EMPRESAS = '#empresas'
+
+_NAO_DIGITOS = re.compile(r'\D')
+_PALAVRAS = re.compile(r'[A-Z0-9]+')
+
+
+def somente_digitos(texto):
+    """Identificador só com os dígitos: ``"094.805.283-04"`` vira ``"09480528304"``"""
+    return _NAO_DIGITOS.sub('', str(texto or ''))
+
+
+def palavras_empresa(texto):
+    """Palavras normalizadas de um nome de empresa, sem acentos e em caixa alta"""
+    decomposto = unicodedata.normalize('NFKD', str(texto or '').upper())
+    sem_acentos = ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return [
+        palavra for palavra in _PALAVRAS.findall(sem_acentos)
+        if len(palavra) > 1 and palavra not in PALAVRAS_IGNORADAS
+    ]
+
+
+def _linha_indice(num_beneficio, versao, segurado, vinculos, origem):
+    """Linha do arquivo do índice: segurado, NITs e empresas (cnpj, nome) distintas"""
+    nits = {somente_digitos(segurado.get('nit'))}
+    empresas = {}
+    for vinculo in vinculos:
+        nits.add(somente_digitos(vinculo.get('nit')))
+        empresas.setdefault((somente_digitos(vinculo.get('cnpj')), vinculo.get('empresa') or ''), None)
+    nits.discard('')
+    return [
+        num_beneficio, versao, segurado.get('nome', ''), segurado.get('cpf', ''),
+        sorted(nits), origem, [list(empresa) for empresa in empresas]
+    ]
+
+
+class IndiceBusca:
+    """Índices de hash para identificadores e índice de palavras para empresas
+
+    Cada caso recebe um número interno e cada empresa distinta (CNPJ e
+    nome) é normalizada uma única vez: as palavras apontam para empresas e
+    cada empresa para os casos com vínculo nela. Com ``caminho``, os
+    registros são acrescentados ao arquivo e o índice é reconstruído a
+    partir dele na criação.
+    """
+
+    def __init__(self, caminho=None):
+        self._diario = Diario(caminho) if caminho is not None else None
+        self._lock = threading.RLock()
+        self._limpar()
+        self.atualizar()
+
+    def _limpar(self):
+        self._ids = {}
+        self._numeros = []
+        self._registros = []
+        self._identificadores = {campo: defaultdict(set) for campo in ('numBeneficio', 'cpf', 'nit')}
+        self._empresas = {}
+        self._dados_empresas = []
+        self._casos_empresa = []
+        self._cnpjs = {campo: defaultdict(set) for campo in ('cnpj', 'cnpjRaiz')}
+        self._palavras = defaultdict(set)
+        self._ordenadas = None
+        self._referencias = []
+
+    @property
+    def caminho(self):
+        return self._diario.caminho if self._diario is not None else None
+
+    def __len__(self):
+        return sum(registro is not None for registro in self._registros)
+
+    def __contains__(self, num_beneficio):
+        identificador = self._ids.get(num_beneficio)
+        return identificador is not None and self._registros[identificador] is not None
+
+    def _registro(self, num_beneficio):
+        identificador = self._ids.get(num_beneficio)
+        return None if identificador is None else self._registros[identificador]
+
+    def versao(self, num_beneficio):
+        """Versão indexada de um caso, ou None"""
+        registro = self._registro(num_beneficio)
+        return None if registro is None else registro[0]
+
+    def origem(self, num_beneficio):
+        """Arquivo de origem de um caso indexado, se conhecido"""
+        registro = self._registro(num_beneficio)
+        return None if registro is None else registro[3]
+
+    def _empresa(self, cnpj, nome):
+        """Número interno da empresa, criando as entradas de CNPJ e palavras na primeira vez"""
+        chave = (cnpj, nome)
+        empresa = self._empresas.get(chave)
+        if empresa is None:
+            empresa = self._empresas[chave] = len(self._dados_empresas)
+            self._dados_empresas.append(chave)
+            self._casos_empresa.append(set())
+            if cnpj:
+                self._cnpjs['cnpj'][cnpj].add(empresa)
+                self._cnpjs['cnpjRaiz'][cnpj[:8]].add(empresa)
+            for palavra in set(palavras_empresa(nome)):
+                if palavra not in self._palavras:
+                    self._ordenadas = None
+                self._palavras[palavra].add(empresa)
+        return empresa
+
+    def _chaves(self, num_beneficio, cpf, nits):
+        chaves = [('numBeneficio', somente_digitos(num_beneficio)), ('cpf', somente_digitos(cpf))]
+        chaves.extend(('nit', nit) for nit in nits)
+        return [(campo, valor) for campo, valor in chaves if valor]
+
+    def _retirar(self, identificador):
+        versao, nome, cpf, origem, nits, empresas = self._registros[identificador]
+        for campo, valor in self._chaves(self._numeros[identificador], cpf, nits):
+            casos = self._identificadores[campo][valor]
+            casos.discard(identificador)
+            if not casos:
+                del self._identificadores[campo][valor]
+        for empresa in empresas:
+            self._casos_empresa[empresa].discard(identificador)
+        self._registros[identificador] = None
+
+    def _aplicar(self, linha):
+        """Aplica uma linha do arquivo; devolve False se nada mudou"""
+        num_beneficio, versao = linha[0], linha[1]
+        if num_beneficio == MARCA_EMPRESAS:
+            # Empresas do arquivo compactado, referidas depois pela posição
+            self._referencias = [self._empresa(cnpj, nome) for cnpj, nome in versao]
+            return False
+        identificador = self._ids.get(num_beneficio)
+        anterior = None if identificador is None else self._registros[identificador]
+        if anterior is not None:
+            if versao is not None and anterior[0] == versao and anterior[3] == linha[5]:
+                return False
+            self._retirar(identificador)
+        if versao is None:
+            # Remoção do caso
+            return anterior is not None
+
+        if identificador is None:
+            identificador = self._ids[num_beneficio] = len(self._numeros)
+            self._numeros.append(num_beneficio)
+            self._registros.append(None)
+        _, _, nome, cpf, nits, origem, empresas = linha
+        empresas = tuple(
+            self._referencias[empresa] if isinstance(empresa, int) else self._empresa(*empresa)
+            for empresa in empresas
+        )
+        self._registros[identificador] = (versao, nome, cpf, origem, tuple(nits), empresas)
+        for campo, valor in self._chaves(num_beneficio, cpf, nits):
+            self._identificadores[campo][valor].add(identificador)
+        for empresa in empresas:
+            self._casos_empresa[empresa].add(identificador)
+        return True
+
+    def registrar(self, num_beneficio, versao, segurado, vinculos, origem=None):
+        """Indexa um caso: dados do segurado e lista de vínculos (dicionários)"""
+        return self.registrar_lote([(num_beneficio, versao, segurado, vinculos, origem)]) > 0
+
+    def registrar_lote(self, casos):
+        """Indexa vários casos ``(num_beneficio, versao, segurado, vinculos, origem)``"""
+        with self._lock:
+            novas = [linha for linha in (_linha_indice(*caso) for caso in casos) if self._aplicar(linha)]
+            if self._diario is not None:
+                self._diario.acrescentar(novas)
+            return len(novas)
+
+    def registrar_fonte(self, fonte, origem=None):
+        """Indexa um caso a partir dos dados de origem"""
+        return self.registrar(
+            fonte['segurado']['numBeneficio'], versao_fonte(fonte), fonte['segurado'],
+            fonte['vinculos_empregaticos'], origem
+        )
+
+    def registrar_caso(self, caso, origem=None):
+        """Indexa um ``Caso`` já montado"""
+        return self.registrar(
+            caso.num_beneficio, caso.versao, caso['segurado'],
+            caso['vinculos_empregaticos'].to_dict('records'), origem
+        )
+
+    def remover(self, num_beneficio):
+        """Retira um caso do índice"""
+        with self._lock:
+            linha = [num_beneficio, None]
+            if not self._aplicar(linha):
+                return False
+            if self._diario is not None:
+                self._diario.acrescentar([linha])
+            return True
+
+    def atualizar(self):
+        """Lê os registros acrescentados ao arquivo por outros processos; devolve quantos casos mudaram"""
+        if self._diario is None:
+            return 0
+        with self._lock:
+            linhas, reiniciado = self._diario.ler_novas()
+            if reiniciado:
+                self._limpar()
+            return sum(self._aplicar(linha) for linha in linhas)
+
+    def compactar(self):
+        """Regrava o arquivo só com o registro atual de cada caso e cada empresa uma vez
+
+        Registros acrescentados por outro processo durante a compactação se
+        perdem; compacte com o índice sem outros escritores.
+        """
+        if self._diario is None:
+            return
+        with self._lock:
+            linhas = [[MARCA_EMPRESAS, [list(empresa) for empresa in self._dados_empresas]]]
+            for identificador, registro in enumerate(self._registros):
+                if registro is not None:
+                    versao, nome, cpf, origem, nits, empresas = registro
+                    linhas.append([self._numeros[identificador], versao, nome, cpf, list(nits), origem, list(empresas)])
+            self._diario.regravar(linhas)
+
+    def _numeros_de(self, identificadores):
+        return {self._numeros[identificador] for identificador in identificadores}
+
+    def _casos_das_empresas(self, empresas):
+        return set().union(*(self._casos_empresa[empresa] for empresa in empresas))
+
+    def _por_identificador(self, campo, valor):
+        digitos = somente_digitos(valor)
+        if campo in self._cnpjs:
+            return self._casos_das_empresas(self._cnpjs[campo].get(digitos, ()))
+        if campo not in self._identificadores:
+            raise ValueError(f"Campo de busca desconhecido: {campo}")
+        return set(self._identificadores[campo].get(digitos, ()))
+
+    def por_identificador(self, campo, valor):
+        """Casos com o identificador informado (qualquer formatação)"""
+        with self._lock:
+            return self._numeros_de(self._por_identificador(campo, valor))
+
+    def por_cpf(self, cpf):
+        return self.por_identificador('cpf', cpf)
+
+    def por_nit(self, nit):
+        return self.por_identificador('nit', nit)
+
+    def por_beneficio(self, num_beneficio):
+        return self.por_identificador('numBeneficio', num_beneficio)
+
+    def por_cnpj(self, cnpj):
+        """Casos com vínculo no CNPJ; com só 8 dígitos, em qualquer filial da empresa"""
+        digitos = somente_digitos(cnpj)
+        return self.por_identificador('cnpjRaiz' if len(digitos) == 8 else 'cnpj', digitos)
+
+    def _com_prefixo(self, prefixo):
+        if self._ordenadas is None:
+            self._ordenadas = sorted(self._palavras)
+        empresas = set()
+        for posicao in range(bisect_left(self._ordenadas, prefixo), len(self._ordenadas)):
+            palavra = self._ordenadas[posicao]
+            if not palavra.startswith(prefixo):
+                break
+            empresas |= self._palavras[palavra]
+        return empresas
+
+    def _por_empresa(self, texto, prefixo=True):
+        palavras = palavras_empresa(texto)
+        if not palavras:
+            return set()
+        conjuntos = [self._palavras.get(palavra, set()) for palavra in palavras[:-1]]
+        ultima = palavras[-1]
+        if prefixo and len(ultima) >= MINIMO_PREFIXO:
+            conjuntos.append(self._com_prefixo(ultima))
+        else:
+            conjuntos.append(self._palavras.get(ultima, set()))
+        # Todas as palavras precisam estar no nome da mesma empresa
+        conjuntos.sort(key=len)
+        return self._casos_das_empresas(set(conjuntos[0]).intersection(*conjuntos[1:]))
+
+    def por_empresa(self, texto, prefixo=True):
+        """Casos com vínculo em empresa cujo nome contém todas as palavras do texto"""
+        with self._lock:
+            return self._numeros_de(self._por_empresa(texto, prefixo))
+
+    def _encontrar(self, termo):
+        termo = str(termo or '').strip()
+        if not termo:
+            return set()
+        if not re.search(r'[^\W\d_]', termo):
+            # Só dígitos e pontuação: qualquer identificador, inclusive a raiz do CNPJ
+            digitos = somente_digitos(termo)
+            casos = set().union(*(indice.get(digitos, ()) for indice in self._identificadores.values()))
+            empresas = set().union(*(indice.get(digitos, ()) for indice in self._cnpjs.values()))
+            return casos | self._casos_das_empresas(empresas)
+        return self._por_empresa(termo)
+
+    def encontrar(self, termo):
+        """Casos de um termo livre: só dígitos busca nos identificadores, texto busca empresas"""
+        with self._lock:
+            return self._numeros_de(self._encontrar(termo))
+
+    def buscar(self, termo, limite=50):
+        """Busca um termo livre e descreve até ``limite`` casos, na ordem de inclusão no índice"""
+        with self._lock:
+            casos = self._encontrar(termo)
+            return {
+                "total": len(casos),
+                "casos": [self._descrever(identificador) for identificador in heapq.nsmallest(limite, casos)]
+            }
+
+    def _descrever(self, identificador):
+        versao, nome, cpf, origem, _, _ = self._registros[identificador]
+        return {"numBeneficio": self._numeros[identificador], "nome": nome, "cpf": cpf, "origem": origem}
+
+    def descrever(self, num_beneficio):
+        """Dados básicos de um caso indexado, para listagem"""
+        identificador = self._ids.get(num_beneficio)
+        if identificador is None or self._registros[identificador] is None:
+            raise KeyError(f"Caso com benefício {num_beneficio} não indexado")
+        return self._descrever(identificador)
+
+    def estatisticas(self):
+        """Tamanho dos índices"""
+        with self._lock:
+            return {
+                "casos": len(self),
+                **{campo: len(indice) for campo, indice in self._identificadores.items()},
+                "empresas": len(self._dados_empresas),
+                **{campo: len(indice) for campo, indice in self._cnpjs.items()},
+                "palavras": len(self._palavras),
+                "linhasArquivo": self._diario.linhas if self._diario is not None else 0
+            }
+
+
+def carregar_caso_indexado(num_beneficio, indice=None):
+    """Devolve o caso, registrando antes os dados do arquivo de origem indexado, se preciso"""
+    from auditoria.casos import obter_caso, registrar_fonte
+    from auditoria.lote import carregar_fonte
+
+    try:
+        return obter_caso(num_beneficio)
+    except KeyError:
+        origem = (indice or indice_padrao()).origem(num_beneficio)
+        if origem is None:
+            raise
+    registrar_fonte(carregar_fonte(origem))
+    return obter_caso(num_beneficio)
+
+
+_INDICE = None
+_LOCK_INDICE = threading.Lock()
+
+
+def arquivo_indice():
+    """Arquivo padrão do índice de busca"""
+    diretorio = os.environ.get(VARIAVEL_INDICE) or os.path.join(tempfile.gettempdir(), 'auditoria_indice')
+    return os.path.join(diretorio, ARQUIVO_INDICE)
+
+
+def indice_padrao():
+    """Índice de busca do processo, lido do arquivo padrão no primeiro uso"""
+    global _INDICE
+    if _INDICE is None:
+        with _LOCK_INDICE:
+            if _INDICE is None:
+                _INDICE = IndiceBusca(arquivo_indice())
+    return _INDICE
+
+
+def configurar_indice(caminho):
+    """Substitui o índice do processo pelo lido de ``caminho`` (None: só em memória)"""
+    global _INDICE
+    with _LOCK_INDICE:
+        _INDICE = IndiceBusca(caminho)
+    return _INDICE
@@ -0,0 +1,263 @@
+"""Visão da carteira: indicadores agregados sobre todos os casos auditados
+
+Cada caso entra na carteira como uma linha de resumo (``resumir_caso``),
+sem as tabelas do CNIS. As linhas ficam em colunas numpy, com dinheiro em
+centavos, e os agregados (somas e distribuição de ``periodosIncorretos``)
+são atualizados a cada caso registrado, removendo a contribuição da versão
+anterior do mesmo benefício. Consultar os indicadores não percorre a
+carteira; só a lista dos maiores casos faz uma seleção parcial na coluna.
+
+A carteira é persistida em um arquivo JSON Lines só de acréscimos: cada
+registro é uma linha e a última linha de um benefício prevalece.
+``atualizar()`` lê apenas o que outro processo (a auditoria em lote, por
+exemplo) acrescentou desde a última leitura.
+"""
+
+import os
+import tempfile
+import threading
+from collections import Counter
+import numpy as np
+
+from auditoria.casos import analisar_fonte, resumir_caso, versao_fonte
+from auditoria.diario import Diario
+
+# Colunas em dinheiro, guardadas em centavos para que as somas sejam exatas
+COLUNAS_VALORES = ('salarioBeneficioInss', 'salarioBeneficioAuditoria', 'diferencaMensal', 'totalGeral')
+COLUNAS_TEXTO = ('numBeneficio', 'versao', 'nome', 'cpf')
+
+# Diretório padrão da carteira; pode ser trocado pela variável de ambiente
+VARIAVEL_CARTEIRA = 'AUDITORIA_CARTEIRA'
+ARQUIVO_CARTEIRA = 'carteira.jsonl'
+
+
+def _linha_log(resumo, versao):
+    """Linha compacta do arquivo da carteira: textos, valores em centavos e períodos"""
+    return [
+        resumo['numBeneficio'], versao, resumo['nome'], resumo['cpf'],
+        *(round(resumo[coluna] * 100) for coluna in COLUNAS_VALORES),
+        resumo['periodosIncorretos']
+    ]
+
+
+class Carteira:
+    """Resumos dos casos em colunas, com agregados incrementais
+
+    Com ``caminho``, os registros são acrescentados ao arquivo e a carteira
+    é reconstruída a partir dele na criação.
+    """
+
+    def __init__(self, caminho=None, capacidade=1024):
+        self._diario = Diario(caminho) if caminho is not None else None
+        self._lock = threading.RLock()
+        self._posicoes = {}
+        self._livres = []
+        self._tamanho = 0
+        self._texto = {coluna: [] for coluna in COLUNAS_TEXTO}
+        self._valores = np.zeros((capacidade, len(COLUNAS_VALORES)), dtype=np.int64)
+        self._periodos = np.zeros(capacidade, dtype=np.int32)
+        self._ativos = np.zeros(capacidade, dtype=bool)
+        self._somas = np.zeros(len(COLUNAS_VALORES), dtype=np.int64)
+        self._distribuicao = Counter()
+        self.atualizar()
+
+    @property
+    def caminho(self):
+        return self._diario.caminho if self._diario is not None else None
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __contains__(self, num_beneficio):
+        return num_beneficio in self._posicoes
+
+    def versao(self, num_beneficio):
+        """Versão registrada de um caso, ou None"""
+        with self._lock:
+            posicao = self._posicoes.get(num_beneficio)
+            return None if posicao is None else self._texto['versao'][posicao]
+
+    def _crescer(self):
+        capacidade = len(self._ativos) * 2
+        valores = np.zeros((capacidade, len(COLUNAS_VALORES)), dtype=np.int64)
+        valores[:self._tamanho] = self._valores[:self._tamanho]
+        self._valores = valores
+        self._periodos = np.resize(self._periodos, capacidade)
+        self._ativos = np.concatenate([self._ativos, np.zeros(capacidade - len(self._ativos), dtype=bool)])
+
+    def _retirar(self, posicao):
+        """Desconta dos agregados a linha de uma posição e a libera"""
+        self._somas -= self._valores[posicao]
+        periodos = int(self._periodos[posicao])
+        self._distribuicao[periodos] -= 1
+        if not self._distribuicao[periodos]:
+            del self._distribuicao[periodos]
+        self._ativos[posicao] = False
+        self._livres.append(posicao)
+
+    def _aplicar(self, linha):
+        """Aplica uma linha do arquivo; devolve False se nada mudou"""
+        num_beneficio, versao = linha[0], linha[1]
+        posicao = self._posicoes.get(num_beneficio)
+        if posicao is not None:
+            if versao is not None and self._texto['versao'][posicao] == versao:
+                return False
+            self._retirar(posicao)
+            del self._posicoes[num_beneficio]
+        if versao is None:
+            # Remoção do caso
+            return posicao is not None
+
+        if self._livres:
+            posicao = self._livres.pop()
+        else:
+            if self._tamanho == len(self._ativos):
+                self._crescer()
+            posicao = self._tamanho
+            self._tamanho += 1
+            for coluna in COLUNAS_TEXTO:
+                self._texto[coluna].append(None)
+        for coluna, valor in zip(COLUNAS_TEXTO, linha):
+            self._texto[coluna][posicao] = valor
+        self._valores[posicao] = linha[4:4 + len(COLUNAS_VALORES)]
+        self._periodos[posicao] = linha[-1]
+        self._ativos[posicao] = True
+        self._posicoes[num_beneficio] = posicao
+        self._somas += self._valores[posicao]
+        self._distribuicao[int(linha[-1])] += 1
+        return True
+
+    def _acrescentar(self, linhas):
+        if self._diario is not None:
+            self._diario.acrescentar(linhas)
+
+    def registrar_lote(self, resumos):
+        """Registra vários pares ``(resumo, versao)``; devolve quantos mudaram a carteira"""
+        with self._lock:
+            novas = [linha for linha in (_linha_log(resumo, versao) for resumo, versao in resumos) if self._aplicar(linha)]
+            self._acrescentar(novas)
+            return len(novas)
+
+    def registrar(self, resumo, versao):
+        """Registra o resumo de um caso (linha de ``resumir_caso``) na versão informada"""
+        return self.registrar_lote([(resumo, versao)]) > 0
+
+    def registrar_fonte(self, fonte):
+        """Resume e registra um caso a partir dos dados de origem, sem montar DataFrames"""
+        return self.registrar(resumir_caso(analisar_fonte(fonte)), versao_fonte(fonte))
+
+    def remover(self, num_beneficio):
+        """Retira um caso da carteira"""
+        with self._lock:
+            linha = [num_beneficio, None]
+            if self._aplicar(linha):
+                self._acrescentar([linha])
+                return True
+            return False
+
+    def atualizar(self):
+        """Lê os registros acrescentados ao arquivo desde a última leitura
+
+        Se o arquivo foi compactado ou substituído, a carteira é refeita a
+        partir dele. Devolve quantos casos mudaram.
+        """
+        if self._diario is None:
+            return 0
+        with self._lock:
+            linhas, reiniciado = self._diario.ler_novas()
+            if reiniciado:
+                self._limpar()
+            return sum(self._aplicar(linha) for linha in linhas)
+
+    def _limpar(self):
+        self._posicoes.clear()
+        self._livres.clear()
+        self._tamanho = 0
+        for coluna in COLUNAS_TEXTO:
+            self._texto[coluna].clear()
+        self._ativos[:] = False
+        self._somas[:] = 0
+        self._distribuicao.clear()
+
+    def compactar(self):
+        """Regrava o arquivo só com a linha atual de cada caso"""
+        if self._diario is None:
+            return
+        with self._lock:
+            self._diario.regravar([self._linha(posicao) for posicao in self._posicoes.values()])
+
+    def _linha(self, posicao):
+        return [
+            *(self._texto[coluna][posicao] for coluna in COLUNAS_TEXTO),
+            *(int(valor) for valor in self._valores[posicao]),
+            int(self._periodos[posicao])
+        ]
+
+    def agregados(self):
+        """Indicadores da carteira, mantidos a cada registro"""
+        with self._lock:
+            casos = len(self._posicoes)
+            somas = dict(zip(COLUNAS_VALORES, (int(soma) / 100 for soma in self._somas)))
+            return {
+                "casos": casos,
+                **somas,
+                "mediaDiferencaMensal": somas['diferencaMensal'] / casos if casos else 0.0,
+                "mediaTotalGeral": somas['totalGeral'] / casos if casos else 0.0,
+                "distribuicaoPeriodos": dict(sorted(self._distribuicao.items())),
+                "linhasArquivo": self._diario.linhas if self._diario is not None else 0
+            }
+
+    def maiores(self, quantidade=10, coluna='diferencaMensal'):
+        """Casos com os maiores valores de uma coluna em dinheiro, em ordem decrescente"""
+        if coluna not in COLUNAS_VALORES:
+            raise ValueError(f"Coluna não suportada: {coluna}")
+        indice = COLUNAS_VALORES.index(coluna)
+        with self._lock:
+            posicoes = np.flatnonzero(self._ativos[:self._tamanho])
+            valores = self._valores[posicoes, indice]
+            quantidade = min(quantidade, len(posicoes))
+            if quantidade <= 0:
+                return []
+            if quantidade < len(posicoes):
+                selecao = np.argpartition(-valores, quantidade - 1)[:quantidade]
+            else:
+                selecao = np.arange(len(posicoes))
+            ordem = selecao[np.argsort(-valores[selecao], kind='stable')]
+            return [self._resumo(int(posicoes[i])) for i in ordem]
+
+    def _resumo(self, posicao):
+        return {
+            "numBeneficio": self._texto['numBeneficio'][posicao],
+            "nome": self._texto['nome'][posicao],
+            "cpf": self._texto['cpf'][posicao],
+            **{coluna: int(valor) / 100 for coluna, valor in zip(COLUNAS_VALORES, self._valores[posicao])},
+            "periodosIncorretos": int(self._periodos[posicao])
+        }
+
+
+_CARTEIRA = None
+_LOCK_CARTEIRA = threading.Lock()
+
+
+def arquivo_carteira():
+    """Arquivo padrão da carteira"""
+    diretorio = os.environ.get(VARIAVEL_CARTEIRA) or os.path.join(tempfile.gettempdir(), 'auditoria_carteira')
+    return os.path.join(diretorio, ARQUIVO_CARTEIRA)
+
+
+def carteira_padrao():
+    """Carteira do processo, lida do arquivo padrão no primeiro uso"""
+    global _CARTEIRA
+    if _CARTEIRA is None:
+        with _LOCK_CARTEIRA:
+            if _CARTEIRA is None:
+                _CARTEIRA = Carteira(arquivo_carteira())
+    return _CARTEIRA
+
+
+def configurar_carteira(caminho):
+    """Substitui a carteira do processo pela lida de ``caminho`` (None: só em memória)"""
+    global _CARTEIRA
+    with _LOCK_CARTEIRA:
+        _CARTEIRA = Carteira(caminho)
+    return _CARTEIRA
@@ -0,0 +1,299 @@
+"""Carregamento de casos de auditoria com cache por número de benefício"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+
+from auditoria.cnis import STATUS_INDEFERIDO, analisar_contribuicoes
+from auditoria.exemplo import CASO_EXEMPLO
+from auditoria.fator import calcular_fator_previdenciario, fator_previdenciario
+from auditoria.referencia import dados_referencia
+
+NUM_BENEFICIO_EXEMPLO = CASO_EXEMPLO['segurado']['numBeneficio']
+
+
+def _congelar(valor):
+    """Converte dicionários e listas aninhados em estruturas somente leitura
+
+    Estruturas já congeladas são reaproveitadas sem cópia.
+    """
+    if isinstance(valor, MappingProxyType):
+        return valor
+    if isinstance(valor, tuple):
+        congelado = tuple(_congelar(item) for item in valor)
+        return valor if all(a is b for a, b in zip(congelado, valor)) else congelado
+    if isinstance(valor, Mapping):
+        return MappingProxyType({chave: _congelar(item) for chave, item in valor.items()})
+    if isinstance(valor, list):
+        return tuple(_congelar(item) for item in valor)
+    return valor
+
+
+class Caso(Mapping):
+    """Caso de auditoria já calculado, imutável e compartilhado entre reruns
+
+    Mantém a interface de dicionário devolvida por ``load_data()``. Os
+    DataFrames são compartilhados entre sessões e não devem ser alterados.
+    """
+
+    __slots__ = ('num_beneficio', 'versao', '_dados')
+
+    def __init__(self, num_beneficio, versao, dados):
+        object.__setattr__(self, 'num_beneficio', num_beneficio)
+        object.__setattr__(self, 'versao', versao)
+        object.__setattr__(self, '_dados', _congelar(dados))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Caso é imutável")
+
+    def __getitem__(self, chave):
+        return self._dados[chave]
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __repr__(self):
+        return f"Caso(num_beneficio={self.num_beneficio!r}, versao={self.versao!r})"
+
+
+def versao_fonte(fonte):
+    """Calcula a impressão digital dos dados de origem de um caso"""
+    conteudo = json.dumps(fonte, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+
+
+def analisar_fonte(fonte, corrigido=None, indeferidos=None):
+    """Calcula os valores da auditoria de um caso sem montar DataFrames
+
+    Devolve ``segurado``, ``comparativo``, ``fator_previdenciario``,
+    ``total_devido`` e ``analise_cnis``, suficientes para ``resumir_caso``.
+    ``corrigido`` e ``indeferidos`` podem vir prontos como arrays; caso
+    contrário são extraídos de ``fonte['contribuicoes_cnis']``.
+    """
+    parametros_fator = fonte['fator_previdenciario']
+    if parametros_fator.get('expectativaSobrevida') is None:
+        # Sem Es informado: consulta a tábua do IBGE pelo ano da DER
+        fator = copy.deepcopy(fator_previdenciario(
+            parametros_fator['tempoContribuicao'],
+            parametros_fator['idade'],
+            int(fonte['segurado']['dataRequerimento'][-4:]),
+            parametros_fator['aliquota']
+        ))
+    else:
+        fator = calcular_fator_previdenciario(
+            parametros_fator['tempoContribuicao'],
+            parametros_fator['aliquota'],
+            parametros_fator['expectativaSobrevida'],
+            parametros_fator['idade']
+        )
+
+    # Análise dos dados CNIS (80% maiores salários)
+    if corrigido is None:
+        contribuicoes = fonte['contribuicoes_cnis']
+        corrigido = np.fromiter((c['corrigido'] for c in contribuicoes), dtype=np.float64, count=len(contribuicoes))
+        indeferidos = np.fromiter((c['status'] == STATUS_INDEFERIDO for c in contribuicoes), dtype=bool, count=len(contribuicoes))
+    analise_cnis, _ = analisar_contribuicoes(corrigido, indeferidos)
+
+    return {
+        "segurado": copy.deepcopy(fonte['segurado']),
+        "comparativo": copy.deepcopy(fonte['comparativo']),
+        "fator_previdenciario": fator,
+        "total_devido": copy.deepcopy(fonte['total_devido']),
+        "analise_cnis": analise_cnis
+    }
+
+
+TABELAS_CASO = ('evolucao_beneficio', 'diferencas_acumuladas', 'vinculos_empregaticos', 'contribuicoes_cnis')
+
+
+def montar_caso(fonte, tabelas=None):
+    """Monta os DataFrames e as análises de um caso a partir dos dados de origem
+
+    ``tabelas`` pode trazer DataFrames já lidos para as chaves de
+    ``TABELAS_CASO``; as ausentes são montadas a partir das listas de ``fonte``.
+    """
+    # pandas só é importado aqui: a análise em lote (analisar_fonte) não precisa dele
+    import pandas as pd
+
+    tabelas = dict(tabelas or {})
+    for nome in TABELAS_CASO:
+        if nome not in tabelas:
+            tabelas[nome] = pd.DataFrame(fonte[nome])
+
+    contribuicoes_cnis = tabelas['contribuicoes_cnis']
+    caso = analisar_fonte(
+        fonte,
+        contribuicoes_cnis['corrigido'].to_numpy(dtype=np.float64),
+        (contribuicoes_cnis['status'] == STATUS_INDEFERIDO).to_numpy(dtype=bool)
+    )
+
+    # Ordenar contribuições por valor corrigido decrescente para exibição
+    tabelas['contribuicoes_cnis'] = contribuicoes_cnis.sort_values(
+        by='corrigido', ascending=False, kind='stable'
+    ).reset_index(drop=True)
+
+    caso.update(tabelas)
+    caso["fundamentos_legais"] = dados_referencia().fundamentos_legais
+    return caso
+
+
+def resumir_caso(caso):
+    """Resume um caso (montado ou só analisado) em uma linha da auditoria em lote"""
+    segurado = caso['segurado']
+    inss = caso['comparativo']['inss']
+    auditoria = caso['comparativo']['auditoria']
+    analise = caso['analise_cnis']
+    diferenca = auditoria['salarioBeneficio'] - inss['salarioBeneficio']
+    return {
+        "numBeneficio": segurado['numBeneficio'],
+        "nome": segurado['nome'],
+        "cpf": segurado['cpf'],
+        "nit": segurado['nit'],
+        "salarioBeneficioInss": inss['salarioBeneficio'],
+        "salarioBeneficioAuditoria": auditoria['salarioBeneficio'],
+        "diferencaMensal": round(diferenca, 2),
+        "percentualDiferenca": round(diferenca / inss['salarioBeneficio'] * 100, 2),
+        "fatorInss": inss['fatorPrevidenciario'],
+        "fatorAuditoria": round(caso['fator_previdenciario']['calculoFator']['resultadoFinal'], 4),
+        "totalRegistros": analise['totalRegistros'],
+        "registrosConsiderados": analise['registrosConsiderados'],
+        "mediaMaioresSalarios": round(float(analise['mediaMaioresSalarios']), 2),
+        "periodosIncorretos": analise['periodosIncorretos'],
+        "totalGeral": caso['total_devido']['totalGeral']
+    }
+
+
+class CacheCasos:
+    """Cache LRU com expiração (TTL) de casos já calculados
+
+    ``carregador`` recebe o número do benefício e devolve um ``Caso``. O
+    cache é seguro entre threads, pois o Streamlit atende cada sessão em
+    uma thread própria. Cada benefício tem uma geração, avançada a cada
+    invalidação: um carregamento que começou antes de uma invalidação não é
+    guardado e é refeito, para que a versão antiga não fique no cache.
+    """
+
+    def __init__(self, carregador, capacidade=128, ttl=3600.0, relogio=time.monotonic):
+        if capacidade < 1:
+            raise ValueError("A capacidade do cache deve ser de pelo menos 1 caso")
+        self.carregador = carregador
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._relogio = relogio
+        self._entradas = OrderedDict()
+        self._geracoes = {}
+        self._epoca = 0
+        self._lock = threading.Lock()
+        self._contadores = {"acertos": 0, "falhas": 0, "remocoesLRU": 0, "expirados": 0, "invalidacoes": 0}
+
+    def _geracao(self, num_beneficio):
+        return self._epoca, self._geracoes.get(num_beneficio, 0)
+
+    def obter(self, num_beneficio):
+        """Devolve o caso do cache ou o carrega se ausente ou expirado"""
+        agora = self._relogio()
+        with self._lock:
+            entrada = self._entradas.get(num_beneficio)
+            if entrada is not None:
+                caso, carregado_em = entrada
+                if self.ttl is None or agora - carregado_em < self.ttl:
+                    self._entradas.move_to_end(num_beneficio)
+                    self._contadores["acertos"] += 1
+                    return caso
+                del self._entradas[num_beneficio]
+                self._contadores["expirados"] += 1
+            self._contadores["falhas"] += 1
+            geracao = self._geracao(num_beneficio)
+
+        while True:
+            caso = self.carregador(num_beneficio)
+            with self._lock:
+                atual = self._geracao(num_beneficio)
+                if atual != geracao:
+                    # Invalidado durante o carregamento: os dados lidos podem ser os antigos
+                    geracao = atual
+                    continue
+                self._entradas[num_beneficio] = (caso, self._relogio())
+                self._entradas.move_to_end(num_beneficio)
+                while len(self._entradas) > self.capacidade:
+                    self._entradas.popitem(last=False)
+                    self._contadores["remocoesLRU"] += 1
+            return caso
+
+    def invalidar(self, num_beneficio):
+        """Remove um caso do cache; devolve True se ele estava presente"""
+        with self._lock:
+            self._geracoes[num_beneficio] = self._geracoes.get(num_beneficio, 0) + 1
+            if self._entradas.pop(num_beneficio, None) is None:
+                return False
+            self._contadores["invalidacoes"] += 1
+            return True
+
+    def limpar(self):
+        """Remove todos os casos do cache"""
+        with self._lock:
+            self._epoca += 1
+            self._contadores["invalidacoes"] += len(self._entradas)
+            self._entradas.clear()
+
+    def estatisticas(self):
+        """Devolve os contadores de acertos e falhas e a ocupação do cache"""
+        with self._lock:
+            consultas = self._contadores["acertos"] + self._contadores["falhas"]
+            return {
+                **self._contadores,
+                "taxaAcerto": self._contadores["acertos"] / consultas if consultas else 0.0,
+                "ocupacao": len(self._entradas),
+                "capacidade": self.capacidade
+            }
+
+
+# Dados de origem registrados, indexados pelo número do benefício
+_FONTES = {}
+_VERSOES = {}
+_LOCK_FONTES = threading.Lock()
+
+
+def carregar_caso(num_beneficio):
+    """Monta o caso registrado para o número do benefício informado"""
+    with _LOCK_FONTES:
+        if num_beneficio not in _FONTES:
+            raise KeyError(f"Caso com benefício {num_beneficio} não registrado")
+        fonte = _FONTES[num_beneficio]
+        versao = _VERSOES[num_beneficio]
+    return Caso(num_beneficio, versao, montar_caso(fonte))
+
+
+CACHE_CASOS = CacheCasos(carregar_caso)
+
+
+def registrar_fonte(fonte):
+    """Registra os dados de origem de um caso e invalida o cache se mudaram"""
+    num_beneficio = fonte['segurado']['numBeneficio']
+    versao = versao_fonte(fonte)
+    with _LOCK_FONTES:
+        alterado = _VERSOES.get(num_beneficio) != versao
+        if alterado:
+            _FONTES[num_beneficio] = copy.deepcopy(fonte)
+            _VERSOES[num_beneficio] = versao
+    if alterado:
+        CACHE_CASOS.invalidar(num_beneficio)
+    return versao
+
+
+def obter_caso(num_beneficio):
+    """Devolve o caso calculado, reaproveitando o cache entre reruns"""
+    return CACHE_CASOS.obter(num_beneficio)
+
+
+registrar_fonte(CASO_EXEMPLO)
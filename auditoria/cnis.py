@@ -0,0 +1,144 @@
+"""Cálculo vetorizado da regra dos 80% maiores salários do CNIS
+
+As funções trabalham sobre arrays NumPy e usam seleção parcial
+(``np.partition``) em vez de ordenar todo o histórico. Empates no limite
+dos 80% são resolvidos pela ordem original das competências, como em uma
+ordenação decrescente estável (``sort_values(kind='stable')``, usada na
+tabela do caso). O ``sort_values`` padrão do pandas (quicksort) não
+garante essa ordem, então ``periodosIncorretos`` pode diferir dele quando
+há competências indeferidas empatadas no limite.
+
+Os salários corrigidos têm centavos (todas as fontes os arredondam), então
+a média é somada em centavos inteiros, sem erro de arredondamento e sem
+depender da ordem das competências: é a média exata, arredondada uma única
+vez. O ``mean()`` do pandas soma em ponto flutuante na ordem da tabela e
+pode diferir dela na última casa binária (erro relativo da ordem de 1e-16).
+"""
+
+import numpy as np
+
+PROPORCAO_MAIORES_SALARIOS = 0.8
+STATUS_INDEFERIDO = 'Indeferido'
+
+
+def quantidade_considerada(total_registros):
+    """Quantidade de competências que entram na média (80% do total, truncado)"""
+    total = np.asarray(total_registros)
+    return (total * PROPORCAO_MAIORES_SALARIOS).astype(np.int64)
+
+
+def _mascara_maiores(matriz, k):
+    """Marca os k maiores valores de cada linha de uma matriz 2D"""
+    n = matriz.shape[1]
+    if k <= 0:
+        return np.zeros(matriz.shape, dtype=bool)
+    if k >= n:
+        return np.ones(matriz.shape, dtype=bool)
+
+    # Competências sem valor nunca disputam lugar com valores válidos
+    valores = np.where(np.isnan(matriz), -np.inf, matriz)
+    limiar = np.partition(valores, n - k, axis=1)[:, n - k]
+    maiores = valores > limiar[:, None]
+    empates = valores == limiar[:, None]
+    faltam = k - maiores.sum(axis=1)
+    return maiores | (empates & (np.cumsum(empates, axis=1) <= faltam[:, None]))
+
+
+def _soma_centavos(matriz, validos):
+    """Soma exata, linha a linha, dos valores marcados, em centavos
+
+    Centavos inteiros em float64 somam sem erro enquanto o total ficar
+    abaixo de 2**53; o array temporário é liberado ao sair da função.
+    """
+    centavos = np.where(validos, matriz, 0.0)
+    centavos *= 100
+    np.rint(centavos, out=centavos)
+    return centavos.sum(axis=1)
+
+
+def _resumir(matriz, indeferidos, selecionados):
+    """Calcula a média e os períodos incorretos linha a linha"""
+    validos = selecionados & ~np.isnan(matriz)
+    quantidade = validos.sum(axis=1)
+    soma = _soma_centavos(matriz, validos)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = soma / (100 * quantidade)
+    periodos_incorretos = (selecionados & indeferidos).sum(axis=1)
+    return media, periodos_incorretos
+
+
+def analisar_contribuicoes(corrigido, indeferidos):
+    """Analisa o histórico de um segurado
+
+    ``corrigido`` traz os salários corrigidos e ``indeferidos`` é a máscara
+    booleana das competências indeferidas, ambos na mesma ordem. Devolve o
+    dicionário ``analise_cnis`` e a máscara das competências selecionadas.
+    """
+    valores = np.asarray(corrigido, dtype=np.float64)[None, :]
+    indeferidos = np.asarray(indeferidos, dtype=bool)[None, :]
+    total_registros = valores.shape[1]
+    k = int(quantidade_considerada(total_registros))
+
+    selecionados = _mascara_maiores(valores, k)
+    media, periodos_incorretos = _resumir(valores, indeferidos, selecionados)
+
+    analise = {
+        "totalRegistros": total_registros,
+        "registrosConsiderados": k,
+        "mediaMaioresSalarios": media[0],
+        "periodosIncorretos": int(periodos_incorretos[0])
+    }
+    return analise, selecionados[0]
+
+
+def empilhar_historicos(historicos):
+    """Empilha históricos (corrigido, indeferidos) em arrays irregulares
+
+    Devolve ``(valores, indeferidos, deslocamentos)``, em que o histórico
+    ``i`` ocupa ``valores[deslocamentos[i]:deslocamentos[i + 1]]``.
+    """
+    tamanhos = [len(corrigido) for corrigido, _ in historicos]
+    deslocamentos = np.zeros(len(historicos) + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=deslocamentos[1:])
+    if historicos:
+        valores = np.concatenate([np.asarray(c, dtype=np.float64) for c, _ in historicos])
+        indeferidos = np.concatenate([np.asarray(i, dtype=bool) for _, i in historicos])
+    else:
+        valores = np.empty(0, dtype=np.float64)
+        indeferidos = np.empty(0, dtype=bool)
+    return valores, indeferidos, deslocamentos
+
+
+def analisar_lote(valores, indeferidos, deslocamentos):
+    """Analisa muitos segurados de uma vez sobre arrays irregulares
+
+    Os históricos são agrupados por tamanho; cada grupo vira uma matriz 2D
+    processada com uma única seleção parcial. Devolve um dicionário de
+    arrays com as mesmas chaves de ``analise_cnis``.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    indeferidos = np.asarray(indeferidos, dtype=bool)
+    deslocamentos = np.asarray(deslocamentos, dtype=np.int64)
+
+    tamanhos = np.diff(deslocamentos)
+    quantidade_segurados = len(tamanhos)
+    considerados = quantidade_considerada(tamanhos)
+    medias = np.full(quantidade_segurados, np.nan)
+    periodos_incorretos = np.zeros(quantidade_segurados, dtype=np.int64)
+
+    for tamanho in np.unique(tamanhos):
+        linhas = np.flatnonzero(tamanhos == tamanho)
+        posicoes = deslocamentos[linhas][:, None] + np.arange(tamanho)
+        matriz = valores[posicoes]
+        k = int(quantidade_considerada(tamanho))
+        selecionados = _mascara_maiores(matriz, k)
+        medias[linhas], periodos_incorretos[linhas] = _resumir(
+            matriz, indeferidos[posicoes], selecionados
+        )
+
+    return {
+        "totalRegistros": tamanhos,
+        "registrosConsiderados": considerados,
+        "mediaMaioresSalarios": medias,
+        "periodosIncorretos": periodos_incorretos
+    }
@@ -0,0 +1,79 @@
+"""Arquivo JSON Lines só de acréscimos, lido de forma incremental
+
+Usado pela carteira e pelo índice de busca para persistir registros: cada
+registro é uma lista JSON em uma linha e o último registro de uma chave
+prevalece. ``ler_novas`` devolve só as linhas acrescentadas desde a última
+leitura, inclusive por outros processos, e avisa quando o arquivo foi
+regravado (por ``regravar``) e precisa ser lido do início.
+"""
+
+import json
+from pathlib import Path
+
+from auditoria.exportacao import gravar_atomico
+
+
+def _conteudo(linhas):
+    return ''.join(json.dumps(linha, ensure_ascii=False) + '\n' for linha in linhas).encode('utf-8')
+
+
+class Diario:
+    """Leitura e escrita incrementais de um arquivo JSON Lines"""
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self.linhas = 0
+        self._deslocamento = 0
+        self._identidade = None
+
+    def ler_novas(self):
+        """Devolve ``(linhas, reiniciado)`` com as linhas ainda não lidas
+
+        ``reiniciado`` indica que o arquivo foi substituído ou truncado e
+        ``linhas`` traz então o arquivo inteiro.
+        """
+        try:
+            estado = self.caminho.stat()
+        except FileNotFoundError:
+            return [], False
+        reiniciado = (estado.st_dev, estado.st_ino) != self._identidade or estado.st_size < self._deslocamento
+        if reiniciado:
+            self._identidade = (estado.st_dev, estado.st_ino)
+            self._deslocamento = 0
+            self.linhas = 0
+        if estado.st_size == self._deslocamento:
+            return [], reiniciado
+        with open(self.caminho, 'rb') as arquivo:
+            arquivo.seek(self._deslocamento)
+            dados = arquivo.read()
+        # Uma linha ainda sendo gravada por outro processo fica para a próxima leitura
+        completos = dados.rfind(b'\n') + 1
+        linhas = json.loads(b'[' + dados[:completos].rstrip(b'\n').replace(b'\n', b',') + b']') if completos else []
+        self._deslocamento += completos
+        self.linhas += len(linhas)
+        return linhas, reiniciado
+
+    def acrescentar(self, linhas):
+        """Acrescenta linhas ao final do arquivo"""
+        if not linhas:
+            return
+        conteudo = _conteudo(linhas)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.caminho, 'ab') as arquivo:
+            arquivo.write(conteudo)
+        # Só avança a leitura se ninguém mais escreveu no arquivo desde a última leitura
+        estado = self.caminho.stat()
+        if self._deslocamento + len(conteudo) == estado.st_size:
+            self._identidade = (estado.st_dev, estado.st_ino)
+            self._deslocamento += len(conteudo)
+            self.linhas += len(linhas)
+
+    def regravar(self, linhas):
+        """Substitui o arquivo, de forma atômica, só pelas linhas informadas"""
+        conteudo = _conteudo(linhas)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        gravar_atomico(self.caminho, lambda arquivo: arquivo.write(conteudo))
+        estado = self.caminho.stat()
+        self._identidade = (estado.st_dev, estado.st_ino)
+        self._deslocamento = len(conteudo)
+        self.linhas = len(linhas)
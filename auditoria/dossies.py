@@ -0,0 +1,227 @@
+"""Geração em lote dos dossiês (relatório HTML e tabelas CSV), sem Streamlit
+
+Uso:
+    python -m auditoria.dossies CASOS --saida dossies/ [--processos 4] [--formatos html csv pdf] [--forcar]
+    python -m auditoria.dossies CASOS --pdf-unico dossies.pdf
+
+CASOS segue o formato de ``auditoria.lote``: um diretório com um JSON por
+caso ou um manifesto com um caminho por linha. Cada caso gera o diretório
+``SAIDA/<numBeneficio>/`` com os mesmos arquivos dos botões de exportação
+do dashboard. Os arquivos são gravados em partes, em arquivo temporário
+renomeado ao final, então um dossiê interrompido nunca fica pela metade.
+
+Os casos são distribuídos entre ``--processos`` processos, que são o limite
+de dossiês sendo gerados ao mesmo tempo. Um dossiê é mantido, a menos que
+se use ``--forcar``, quando nem a versão dos dados de origem nem a versão
+de cada formato pedido (modelo do relatório HTML, layout do PDF, formato
+dos CSV) mudaram desde a última geração.
+
+Com ``--pdf-unico`` os relatórios PDF de todos os casos são gravados em
+sequência em um único arquivo, em fluxo: a memória usada não depende da
+quantidade de casos.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+from auditoria.casos import montar_caso, versao_fonte
+from auditoria.exportacao import VERSAO_CSV, escrever_csv, gravar_atomico
+from auditoria.lote import carregar_fonte, listar_casos
+from auditoria.pdf import VERSAO_PDF, escrever_pdf, escrever_relatorio_pdf
+from auditoria.relatorio import VERSAO_RELATORIO, escrever_relatorio
+
+FORMATOS = ('html', 'csv', 'pdf')
+# O PDF desenha os gráficos de cada caso, bem mais lento que HTML e CSV
+FORMATOS_PADRAO = ('html', 'csv')
+ARQUIVO_RELATORIO = 'relatorio_previdenciario.html'
+ARQUIVO_PDF = 'relatorio_previdenciario.pdf'
+ARQUIVO_DOSSIE = 'dossie.json'
+
+# Versão de cada formato; mudar o modelo ou o layout regera os dossiês
+VERSOES_FORMATOS = {'html': VERSAO_RELATORIO, 'csv': str(VERSAO_CSV), 'pdf': VERSAO_PDF}
+
+# Tabelas exportadas em CSV, com os nomes de arquivo usados no dashboard
+TABELAS_CSV = {
+    'contribuicoes_cnis': 'contribuições_cnis.csv',
+    'evolucao_beneficio': 'evolução_do_benefício.csv',
+    'diferencas_acumuladas': 'diferenças_acumuladas.csv',
+    'vinculos_empregaticos': 'vínculos_empregatícios.csv'
+}
+
+
+def _versoes_gravadas(diretorio, versao):
+    """Versões dos formatos gravados no dossiê para a versão dos dados de origem"""
+    try:
+        with open(diretorio / ARQUIVO_DOSSIE, encoding='utf-8') as arquivo:
+            dossie = json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+    return dossie.get("versoesFormatos", {}) if dossie.get("versao") == versao else {}
+
+
+def _dossie_atual(diretorio, versao, formatos):
+    """Indica se o dossiê gravado já tem os formatos pedidos, nas versões atuais"""
+    versoes = _versoes_gravadas(diretorio, versao)
+    return all(versoes.get(formato) == VERSOES_FORMATOS[formato] for formato in formatos)
+
+
+def gerar_dossie(fonte, saida, formatos=FORMATOS_PADRAO, forcar=False):
+    """Gera o dossiê de um caso em ``saida/<numBeneficio>/``
+
+    Devolve ``(diretorio, bytes_gravados)``; ``bytes_gravados`` é None
+    quando o dossiê existente já estava atualizado.
+    """
+    num_beneficio = fonte['segurado']['numBeneficio']
+    diretorio = Path(saida) / num_beneficio
+    versao = versao_fonte(fonte)
+    if not forcar and _dossie_atual(diretorio, versao, formatos):
+        return diretorio, None
+
+    caso = montar_caso(fonte)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    total = 0
+    if 'html' in formatos:
+        total += gravar_atomico(diretorio / ARQUIVO_RELATORIO, lambda arquivo: escrever_relatorio(caso, arquivo))
+    if 'csv' in formatos:
+        for tabela, nome in TABELAS_CSV.items():
+            total += gravar_atomico(diretorio / nome, lambda arquivo: escrever_csv(caso[tabela], arquivo))
+    if 'pdf' in formatos:
+        total += gravar_atomico(diretorio / ARQUIVO_PDF, lambda arquivo: escrever_relatorio_pdf(caso, arquivo))
+    # Formatos gravados antes, ainda atuais, continuam valendo
+    versoes = {
+        formato: versao_formato for formato, versao_formato in _versoes_gravadas(diretorio, versao).items()
+        if VERSOES_FORMATOS.get(formato) == versao_formato
+    }
+    versoes.update({formato: VERSOES_FORMATOS[formato] for formato in formatos})
+    dossie = json.dumps({
+        "numBeneficio": num_beneficio,
+        "versao": versao,
+        "formatos": sorted(versoes),
+        "versoesFormatos": dict(sorted(versoes.items()))
+    })
+    gravar_atomico(diretorio / ARQUIVO_DOSSIE, lambda arquivo: arquivo.write(dossie.encode('utf-8')))
+    return diretorio, total
+
+
+def _gerar_arquivo(tarefa):
+    """Gera o dossiê de um arquivo de caso; falhas viram o resultado com a mensagem de erro"""
+    caminho, saida, formatos, forcar = tarefa
+    try:
+        diretorio, total = gerar_dossie(carregar_fonte(caminho), saida, formatos, forcar)
+        return {"arquivo": caminho, "situacao": "mantido" if total is None else "gerado",
+                "diretorio": str(diretorio), "bytes": total or 0, "erro": ""}
+    except Exception as erro:
+        return {"arquivo": caminho, "situacao": "falha", "diretorio": "", "bytes": 0,
+                "erro": f"{type(erro).__name__}: {erro}"}
+
+
+def gerar_dossies(caminhos, saida, formatos=FORMATOS_PADRAO, processos=None, tamanho_lote=4, forcar=False, progresso=None):
+    """Gera os dossiês de vários casos em um pool de processos
+
+    No máximo ``processos`` dossiês são gerados ao mesmo tempo e cada
+    processo recebe ``tamanho_lote`` casos por vez. ``progresso``, se
+    informado, recebe ``(processados, total, segundos)``.
+    """
+    Path(saida).mkdir(parents=True, exist_ok=True)
+    tarefas = [(caminho, str(saida), tuple(formatos), forcar) for caminho in caminhos]
+    total = len(tarefas)
+    contagem = {"gerado": 0, "mantido": 0}
+    falhas = []
+    bytes_gravados = 0
+    inicio = time.perf_counter()
+
+    with multiprocessing.Pool(processos) as pool:
+        for processados, resultado in enumerate(pool.imap_unordered(_gerar_arquivo, tarefas, chunksize=tamanho_lote), 1):
+            if resultado["situacao"] == "falha":
+                falhas.append((resultado["arquivo"], resultado["erro"]))
+            else:
+                contagem[resultado["situacao"]] += 1
+                bytes_gravados += resultado["bytes"]
+            if progresso is not None:
+                progresso(processados, total, time.perf_counter() - inicio)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "casos": total,
+        "gerados": contagem["gerado"],
+        "mantidos": contagem["mantido"],
+        "falhas": falhas,
+        "bytes": bytes_gravados,
+        "segundos": segundos,
+        "casosPorSegundo": total / segundos if segundos > 0 else 0.0
+    }
+
+
+def gerar_pdf_unico(caminhos, destino, progresso=None):
+    """Grava os relatórios PDF de todos os casos, em sequência, em um único arquivo
+
+    Os casos são carregados um a um enquanto o PDF é gravado; casos que
+    não podem ser carregados ficam de fora e são listados em ``falhas``.
+    """
+    total = len(caminhos)
+    falhas = []
+    inicio = time.perf_counter()
+
+    def casos():
+        for processados, caminho in enumerate(caminhos, 1):
+            try:
+                caso = montar_caso(carregar_fonte(caminho))
+            except Exception as erro:
+                falhas.append((caminho, f"{type(erro).__name__}: {erro}"))
+            else:
+                yield caso
+            if progresso is not None:
+                progresso(processados, total, time.perf_counter() - inicio)
+
+    Path(destino).parent.mkdir(parents=True, exist_ok=True)
+    bytes_gravados = gravar_atomico(Path(destino), lambda arquivo: escrever_pdf(casos(), arquivo))
+    segundos = time.perf_counter() - inicio
+    return {
+        "casos": total,
+        "gerados": total - len(falhas),
+        "mantidos": 0,
+        "falhas": falhas,
+        "bytes": bytes_gravados,
+        "segundos": segundos,
+        "casosPorSegundo": total / segundos if segundos > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geração em lote dos dossiês de auditoria previdenciária")
+    parser.add_argument('entrada', help="diretório de casos JSON ou manifesto com um caminho por linha")
+    parser.add_argument('--saida', default='dossies', help="diretório onde os dossiês são gravados")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=list(FORMATOS_PADRAO), help="arquivos gerados")
+    parser.add_argument('--pdf-unico', metavar='ARQUIVO',
+                        help="grava os relatórios PDF de todos os casos em um único arquivo, em vez dos dossiês")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="dossiês gerados ao mesmo tempo (padrão: número de CPUs)")
+    parser.add_argument('--lote', type=int, default=4, help="casos enviados por vez a cada processo")
+    parser.add_argument('--forcar', action='store_true', help="regera também os dossiês já atualizados")
+    args = parser.parse_args(argv)
+
+    caminhos = listar_casos(args.entrada)
+
+    def progresso(processados, total, segundos):
+        if processados % 100 == 0 or processados == total:
+            print(f"{processados}/{total} dossiês ({processados / segundos:.1f} casos/s)", file=sys.stderr)
+
+    if args.pdf_unico:
+        resultado = gerar_pdf_unico(caminhos, args.pdf_unico, progresso)
+    else:
+        resultado = gerar_dossies(caminhos, args.saida, args.formatos, args.processos, args.lote, args.forcar, progresso)
+
+    print(f"Dossiês: {resultado['casos']} casos ({resultado['gerados']} gerados, {resultado['mantidos']} mantidos, "
+          f"{len(resultado['falhas'])} falhas), {resultado['bytes'] / 2**20:.1f} MiB "
+          f"em {resultado['segundos']:.2f}s - {resultado['casosPorSegundo']:.1f} casos/s")
+    for arquivo, erro in resultado['falhas']:
+        print(f"  FALHA {arquivo}: {erro}", file=sys.stderr)
+    return 1 if resultado['falhas'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
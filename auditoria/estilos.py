@@ -0,0 +1,63 @@
+"""Estilos vetorizados para destacar linhas de tabelas pelo status
+
+As funções devolvem a matriz completa de CSS em uma única passada, para uso
+com ``Styler.apply(func, axis=None)``, em vez de chamar uma função Python
+por linha.
+"""
+
+import numpy as np
+import pandas as pd
+
+CSS_INDEFERIDO_INCORRETO = 'background-color: #FFCDD2'
+CSS_CONSIDERADO = 'background-color: #C8E6C9'
+
+
+def estilos_por_linha(df, condicoes, padrao=''):
+    """Monta a matriz de CSS de ``df`` a partir de pares (máscara, css)
+
+    Cada máscara tem um valor booleano por linha; a primeira condição
+    verdadeira define o estilo da linha inteira.
+    """
+    if not condicoes:
+        css_linhas = np.full(len(df), padrao, dtype=object)
+    else:
+        css_linhas = np.select(
+            [np.asarray(mascara, dtype=bool) for mascara, _ in condicoes],
+            [css for _, css in condicoes],
+            default=padrao
+        )
+    matriz = np.repeat(css_linhas.astype(object)[:, None], df.shape[1], axis=1)
+    return pd.DataFrame(matriz, index=df.index, columns=df.columns)
+
+
+def destacar_por_status(df, regras, coluna='status', padrao=''):
+    """Destaca linhas conforme o status, com máscara adicional opcional
+
+    ``regras`` é uma lista de ``(status, css)`` ou ``(status, css, mascara)``;
+    quando presente, a máscara restringe a regra às linhas marcadas.
+    """
+    status = df[coluna].to_numpy()
+    condicoes = []
+    for regra in regras:
+        valor, css = regra[0], regra[1]
+        mascara = status == valor
+        if len(regra) > 2:
+            mascara &= np.asarray(regra[2], dtype=bool)
+        condicoes.append((mascara, css))
+    return estilos_por_linha(df, condicoes, padrao)
+
+
+def estilo_contribuicoes(df, registros_considerados=None, mascara_maiores=None):
+    """Estilo da tabela de contribuições do CNIS
+
+    Contribuições indeferidas entre os 80% maiores salários ficam em
+    vermelho e as consideradas em verde. A tabela deve estar ordenada pelo
+    valor corrigido decrescente quando se informa ``registros_considerados``;
+    para visões com vários segurados, informe ``mascara_maiores`` por linha.
+    """
+    if mascara_maiores is None:
+        mascara_maiores = np.arange(len(df)) < registros_considerados
+    return destacar_por_status(df, [
+        ('Indeferido', CSS_INDEFERIDO_INCORRETO, mascara_maiores),
+        ('Considerado', CSS_CONSIDERADO)
+    ])
@@ -0,0 +1,150 @@
+"""Dados do caso de exemplo usado pelo dashboard"""
+
+# Caso de exemplo no formato de fonte aceito por auditoria.casos.montar_caso
+CASO_EXEMPLO = {
+    "segurado": {
+        "nome": "ANTONIO FRANCISCO BEZERRA",
+        "cpf": "094.805.283-04",
+        "dataNascimento": "11/01/1954",
+        "nit": "112.54588.29-3",
+        "numBeneficio": "171516921-0",
+        "especieBeneficio": "42 - Aposentadoria por Tempo de Contribuição",
+        "dataRequerimento": "11/12/2014",
+        "idade": {
+            "anos": 60,
+            "meses": 11,
+            "dias": 0
+        },
+        "tempoContribuicao": {
+            "anos": 38,
+            "meses": 1,
+            "dias": 25
+        }
+    },
+    "comparativo": {
+        "inss": {
+            "totalContribuicoes": 215,
+            "contribuicoesConsideradas": 172,
+            "mediaContribuicoes": 3951.76,
+            "fatorPrevidenciario": 0.9373,
+            "salarioBeneficio": 3703.98
+        },
+        "auditoria": {
+            "totalContribuicoes": 45,
+            "contribuicoesConsideradas": 36,
+            "contribuicoesReaproveitaveis": 37,
+            "mediaContribuicoes": 4655.28,
+            "fatorPrevidenciario": 0.9282,
+            "salarioBeneficio": 4321.03
+        }
+    },
+    "fator_previdenciario": {
+        "tempoContribuicao": 38.14,  # Anos
+        "aliquota": 0.31,
+        "expectativaSobrevida": 21.8,  # Anos
+        "idade": 60.92  # Anos
+    },
+    "evolucao_beneficio": [
+        {"ano": 2015, "inss": 3934.84, "auditoria": 4590.33, "reajuste": 6.23, "indiceSinapi": 8.19},
+        {"ano": 2016, "inss": 4378.29, "auditoria": 5108.09, "reajuste": 11.28, "indiceSinapi": 6.64},
+        {"ano": 2017, "inss": 4420.22, "auditoria": 5157.17, "reajuste": 0.98, "indiceSinapi": 3.82},
+        {"ano": 2018, "inss": 4511.71, "auditoria": 5263.98, "reajuste": 2.10, "indiceSinapi": 3.05},
+        {"ano": 2019, "inss": 4666.46, "auditoria": 5444.15, "reajuste": 3.43, "indiceSinapi": 3.86},
+        {"ano": 2020, "inss": 4875.51, "auditoria": 5688.65, "reajuste": 4.45, "indiceSinapi": 10.16},
+        {"ano": 2021, "inss": 5141.22, "auditoria": 5997.96, "reajuste": 5.46, "indiceSinapi": 18.65},
+        {"ano": 2022, "inss": 5663.56, "auditoria": 6607.11, "reajuste": 10.21, "indiceSinapi": 9.34},
+        {"ano": 2023, "inss": 5999.40, "auditoria": 6999.33, "reajuste": 5.92, "indiceSinapi": 2.76},
+        {"ano": 2024, "inss": 6221.97, "auditoria": 7259.00, "reajuste": 3.72, "indiceSinapi": 1.68},
+        {"ano": 2025, "inss": 6518.75, "auditoria": 7611.64, "reajuste": 4.77, "indiceSinapi": 2.05}
+    ],
+    "diferencas_acumuladas": [
+        {"ano": 2015, "mensal": 655.49, "meses": 12, "acumuladoAno": 7865.88, "correcao": 655.49, "juros": 0, "totalAno": 8521.37, "indiceSelic": 14.25},
+        {"ano": 2016, "mensal": 729.80, "meses": 12, "acumuladoAno": 8757.60, "correcao": 729.80, "juros": 0, "totalAno": 9487.40, "indiceSelic": 13.75},
+        {"ano": 2017, "mensal": 736.95, "meses": 12, "acumuladoAno": 8843.40, "correcao": 845.75, "juros": 0.25, "totalAno": 9689.40, "indiceSelic": 7.00},
+        {"ano": 2018, "mensal": 752.27, "meses": 12, "acumuladoAno": 9027.24, "correcao": 880.00, "juros": 0, "totalAno": 9907.24, "indiceSelic": 6.50},
+        {"ano": 2019, "mensal": 777.69, "meses": 12, "acumuladoAno": 9332.28, "correcao": 1002.00, "juros": 0, "totalAno": 10334.28, "indiceSelic": 4.50},
+        {"ano": 2020, "mensal": 813.14, "meses": 12, "acumuladoAno": 9757.68, "correcao": 1001.00, "juros": 0, "totalAno": 10758.68, "indiceSelic": 2.00},
+        {"ano": 2021, "mensal": 856.74, "meses": 12, "acumuladoAno": 10280.88, "correcao": 1080.40, "juros": 0, "totalAno": 11361.28, "indiceSelic": 9.25},
+        {"ano": 2022, "mensal": 943.55, "meses": 12, "acumuladoAno": 11322.60, "correcao": 598.80, "juros": 0, "totalAno": 11921.40, "indiceSelic": 13.75},
+        {"ano": 2023, "mensal": 999.93, "meses": 12, "acumuladoAno": 11999.16, "correcao": 599.52, "juros": 0, "totalAno": 12598.68, "indiceSelic": 11.75},
+        {"ano": 2024, "mensal": 1037.03, "meses": 12, "acumuladoAno": 12444.36, "correcao": 408.00, "juros": 0, "totalAno": 12852.36, "indiceSelic": 10.50},
+        {"ano": 2025, "mensal": 1092.89, "meses": 4, "acumuladoAno": 4371.56, "correcao": 743.12, "juros": 8000.00, "totalAno": 13114.68, "indiceSelic": 10.50}
+    ],
+    "total_devido": {
+        "diferencasVencidas": 72146.39,
+        "correcaoMonetaria": 11789.82,
+        "jurosLegais": 26194.33,
+        "totalGeral": 110130.54,
+        "parcelasMensais": {
+            "valor24": 5060.42,
+            "valor36": 3506.52,
+            "valor60": 2304.86
+        }
+    },
+    "vinculos_empregaticos": [
+        {"seq": 1, "nit": "107.98673.20-3", "empresa": "SEDEL ENGENHARIA LTDA", "cnpj": "06.049.282/0001-06", "inicio": "12/05/1977", "fim": "14/01/1981", "status": "ENCERRADO"},
+        {"seq": 2, "nit": "107.98673.20-3", "empresa": "TELECOMUNICACOES DO MARANHAO S.A", "cnpj": "06.274.633/0001-74", "inicio": "20/01/1981", "fim": "09/2001", "status": "ENCERRADO"},
+        {"seq": 3, "nit": "112.54588.29-3", "empresa": "TELEMAR NORTE LESTE S/A. - EM RECUPERACAO JUDICIAL", "cnpj": "33.000.118/0062-90", "inicio": "20/01/1981", "fim": "10/05/2016", "status": "ENCERRADO"},
+        {"seq": 4, "nit": "112.54588.29-3", "empresa": "RECOLHIMENTO (EMPREGADO DOMÉSTICO)", "cnpj": "-", "inicio": "01/11/1989", "fim": "31/03/1990", "status": "ENCERRADO"},
+        {"seq": 5, "nit": "112.54588.29-3", "empresa": "RECOLHIMENTO (EMPREGADO DOMÉSTICO)", "cnpj": "-", "inicio": "01/05/1990", "fim": "31/10/1990", "status": "ENCERRADO"},
+        {"seq": 6, "nit": "112.54588.29-3", "empresa": "PERÍODO DE ATIVIDADE DE SEGURADO ESPECIAL", "cnpj": "-", "inicio": "04/01/2001", "fim": "-", "status": "ENCERRADO"},
+        {"seq": 7, "nit": "107.98673.20-3", "empresa": "TELEMAR NORTE LESTE S/A. - EM RECUPERACAO JUDICIAL", "cnpj": "33.000.118/0062-90", "inicio": "01/04/2002", "fim": "-", "status": "ENCERRADO"},
+        {"seq": 8, "nit": "107.98673.20-3", "empresa": "BENEFÍCIO 42 - APOSENTADORIA POR TEMPO DE CONTRIBUICAO", "cnpj": "-", "inicio": "11/12/2014", "fim": "-", "status": "ATIVO"}
+    ],
+    "contribuicoes_cnis": [
+        {"competencia": "01/2014", "salario": 4390.24, "indice": 1.005, "corrigido": 4412.19, "status": "Considerado"},
+        {"competencia": "02/2014", "salario": 4390.24, "indice": 1.010, "corrigido": 4434.14, "status": "Considerado"},
+        {"competencia": "03/2014", "salario": 4390.24, "indice": 1.015, "corrigido": 4456.09, "status": "Considerado"},
+        {"competencia": "04/2014", "salario": 4390.24, "indice": 1.020, "corrigido": 4478.04, "status": "Considerado"},
+        {"competencia": "05/2014", "salario": 4390.24, "indice": 1.025, "corrigido": 4499.99, "status": "Considerado"},
+        {"competencia": "06/2014", "salario": 4390.24, "indice": 1.030, "corrigido": 4521.95, "status": "Considerado"},
+        {"competencia": "07/2014", "salario": 6049.73, "indice": 1.035, "corrigido": 6261.47, "status": "Considerado"},
+        {"competencia": "08/2014", "salario": 4940.69, "indice": 1.040, "corrigido": 5138.32, "status": "Considerado"},
+        {"competencia": "09/2014", "salario": 5320.14, "indice": 1.045, "corrigido": 5559.55, "status": "Considerado"},
+        {"competencia": "10/2014", "salario": 4820.40, "indice": 1.050, "corrigido": 5061.42, "status": "Considerado"},
+        {"competencia": "11/2014", "salario": 5395.92, "indice": 1.055, "corrigido": 5692.70, "status": "Considerado"},
+        {"competencia": "12/2014", "salario": 5127.20, "indice": 1.060, "corrigido": 5434.83, "status": "Considerado"},
+        {"competencia": "01/2013", "salario": 3525.06, "indice": 1.095, "corrigido": 3859.94, "status": "Considerado"},
+        {"competencia": "02/2013", "salario": 6291.25, "indice": 1.100, "corrigido": 6920.38, "status": "Considerado"},
+        {"competencia": "03/2013", "salario": 4875.47, "indice": 1.105, "corrigido": 5387.39, "status": "Considerado"},
+        {"competencia": "04/2013", "salario": 3942.83, "indice": 1.110, "corrigido": 4376.54, "status": "Considerado"},
+        {"competencia": "05/2013", "salario": 3872.51, "indice": 1.115, "corrigido": 4317.85, "status": "Considerado"},
+        {"competencia": "06/2013", "salario": 5512.53, "indice": 1.120, "corrigido": 6174.03, "status": "Indeferido"},
+        {"competencia": "07/2013", "salario": 5433.08, "indice": 1.125, "corrigido": 6112.21, "status": "Indeferido"},
+        {"competencia": "08/2013", "salario": 5104.12, "indice": 1.130, "corrigido": 5767.66, "status": "Indeferido"},
+        {"competencia": "09/2013", "salario": 4757.47, "indice": 1.135, "corrigido": 5399.73, "status": "Considerado"},
+        {"competencia": "10/2013", "salario": 4564.30, "indice": 1.140, "corrigido": 5203.30, "status": "Considerado"},
+        {"competencia": "11/2013", "salario": 4564.30, "indice": 1.145, "corrigido": 5226.12, "status": "Considerado"},
+        {"competencia": "12/2013", "salario": 5485.45, "indice": 1.150, "corrigido": 6308.27, "status": "Indeferido"},
+        {"competencia": "01/2012", "salario": 3430.37, "indice": 1.155, "corrigido": 3962.08, "status": "Considerado"},
+        {"competencia": "02/2012", "salario": 4014.46, "indice": 1.160, "corrigido": 4656.77, "status": "Considerado"},
+        {"competencia": "03/2012", "salario": 4438.21, "indice": 1.165, "corrigido": 5170.51, "status": "Considerado"},
+        {"competencia": "04/2012", "salario": 4688.31, "indice": 1.170, "corrigido": 5485.32, "status": "Considerado"},
+        {"competencia": "05/2012", "salario": 5787.53, "indice": 1.175, "corrigido": 6800.35, "status": "Considerado"},
+        {"competencia": "06/2012", "salario": 5183.01, "indice": 1.180, "corrigido": 6115.95, "status": "Indeferido"},
+        {"competencia": "07/2012", "salario": 4920.29, "indice": 1.185, "corrigido": 5830.54, "status": "Indeferido"},
+        {"competencia": "08/2012", "salario": 3328.33, "indice": 1.190, "corrigido": 3960.71, "status": "Indeferido"},
+        {"competencia": "09/2012", "salario": 5687.93, "indice": 1.195, "corrigido": 6797.08, "status": "Indeferido"},
+        {"competencia": "10/2012", "salario": 4936.69, "indice": 1.200, "corrigido": 5924.03, "status": "Indeferido"},
+        {"competencia": "11/2012", "salario": 6339.03, "indice": 1.205, "corrigido": 7638.53, "status": "Indeferido"},
+        {"competencia": "12/2012", "salario": 6206.18, "indice": 1.210, "corrigido": 7509.48, "status": "Indeferido"},
+        {"competencia": "01/2011", "salario": 3876.06, "indice": 1.215, "corrigido": 4709.41, "status": "Considerado"},
+        {"competencia": "02/2011", "salario": 3104.00, "indice": 1.220, "corrigido": 3786.88, "status": "Considerado"},
+        {"competencia": "03/2011", "salario": 3104.00, "indice": 1.225, "corrigido": 3802.40, "status": "Considerado"},
+        {"competencia": "04/2011", "salario": 3104.00, "indice": 1.230, "corrigido": 3817.92, "status": "Considerado"},
+        {"competencia": "05/2011", "salario": 3104.00, "indice": 1.235, "corrigido": 3833.44, "status": "Considerado"},
+        {"competencia": "06/2011", "salario": 3865.89, "indice": 1.240, "corrigido": 4793.70, "status": "Indeferido"},
+        {"competencia": "07/2011", "salario": 4246.48, "indice": 1.245, "corrigido": 5286.87, "status": "Indeferido"},
+        {"competencia": "08/2011", "salario": 5036.96, "indice": 1.250, "corrigido": 6296.20, "status": "Indeferido"},
+        {"competencia": "09/2011", "salario": 3107.30, "indice": 1.255, "corrigido": 3899.66, "status": "Indeferido"}
+    ]
+}
+
+# Fundamentos legais citados em todos os relatórios
+FUNDAMENTOS_LEGAIS = [
+    {"lei": "Lei nº 8.213/91, art. 29", "descricao": "Estabelece os critérios para cálculo do salário de benefício, incluindo a regra de consideração dos 80% maiores salários de contribuição."},
+    {"lei": "Lei nº 9.876/99", "descricao": "Institui o fator previdenciário e sua fórmula de cálculo."},
+    {"lei": "Decreto nº 3.048/99, art. 188-A", "descricao": "Regulamenta a aplicação do fator previdenciário."},
+    {"lei": "Instrução Normativa INSS/PRES nº 77/2015", "descricao": "Estabelece rotinas para aferição e comprovação do tempo de contribuição."},
+    {"lei": "Art. 103-A da Lei nº 8.213/91", "descricao": "Trata do prazo decadencial para revisão do benefício."}
+]
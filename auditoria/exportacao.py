@@ -0,0 +1,79 @@
+"""Exportação das tabelas em CSV e gravação atômica de arquivos
+
+``iterar_csv`` codifica um DataFrame em blocos e ``escrever_csv`` os grava
+em um arquivo à medida que são produzidos, sem montar um único objeto
+``bytes`` com o conteúdo inteiro. ``gravar_atomico`` grava em um temporário
+e o renomeia, para que leitores de outros processos (a fila de tarefas, a
+carteira) nunca vejam um arquivo pela metade.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+LINHAS_POR_BLOCO = 10_000
+
+# Muda quando o formato dos CSV muda; identifica arquivos gravados em disco
+VERSAO_CSV = 1
+
+
+def iterar_csv(df, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Codifica um DataFrame em CSV (UTF-8) bloco a bloco"""
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+    for inicio in range(0, len(df), linhas_por_bloco):
+        bloco = df.iloc[inicio:inicio + linhas_por_bloco]
+        yield bloco.to_csv(index=False, header=False).encode('utf-8')
+
+
+def convert_df_to_csv(df):
+    """Converte um DataFrame para CSV para download"""
+    return b''.join(iterar_csv(df))
+
+
+def gravar_partes(partes, destino):
+    """Grava partes em bytes em um arquivo binário ou caminho e devolve o total gravado"""
+    if isinstance(destino, (str, bytes)) or hasattr(destino, '__fspath__'):
+        with open(destino, 'wb') as arquivo:
+            return gravar_partes(partes, arquivo)
+    total = 0
+    for parte in partes:
+        destino.write(parte)
+        total += len(parte)
+    return total
+
+
+def escrever_csv(df, destino, linhas_por_bloco=LINHAS_POR_BLOCO, progresso=None):
+    """Grava um DataFrame em CSV em um arquivo ou caminho, bloco a bloco
+
+    ``progresso``, se informado, recebe a fração já gravada (0 a 1).
+    """
+    partes = iterar_csv(df, linhas_por_bloco)
+    if progresso is not None:
+        quantidade = 1 + -(-len(df) // linhas_por_bloco)
+        partes = _com_progresso(partes, quantidade, progresso)
+    return gravar_partes(partes, destino)
+
+
+def _com_progresso(partes, quantidade, progresso):
+    """Repassa as partes informando a fração já produzida"""
+    for posicao, parte in enumerate(partes, 1):
+        yield parte
+        progresso(posicao / quantidade)
+
+
+def gravar_atomico(caminho, escrever):
+    """Grava com ``escrever(arquivo)`` em um temporário e o renomeia para ``caminho``
+
+    Leitores nunca veem o arquivo pela metade; devolve o que ``escrever`` devolver.
+    """
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temporario, 'wb') as arquivo:
+            total = escrever(arquivo)
+        os.replace(temporario, caminho)
+    finally:
+        if temporario.exists():
+            temporario.unlink()
+    return total
+
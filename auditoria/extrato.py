@@ -0,0 +1,295 @@
+"""Leitura do extrato do CNIS em texto, linha a linha
+
+Uso:
+    python -m auditoria.extrato EXTRATO.txt [--saida extrato.json]
+
+O extrato é o texto do PDF do CNIS convertido com ``pdftotext -layout``
+(arquivos ``.pdf`` são convertidos por ``pdftotext`` em fluxo). A leitura é
+um encadeamento de geradores: ``ler_linhas`` -> ``iterar_registros`` ->
+``mesclar_registros``; nenhum estágio guarda o arquivo inteiro em memória.
+
+Linhas reconhecidas:
+
+* identificação: ``NIT: 107.98673.20-3  CPF: ...  Nome: ...``
+* vínculo: ``Seq  NIT  [Código]  Origem do Vínculo  [Tipo]  Início  [Fim]  [Indicadores]``
+  (sem código de empregador, CNPJ ou CEI, o vínculo fica com ``cnpj`` ``-``)
+* remunerações: pares ``MM/AAAA  1.234,56  [INDICADORES]`` (vários por linha)
+* recolhimentos: ``MM/AAAA  dd/mm/aaaa  contribuição  salário  [INDICADORES]``
+
+Demais linhas (cabeçalhos, rodapés, quebras de página) são ignoradas.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from auditoria.cnis import STATUS_INDEFERIDO
+from auditoria.registros import competencia_para_mes
+
+STATUS_CONSIDERADO = 'Considerado'
+
+_NIT = r'\d{3}\.\d{5}\.\d{2}-\d'
+_DATA = r'\d{2}/\d{2}/\d{4}|\d{2}/\d{4}'
+_VALOR = r'\d{1,3}(?:\.\d{3})*,\d{2}'
+_INDICADORES = r'[A-Z][A-Z0-9\-]*(?:\s*,\s*[A-Z][A-Z0-9\-]*)*'
+# Código do empregador: CNPJ, CEI (com ou sem pontuação) ou ``-``
+_CODIGO_EMPREGADOR = r'-|\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}|\d{2}\.?\d{3}\.?\d{5}/?\d{2}'
+
+RE_IDENTIFICACAO = re.compile(rf'NIT:\s*({_NIT})')
+RE_CPF = re.compile(r'CPF:\s*(\d{3}\.\d{3}\.\d{3}-\d{2})')
+RE_NOME = re.compile(r'Nome:\s*(.+?)\s*$')
+RE_VINCULO = re.compile(rf'^\s*(\d{{1,4}})\s+({_NIT})\s{{2,}}(.+)$')
+RE_DATA = re.compile(rf'^(?:{_DATA})$')
+RE_CODIGO_EMPREGADOR = re.compile(rf'^(?:{_CODIGO_EMPREGADOR})$')
+RE_REMUNERACAO = re.compile(rf'(\d{{2}}/\d{{4}})\s+({_VALOR})(?:\s+({_INDICADORES}))?(?=\s+\d{{2}}/\d{{4}}|\s*$)')
+RE_RECOLHIMENTO = re.compile(
+    rf'^\s*(\d{{2}}/\d{{4}})\s+(\d{{2}}/\d{{2}}/\d{{4}})\s+({_VALOR})\s+({_VALOR})(?:\s+({_INDICADORES}))?\s*$'
+)
+RE_INICIO_REMUNERACAO = re.compile(rf'^\s*\d{{2}}/\d{{4}}\s+{_VALOR}')
+
+# Indicadores de pendência do CNIS: a competência não é aceita sem comprovação
+PREFIXOS_PENDENCIA = ('P', 'AVRC', 'IREC')
+
+
+def _valor(texto):
+    """Converte ``1.234,56`` em float"""
+    return float(texto.replace('.', '').replace(',', '.'))
+
+
+def _pendente(indicadores):
+    """Indica se algum dos indicadores da competência é de pendência"""
+    return any(indicador.strip().startswith(PREFIXOS_PENDENCIA) for indicador in indicadores.split(',') if indicador.strip())
+
+
+@contextmanager
+def _abrir(origem):
+    """Abre um caminho de texto, um PDF (via ``pdftotext``) ou usa o arquivo já aberto"""
+    if hasattr(origem, 'read'):
+        yield origem
+        return
+    if str(origem).lower().endswith('.pdf'):
+        processo = subprocess.Popen(
+            ['pdftotext', '-layout', str(origem), '-'],
+            stdout=subprocess.PIPE, text=True, encoding='utf-8', errors='replace'
+        )
+        try:
+            yield processo.stdout
+        finally:
+            processo.stdout.close()
+            if processo.wait() != 0:
+                raise RuntimeError(f"pdftotext falhou ao converter {origem}")
+        return
+    with open(origem, encoding='utf-8', errors='replace') as arquivo:
+        yield arquivo
+
+
+def ler_linhas(origem, estatisticas=None):
+    """Gera as linhas do extrato, contando linhas e bytes em ``estatisticas``"""
+    with _abrir(origem) as arquivo:
+        for linha in arquivo:
+            if estatisticas is not None:
+                estatisticas['linhas'] += 1
+                estatisticas['bytes'] += len(linha)
+            yield linha.rstrip('\n')
+
+
+def _vinculo(seq, nit, resto):
+    """Monta o vínculo a partir das colunas após Seq e NIT"""
+    colunas = re.split(r'\s{2,}', resto.strip())
+    # A primeira coluna só é o código quando parece um CNPJ ou CEI; senão já é a origem
+    if len(colunas) > 1 and RE_CODIGO_EMPREGADOR.match(colunas[0]):
+        codigo, colunas = colunas[0], colunas[1:]
+    else:
+        codigo = '-'
+    datas = [indice for indice, coluna in enumerate(colunas) if RE_DATA.match(coluna)]
+    if not datas:
+        return None
+    textos = colunas[:datas[0]]
+    apos_datas = colunas[datas[-1] + 1:]
+    inicio = colunas[datas[0]]
+    fim = colunas[datas[1]] if len(datas) > 1 else '-'
+    indicadores = ', '.join(coluna for coluna in apos_datas if re.fullmatch(_INDICADORES, coluna))
+    return {
+        "seq": int(seq),
+        "nit": nit,
+        "empresa": textos[0] if textos else codigo,
+        "cnpj": codigo,
+        "inicio": inicio,
+        "fim": fim,
+        "status": "ATIVO" if fim == '-' else "ENCERRADO",
+        "indicadores": indicadores
+    }
+
+
+def iterar_registros(linhas):
+    """Converte linhas em registros ``('segurado'|'vinculo'|'contribuicao', dados)``
+
+    Segurado e vínculo vêm como dicionários; cada contribuição vem como a
+    tupla ``(competencia, salario, pendente, nit, seq)``, associada ao
+    vínculo da linha de vínculo mais recente (ou ao NIT da identificação).
+    """
+    nit_atual = None
+    seq_atual = None
+    for linha in linhas:
+        # Remunerações são a maior parte do extrato: testadas primeiro
+        if RE_INICIO_REMUNERACAO.match(linha):
+            for competencia, salario, indicadores in RE_REMUNERACAO.findall(linha):
+                yield 'contribuicao', (competencia, _valor(salario), bool(indicadores) and _pendente(indicadores),
+                                       nit_atual, seq_atual)
+            continue
+
+        encontrado = RE_RECOLHIMENTO.match(linha)
+        if encontrado:
+            competencia, _, _, salario, indicadores = encontrado.groups()
+            yield 'contribuicao', (competencia, _valor(salario), bool(indicadores) and _pendente(indicadores),
+                                   nit_atual, seq_atual)
+            continue
+
+        encontrado = RE_VINCULO.match(linha)
+        if encontrado:
+            vinculo = _vinculo(*encontrado.groups())
+            if vinculo is not None:
+                nit_atual, seq_atual = vinculo['nit'], vinculo['seq']
+                yield 'vinculo', vinculo
+            continue
+
+        if 'NIT:' in linha:
+            encontrado = RE_IDENTIFICACAO.search(linha)
+            if encontrado:
+                nit_atual, seq_atual = encontrado.group(1), None
+                cpf = RE_CPF.search(linha)
+                nome = RE_NOME.search(linha)
+                yield 'segurado', {
+                    "nit": nit_atual,
+                    "cpf": cpf.group(1) if cpf else None,
+                    "nome": nome.group(1) if nome else None
+                }
+
+
+def mesclar_registros(registros):
+    """Une os registros de todos os NITs do segurado
+
+    Vínculos repetidos em mais de um NIT (mesmo código e início) entram uma
+    vez, e as remunerações da cópia repetida são descartadas. Remunerações
+    da mesma competência (vínculos concomitantes ou NITs diferentes) são
+    somadas; a competência fica indeferida se alguma parcela tem pendência.
+    Devolve ``(segurado, vinculos, contribuicoes)``.
+    """
+    segurado = {"nome": None, "cpf": None, "nits": []}
+    vinculos = {}
+    duplicados = set()
+    salarios = {}
+    pendentes = set()
+    for tipo, dados in registros:
+        if tipo == 'contribuicao':
+            competencia, salario, pendente, nit, seq = dados
+            if (nit, seq) in duplicados:
+                continue
+            salarios[competencia] = salarios.get(competencia, 0.0) + salario
+            if pendente:
+                pendentes.add(competencia)
+        elif tipo == 'vinculo':
+            chave = (dados['cnpj'], dados['inicio']) if dados['cnpj'] != '-' else (dados['empresa'], dados['inicio'])
+            if vinculos.setdefault(chave, dados) is not dados:
+                duplicados.add((dados['nit'], dados['seq']))
+        else:
+            if dados['nit'] not in segurado['nits']:
+                segurado['nits'].append(dados['nit'])
+            segurado['nome'] = segurado['nome'] or dados['nome']
+            segurado['cpf'] = segurado['cpf'] or dados['cpf']
+
+    ordenados = sorted(vinculos.values(), key=lambda v: (competencia_para_mes(v['inicio'][-7:]), v['seq']))
+    vinculos_empregaticos = [
+        {**{chave: valor for chave, valor in vinculo.items() if chave != 'indicadores'}, "seq": seq}
+        for seq, vinculo in enumerate(ordenados, start=1)
+    ]
+    contribuicoes_cnis = [
+        {
+            "competencia": competencia,
+            "salario": round(salarios[competencia], 2),
+            "indice": 1.0,
+            "corrigido": round(salarios[competencia], 2),
+            "status": STATUS_INDEFERIDO if competencia in pendentes else STATUS_CONSIDERADO
+        }
+        for competencia in sorted(salarios, key=competencia_para_mes)
+    ]
+    return segurado, vinculos_empregaticos, contribuicoes_cnis
+
+
+def corrigir_contribuicoes(contribuicoes, serie, ate):
+    """Preenche ``indice`` e ``corrigido`` com o fator da série até a competência ``ate``"""
+    for contribuicao in contribuicoes:
+        indice = serie.fator(contribuicao['competencia'], ate)
+        contribuicao['indice'] = round(indice, 6)
+        contribuicao['corrigido'] = round(contribuicao['salario'] * indice, 2)
+    return contribuicoes
+
+
+def ler_extrato(origem, serie=None, ate=None):
+    """Lê um extrato do CNIS e devolve segurado, vínculos, contribuições e estatísticas
+
+    Com ``serie`` (uma ``SerieIndice``) e ``ate``, os salários são corrigidos
+    até a competência informada.
+    """
+    estatisticas = {"linhas": 0, "bytes": 0}
+    inicio = time.perf_counter()
+    segurado, vinculos, contribuicoes = mesclar_registros(iterar_registros(ler_linhas(origem, estatisticas)))
+    if serie is not None:
+        corrigir_contribuicoes(contribuicoes, serie, ate)
+    segundos = time.perf_counter() - inicio
+    estatisticas.update(
+        segundos=segundos,
+        linhasPorSegundo=estatisticas['linhas'] / segundos if segundos > 0 else 0.0,
+        megabytesPorSegundo=estatisticas['bytes'] / 1e6 / segundos if segundos > 0 else 0.0,
+        vinculos=len(vinculos),
+        contribuicoes=len(contribuicoes)
+    )
+    return {
+        "segurado": segurado,
+        "vinculos_empregaticos": vinculos,
+        "contribuicoes_cnis": contribuicoes,
+        "estatisticas": estatisticas
+    }
+
+
+def aplicar_extrato(fonte, extrato):
+    """Devolve uma cópia dos dados de origem com vínculos e contribuições do extrato
+
+    O resultado segue o formato de ``CASO_EXEMPLO`` e pode ir direto para
+    ``registrar_fonte``, ``analisar_fonte`` ou ``ArmazemCasos.salvar``.
+    """
+    segurado = dict(fonte['segurado'])
+    if extrato['segurado']['nits']:
+        segurado['nit'] = extrato['segurado']['nits'][-1]
+    return {
+        **fonte,
+        "segurado": segurado,
+        "vinculos_empregaticos": extrato['vinculos_empregaticos'],
+        "contribuicoes_cnis": extrato['contribuicoes_cnis']
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leitura de extrato do CNIS em texto ou PDF")
+    parser.add_argument('extrato', help="extrato do CNIS (.txt de pdftotext -layout ou .pdf)")
+    parser.add_argument('--saida', help="arquivo JSON com vínculos e contribuições")
+    args = parser.parse_args(argv)
+
+    extrato = ler_extrato(args.extrato)
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(extrato, ensure_ascii=False, indent=1), encoding='utf-8')
+
+    estatisticas = extrato['estatisticas']
+    print(f"{estatisticas['linhas']} linhas, {estatisticas['vinculos']} vínculos, "
+          f"{estatisticas['contribuicoes']} competências em {estatisticas['segundos']:.2f}s - "
+          f"{estatisticas['linhasPorSegundo']:.0f} linhas/s ({estatisticas['megabytesPorSegundo']:.1f} MB/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
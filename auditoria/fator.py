@@ -0,0 +1,199 @@
+"""Fator previdenciário (Lei 8.213/91, art. 29, §7º), escalar e vetorizado
+
+    f = (Tc × a ÷ Es) × [1 + (Id + Tc × a) ÷ 100]
+
+A expectativa de sobrevida (Es) vem da tábua do IBGE vigente no ano da DER,
+pela idade em anos completos. A tábua fica em uma matriz (ano × idade), de
+modo que carteiras inteiras são avaliadas com uma única indexação NumPy.
+
+Todo cálculo usa a tábua do processo, obtida de ``tabela_expectativa()``:
+o CSV indicado pela variável de ambiente ``AUDITORIA_TABUA_IBGE`` (herdada
+pelos processos da auditoria em lote) ou, sem ela, só o valor do caso de
+exemplo. Combinações de ano e idade fora da tábua geram ``KeyError`` com as
+combinações que faltam, antes de qualquer cálculo.
+"""
+
+import csv
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+ALIQUOTA = 0.31
+
+# Tábua embutida: apenas o valor conferido no caso de exemplo. A tábua
+# completa deve ser carregada de CSV (colunas ``ano,idade,expectativa``).
+EXPECTATIVA_SOBREVIDA_CONHECIDA = {(2014, 60): 21.8}
+
+# CSV da tábua do IBGE; lido no primeiro uso de ``tabela_expectativa()``
+VARIAVEL_TABUA = 'AUDITORIA_TABUA_IBGE'
+
+
+def calcular_fator_previdenciario(tempo_contribuicao, aliquota, expectativa_sobrevida, idade):
+    """Calcula o fator previdenciário com o passo a passo exibido no dashboard"""
+    passo1 = tempo_contribuicao * aliquota
+    passo2 = passo1 / expectativa_sobrevida
+    passo3 = 1 + ((idade + passo1) / 100)
+    return {
+        "tempoContribuicao": tempo_contribuicao,
+        "aliquota": aliquota,
+        "expectativaSobrevida": expectativa_sobrevida,
+        "idade": idade,
+        "calculoFator": {
+            "passo1": passo1,
+            "passo2": passo2,
+            "passo3": passo3,
+            "resultadoFinal": passo2 * passo3
+        }
+    }
+
+
+class TabelaExpectativa:
+    """Tábua de expectativa de sobrevida por ano da DER e idade completa"""
+
+    def __init__(self, valores, origem='tábua embutida'):
+        if not valores:
+            raise ValueError(f"Tábua de expectativa de sobrevida vazia ({origem})")
+        self.origem = origem
+        anos = [ano for ano, _ in valores]
+        idades = [idade for _, idade in valores]
+        self.ano_inicial, self.idade_inicial = min(anos), min(idades)
+        matriz = np.full((max(anos) - self.ano_inicial + 1, max(idades) - self.idade_inicial + 1), np.nan)
+        for (ano, idade), expectativa in valores.items():
+            matriz[ano - self.ano_inicial, idade - self.idade_inicial] = expectativa
+        matriz.flags.writeable = False
+        self.matriz = matriz
+
+    @classmethod
+    def de_csv(cls, caminho):
+        """Lê uma tábua em CSV com as colunas ``ano,idade,expectativa``"""
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            return cls({
+                (int(linha['ano']), int(linha['idade'])): float(linha['expectativa'].replace(',', '.'))
+                for linha in csv.DictReader(arquivo)
+            }, origem=str(caminho))
+
+    def expectativa(self, ano_der, idade):
+        """Es para arrays de ano da DER e idade (em anos, fracionária ou não)
+
+        Levanta ``KeyError`` com as combinações (ano, idade) fora da tábua.
+        """
+        linhas = np.asarray(ano_der, dtype=np.int64) - self.ano_inicial
+        colunas = np.floor(np.asarray(idade, dtype=np.float64)).astype(np.int64) - self.idade_inicial
+        linhas, colunas = np.broadcast_arrays(linhas, colunas)
+        fora = (linhas < 0) | (linhas >= self.matriz.shape[0]) | (colunas < 0) | (colunas >= self.matriz.shape[1])
+        expectativa = np.full(linhas.shape, np.nan)
+        dentro = ~fora
+        expectativa[dentro] = self.matriz[linhas[dentro], colunas[dentro]]
+        faltantes = np.isnan(expectativa)
+        if faltantes.any():
+            combinacoes = sorted({
+                (int(linha) + self.ano_inicial, int(coluna) + self.idade_inicial)
+                for linha, coluna in zip(linhas[faltantes], colunas[faltantes])
+            })
+            listadas = ', '.join(f"DER em {ano} e idade {idade}" for ano, idade in combinacoes[:5])
+            if len(combinacoes) > 5:
+                listadas += f" e mais {len(combinacoes) - 5}"
+            raise KeyError(
+                f"Expectativa de sobrevida não tabelada ({self.origem}) para {listadas}; "
+                f"indique a tábua do IBGE em CSV na variável {VARIAVEL_TABUA} "
+                "ou com configurar_tabela_expectativa"
+            )
+        return expectativa if expectativa.ndim else float(expectativa)
+
+
+_TABELA = None
+_LOCK_TABELA = threading.Lock()
+
+
+def tabela_expectativa():
+    """Tábua do processo: o CSV de ``AUDITORIA_TABUA_IBGE`` ou a embutida, carregada uma única vez"""
+    global _TABELA
+    if _TABELA is None:
+        with _LOCK_TABELA:
+            if _TABELA is None:
+                caminho = os.environ.get(VARIAVEL_TABUA)
+                _TABELA = (
+                    TabelaExpectativa.de_csv(caminho) if caminho
+                    else TabelaExpectativa(EXPECTATIVA_SOBREVIDA_CONHECIDA)
+                )
+    return _TABELA
+
+
+def calcular_fatores(tempo_contribuicao, idade, ano_der, aliquota=ALIQUOTA, tabela=None):
+    """Calcula o fator de uma carteira inteira em uma chamada
+
+    Recebe arrays de Tc, Id e ano da DER e devolve um dicionário de arrays
+    com ``expectativaSobrevida``, ``passo1``, ``passo2``, ``passo3`` e
+    ``resultadoFinal``. Cada passo é uma operação NumPy sobre a carteira;
+    a memoização por combinação fica em ``fator_previdenciario``, pois
+    deduplicar os arrays custaria mais que recalculá-los.
+    """
+    tabela = tabela or tabela_expectativa()
+    tc, id_, ano = np.broadcast_arrays(
+        np.asarray(tempo_contribuicao, dtype=np.float64),
+        np.asarray(idade, dtype=np.float64),
+        np.asarray(ano_der, dtype=np.int64)
+    )
+    es = np.asarray(tabela.expectativa(ano, id_))
+    passo1 = tc * aliquota
+    passo2 = passo1 / es
+    passo3 = 1 + ((id_ + passo1) / 100)
+    return {
+        "expectativaSobrevida": es,
+        "passo1": passo1,
+        "passo2": passo2,
+        "passo3": passo3,
+        "resultadoFinal": passo2 * passo3
+    }
+
+
+class CacheFatores:
+    """Memoização limitada do fator por (idade, Tc, ano da DER, alíquota)"""
+
+    def __init__(self, capacidade=4096, tabela=None):
+        self.capacidade = capacidade
+        self.tabela = tabela
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, tempo_contribuicao, idade, ano_der, aliquota=ALIQUOTA):
+        """Devolve o passo a passo do fator, calculando apenas combinações novas"""
+        chave = (idade, tempo_contribuicao, ano_der, aliquota)
+        with self._lock:
+            fator = self._entradas.get(chave)
+            if fator is not None:
+                self._entradas.move_to_end(chave)
+                return fator
+        expectativa = (self.tabela or tabela_expectativa()).expectativa(ano_der, idade)
+        fator = calcular_fator_previdenciario(tempo_contribuicao, aliquota, expectativa, idade)
+        with self._lock:
+            self._entradas[chave] = fator
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+        return fator
+
+    def limpar(self):
+        """Descarta os fatores memorizados"""
+        with self._lock:
+            self._entradas.clear()
+
+
+CACHE_FATORES = CacheFatores()
+
+
+def fator_previdenciario(tempo_contribuicao, idade, ano_der, aliquota=ALIQUOTA):
+    """Passo a passo do fator de um segurado, com Es da tábua e memoização"""
+    return CACHE_FATORES.obter(tempo_contribuicao, idade, ano_der, aliquota)
+
+
+def configurar_tabela_expectativa(origem):
+    """Substitui a tábua do processo por uma ``TabelaExpectativa`` ou por um CSV"""
+    global _TABELA
+    if not isinstance(origem, TabelaExpectativa):
+        origem = TabelaExpectativa.de_csv(origem)
+    with _LOCK_TABELA:
+        _TABELA = origem
+    CACHE_FATORES.limpar()
+    return origem
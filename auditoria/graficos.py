@@ -0,0 +1,308 @@
+"""Renderização dos gráficos do dashboard com cache de imagens por caso
+
+Os gráficos são desenhados em ``matplotlib.figure.Figure`` sem passar pelo
+gerenciador do pyplot, então nenhuma figura fica registrada globalmente.
+Cada figura é liberada logo após ser salva e os bytes da imagem ficam em um
+cache LRU limitado por memória, indexado por caso, tipo de gráfico e formato.
+O matplotlib só é importado no primeiro desenho; acertos de cache e as
+métricas não dependem dele.
+"""
+
+import io
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from auditoria.perfil import medir
+
+FORMATOS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# Figuras criadas e ainda não coletadas pelo Python, para a métrica de figuras
+# vivas; saem do conjunto sozinhas quando a figura é de fato liberada
+_FIGURAS = weakref.WeakSet()
+_LOCK_FIGURAS = threading.Lock()
+
+
+@contextmanager
+def _figura(figsize):
+    """Cria uma figura fora do pyplot e a esvazia ao final, para que possa ser coletada"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    with _LOCK_FIGURAS:
+        _FIGURAS.add(fig)
+    try:
+        yield fig
+    finally:
+        fig.clear()
+
+
+def figuras_vivas():
+    """Quantidade de figuras matplotlib ainda em memória (próprias e do pyplot)
+
+    Figuras já desenhadas contam até o coletor de lixo liberá-las; um valor
+    que cresce entre reexecuções indica figuras retidas.
+    """
+    with _LOCK_FIGURAS:
+        proprias = len(_FIGURAS)
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    return proprias + (len(pyplot.get_fignums()) if pyplot is not None else 0)
+
+
+def _evolucao_beneficio(fig, data):
+    ax = fig.subplots()
+    evolucao = data['evolucao_beneficio']
+    ax.plot(evolucao['ano'], evolucao['inss'], marker='o', linewidth=2, color='#666666', label='Valor INSS')
+    ax.plot(evolucao['ano'], evolucao['auditoria'], marker='o', linewidth=2, color='#4E9F3D', label='Valor Correto')
+
+    # Formatação do gráfico
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Valor (R$)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.yaxis.set_major_formatter('R${x:,.2f}')
+
+    # Destacar a diferença
+    for i, ano in enumerate(evolucao['ano']):
+        inss = evolucao['inss'].iloc[i]
+        auditoria = evolucao['auditoria'].iloc[i]
+        if i % 2 == 0:  # Mostrar apenas em alguns pontos para não sobrecarregar
+            ax.annotate(f'R${auditoria-inss:.2f}',
+                        xy=(ano, auditoria),
+                        xytext=(0, 10),
+                        textcoords='offset points',
+                        ha='center',
+                        fontsize=8,
+                        color='#4E9F3D',
+                        bbox=dict(boxstyle='round,pad=0.3', fc='white', alpha=0.7))
+
+    ax.legend()
+    fig.tight_layout()
+
+
+def _indices_economicos(fig, data):
+    import matplotlib.ticker as mtick
+
+    ax = fig.subplots()
+    evolucao = data['evolucao_beneficio']
+    ax.plot(evolucao['ano'], evolucao['reajuste'], marker='o', linewidth=2, color='#4E9F3D', label='Reajuste INSS (%)')
+    ax.plot(evolucao['ano'], evolucao['indiceSinapi'], marker='s', linewidth=2, color='#D32F2F', label='Índice SINAPI (%)')
+
+    # Formatação do gráfico
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Percentual (%)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.yaxis.set_major_formatter(mtick.PercentFormatter())
+
+    ax.legend()
+    fig.tight_layout()
+
+
+def contagem_por_status(data):
+    """Conta contribuições consideradas e indeferidas (correta e erroneamente)"""
+    contribuicoes = data['contribuicoes_cnis']
+    indeferidas = (contribuicoes['status'] == 'Indeferido').to_numpy()
+    entre_maiores = np.arange(len(contribuicoes)) < data['analise_cnis']['registrosConsiderados']
+    return {
+        'Consideradas': int((contribuicoes['status'] == 'Considerado').sum()),
+        'Indeferidas corretamente': int((indeferidas & ~entre_maiores).sum()),
+        'Indeferidas erroneamente': int((indeferidas & entre_maiores).sum())
+    }
+
+
+def _distribuicao_status(fig, data):
+    ax = fig.subplots()
+    contagem = contagem_por_status(data)
+    ax.pie(list(contagem.values()), labels=list(contagem), autopct='%1.1f%%',
+           colors=['#4CAF50', '#9E9E9E', '#F44336'], startangle=90, wedgeprops={'edgecolor': 'white', 'linewidth': 1})
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.set_title('Distribuição das Contribuições por Status')
+
+
+def _composicao_devido(fig, data):
+    ax = fig.subplots()
+    total_devido = data['total_devido']
+    componentes = ['Diferenças Vencidas', 'Correção Monetária', 'Juros Legais']
+    valores = [
+        total_devido['diferencasVencidas'],
+        total_devido['correcaoMonetaria'],
+        total_devido['jurosLegais']
+    ]
+    cores = ['#1E5128', '#4E9F3D', '#A9D196']
+
+    ax.pie(valores, labels=componentes, autopct='%1.1f%%', colors=cores,
+           startangle=90, wedgeprops={'edgecolor': 'white', 'linewidth': 1})
+    ax.axis('equal')
+    ax.set_title(f'Composição do Valor Total Devido: R$ {total_devido["totalGeral"]:.2f}')
+
+
+def _comparativo(fig, data):
+    ax = fig.subplots()
+    inss = data['comparativo']['inss']
+    auditoria = data['comparativo']['auditoria']
+    parametros = ['Total de Contribuições', 'Contribuições Consideradas', 'Média Salarial (R$)', 'Salário Benefício (R$)']
+    chaves = ['totalContribuicoes', 'contribuicoesConsideradas', 'mediaContribuicoes', 'salarioBeneficio']
+
+    x = np.arange(len(parametros))
+    width = 0.35
+
+    inss_bars = ax.bar(x - width/2, [inss[c] for c in chaves], width, label='INSS', color='#666666')
+    auditoria_bars = ax.bar(x + width/2, [auditoria[c] for c in chaves], width, label='Auditoria', color='#4E9F3D')
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(parametros)
+    ax.legend()
+
+    # Adicionar valores nas barras
+    for rect in list(inss_bars) + list(auditoria_bars):
+        height = rect.get_height()
+        ax.annotate('{:.2f}'.format(height) if height > 100 else '{:.0f}'.format(height),
+                    xy=(rect.get_x() + rect.get_width() / 2, height),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha='center', va='bottom',
+                    fontsize=9)
+
+    fig.tight_layout()
+
+
+def _diferencas_acumuladas(fig, data):
+    ax = fig.subplots()
+    diferencas = data['diferencas_acumuladas']
+
+    # Linha para valor total
+    ax.plot(diferencas['ano'], diferencas['totalAno'],
+            marker='o', color='#4E9F3D', linewidth=2, label='Valor Acumulado')
+
+    # Área sob a curva
+    ax.fill_between(diferencas['ano'], diferencas['totalAno'], color='#4E9F3D', alpha=0.2)
+
+    # Formatação do gráfico
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Valor Acumulado (R$)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.yaxis.set_major_formatter('R${x:,.2f}')
+
+    # Adicionar valores nos pontos
+    for i, ano in enumerate(diferencas['ano']):
+        valor = diferencas['totalAno'].iloc[i]
+        ax.annotate(f'R${valor:.2f}',
+                    xy=(ano, valor),
+                    xytext=(0, 10),
+                    textcoords='offset points',
+                    ha='center',
+                    fontsize=8,
+                    bbox=dict(boxstyle='round,pad=0.3', fc='white', alpha=0.7))
+
+    ax.set_title('Evolução do Valor Acumulado por Ano')
+    fig.tight_layout()
+
+
+# Tipo de gráfico -> (tamanho da figura, função de desenho)
+GRAFICOS = {
+    'evolucao_beneficio': ((10, 5), _evolucao_beneficio),
+    'indices_economicos': ((10, 5), _indices_economicos),
+    'distribuicao_status': ((10, 6), _distribuicao_status),
+    'composicao_devido': ((10, 6), _composicao_devido),
+    'comparativo': ((12, 6), _comparativo),
+    'diferencas_acumuladas': ((12, 6), _diferencas_acumuladas)
+}
+
+
+def desenhar_grafico(data, tipo, formato='png', dpi=150):
+    """Desenha um gráfico do caso e devolve os bytes da imagem, sem cache"""
+    if tipo not in GRAFICOS:
+        raise ValueError(f"Tipo de gráfico desconhecido: {tipo}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de gráfico não suportado: {formato}")
+    figsize, desenhar = GRAFICOS[tipo]
+    with medir(f"desenho:{tipo}"), _figura(figsize) as fig:
+        desenhar(fig, data)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=formato, dpi=dpi)
+    return buffer.getvalue()
+
+
+class CacheGraficos:
+    """Cache LRU de imagens renderizadas, limitado pelo total de bytes"""
+
+    def __init__(self, limite_bytes=64 * 1024 * 1024):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._contadores = {"acertos": 0, "falhas": 0, "remocoes": 0, "renderizacoes": 0}
+
+    def obter(self, chave, renderizar):
+        """Devolve a imagem em cache ou a renderiza com ``renderizar()``"""
+        with self._lock:
+            imagem = self._entradas.get(chave)
+            if imagem is not None:
+                self._entradas.move_to_end(chave)
+                self._contadores["acertos"] += 1
+                return imagem
+            self._contadores["falhas"] += 1
+
+        imagem = renderizar()
+
+        with self._lock:
+            self._contadores["renderizacoes"] += 1
+            if len(imagem) > self.limite_bytes:
+                return imagem
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[chave] = imagem
+            self._bytes += len(imagem)
+            while self._bytes > self.limite_bytes:
+                _, removida = self._entradas.popitem(last=False)
+                self._bytes -= len(removida)
+                self._contadores["remocoes"] += 1
+        return imagem
+
+    def invalidar_caso(self, num_beneficio):
+        """Remove todas as imagens de um caso"""
+        with self._lock:
+            for chave in [c for c in self._entradas if c[0] == num_beneficio]:
+                self._bytes -= len(self._entradas.pop(chave))
+
+    def limpar(self):
+        """Remove todas as imagens"""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        """Devolve os contadores do cache e a memória ocupada"""
+        with self._lock:
+            return {
+                **self._contadores,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "limiteBytes": self.limite_bytes
+            }
+
+
+CACHE_GRAFICOS = CacheGraficos()
+
+
+def renderizar_grafico(caso, tipo, formato='png', dpi=150):
+    """Devolve a imagem de um gráfico do caso, reaproveitando o cache
+
+    Casos sem ``num_beneficio``/``versao`` (dicionários avulsos) são sempre
+    redesenhados, pois não há como saber se os dados mudaram.
+    """
+    versao = getattr(caso, 'versao', None)
+    with medir(f"grafico:{tipo}"):
+        if versao is None:
+            return desenhar_grafico(caso, tipo, formato, dpi)
+        chave = (caso.num_beneficio, versao, tipo, formato, dpi)
+        return CACHE_GRAFICOS.obter(chave, lambda: desenhar_grafico(caso, tipo, formato, dpi))
+
+
+def metricas_graficos():
+    """Métricas de memória da camada de gráficos"""
+    return {"figurasVivas": figuras_vivas(), **CACHE_GRAFICOS.estatisticas()}
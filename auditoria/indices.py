@@ -0,0 +1,219 @@
+"""Séries de índices econômicos com fatores acumulados pré-calculados
+
+Cada série mensal (INPC, SELIC, reajustes do INSS...) é carregada uma única
+vez e guarda o produto acumulado de ``1 + taxa``. Corrigir um valor da
+competência A para a competência B é uma divisão entre duas posições desse
+array, em O(1), inclusive para arrays de competências.
+
+Os arrays são somente leitura. ``TabelaIndices.salvar`` grava cada série em
+``.npy`` e ``TabelaIndices.abrir`` os mapeia em memória, de forma que vários
+processos compartilham as mesmas páginas. Convenção: o fator de A para B
+aplica as taxas dos meses A+1 até B, como em ``auditoria.atrasados``.
+"""
+
+import csv
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from auditoria.exemplo import CASO_EXEMPLO
+from auditoria.registros import competencia_para_mes, mes_para_competencia
+
+ARQUIVO_METADADOS = 'indices.json'
+
+
+def _somente_leitura(array):
+    array.flags.writeable = False
+    return array
+
+
+def _mes(competencia):
+    return competencia_para_mes(competencia) if isinstance(competencia, str) else competencia
+
+
+class SerieIndice:
+    """Série mensal de taxas com produto e soma acumulados
+
+    ``taxas`` são frações mensais (0,005 = 0,5%) a partir de ``mes_inicial``.
+    """
+
+    __slots__ = ('nome', 'mes_inicial', 'taxas', 'acumulado', 'soma')
+
+    def __init__(self, nome, mes_inicial, taxas, acumulado=None, soma=None):
+        self.nome = nome
+        self.mes_inicial = _mes(mes_inicial)
+        taxas = np.asarray(taxas, dtype=np.float64)
+        if acumulado is None:
+            acumulado = np.concatenate(([1.0], np.cumprod(1 + taxas)))
+            soma = np.concatenate(([0.0], np.cumsum(taxas)))
+        self.taxas = _somente_leitura(taxas)
+        self.acumulado = _somente_leitura(acumulado)
+        self.soma = _somente_leitura(soma)
+
+    @property
+    def mes_final(self):
+        """Última competência com taxa"""
+        return self.mes_inicial + len(self.taxas) - 1
+
+    def __len__(self):
+        return len(self.taxas)
+
+    def __repr__(self):
+        return (f"SerieIndice({self.nome!r}, {mes_para_competencia(self.mes_inicial)}"
+                f"..{mes_para_competencia(self.mes_final)})")
+
+    def _posicoes(self, meses):
+        """Posições no array acumulado; aceita número do mês, competência ou arrays"""
+        if isinstance(meses, str):
+            meses = competencia_para_mes(meses)
+        posicoes = np.asarray(meses) - (self.mes_inicial - 1)
+        if np.any(posicoes < 0) or np.any(posicoes > len(self.taxas)):
+            raise KeyError(
+                f"Competência fora da série {self.nome} "
+                f"({mes_para_competencia(self.mes_inicial - 1)} a {mes_para_competencia(self.mes_final)})"
+            )
+        return posicoes
+
+    def fator(self, de, ate):
+        """Fator de correção de ``de`` até ``ate`` (escalares ou arrays)"""
+        fator = self.acumulado[self._posicoes(ate)] / self.acumulado[self._posicoes(de)]
+        return fator if np.ndim(fator) else float(fator)
+
+    def taxa_acumulada(self, de, ate):
+        """Soma simples das taxas de ``de`` até ``ate``, para juros não capitalizados"""
+        soma = self.soma[self._posicoes(ate)] - self.soma[self._posicoes(de)]
+        return soma if np.ndim(soma) else float(soma)
+
+    def corrigir(self, valores, de, ate):
+        """Corrige valores de ``de`` até ``ate``"""
+        return np.asarray(valores, dtype=np.float64) * self.fator(de, ate)
+
+    def percentual_anual(self, ano):
+        """Variação acumulada no ano, em percentual"""
+        return (self.fator(ano * 12 - 1, ano * 12 + 11) - 1) * 100
+
+
+def taxas_mensais_de_anuais(percentuais):
+    """Converte percentuais anuais na taxa mensal equivalente de cada mês do ano"""
+    anuais = np.asarray(percentuais, dtype=np.float64) / 100
+    return np.repeat((1 + anuais) ** (1 / 12) - 1, 12)
+
+
+class TabelaIndices:
+    """Conjunto de séries de índices, compartilhado somente para leitura"""
+
+    def __init__(self, series=()):
+        self._series = {serie.nome: serie for serie in series}
+
+    def __getitem__(self, nome):
+        try:
+            return self._series[nome]
+        except KeyError:
+            raise KeyError(f"Índice não carregado: {nome}") from None
+
+    def __contains__(self, nome):
+        return nome in self._series
+
+    def __iter__(self):
+        return iter(self._series)
+
+    def fator(self, nome, de, ate):
+        """Fator de correção de ``de`` até ``ate`` pela série ``nome``"""
+        return self[nome].fator(de, ate)
+
+    @classmethod
+    def de_csv(cls, caminho):
+        """Lê séries mensais de um CSV ``competencia,<série>,...`` com taxas em percentual
+
+        Cada série começa na primeira competência preenchida e não pode ter
+        lacunas; as competências devem estar em ordem crescente.
+        """
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            leitor = csv.DictReader(arquivo)
+            nomes = [nome for nome in leitor.fieldnames if nome != 'competencia']
+            valores = {nome: [] for nome in nomes}
+            inicio = {}
+            encerradas = set()
+            anterior = None
+            for linha in leitor:
+                mes = competencia_para_mes(linha['competencia'])
+                if anterior is not None and mes != anterior + 1:
+                    raise ValueError(f"Competência {linha['competencia']} fora de sequência em {caminho}")
+                anterior = mes
+                for nome in nomes:
+                    celula = (linha[nome] or '').strip()
+                    if not celula:
+                        if nome in inicio:
+                            encerradas.add(nome)  # fim da série; não pode recomeçar
+                        continue
+                    if nome in encerradas:
+                        raise ValueError(f"Série {nome} com lacuna em {linha['competencia']}")
+                    inicio.setdefault(nome, mes)
+                    valores[nome].append(float(celula.replace(',', '.')) / 100)
+        return cls(
+            SerieIndice(nome, inicio[nome], valores[nome]) for nome in nomes if nome in inicio
+        )
+
+    def salvar(self, diretorio):
+        """Grava as séries em ``.npy`` para abertura mapeada em outros processos"""
+        diretorio = Path(diretorio)
+        diretorio.mkdir(parents=True, exist_ok=True)
+        metadados = {}
+        for nome, serie in self._series.items():
+            for campo in ('taxas', 'acumulado', 'soma'):
+                np.save(diretorio / f"{nome}.{campo}.npy", getattr(serie, campo))
+            metadados[nome] = serie.mes_inicial
+        (diretorio / ARQUIVO_METADADOS).write_text(json.dumps(metadados), encoding='utf-8')
+
+    @classmethod
+    def abrir(cls, diretorio):
+        """Abre séries gravadas por ``salvar`` com ``mmap``, sem recalcular os acumulados"""
+        diretorio = Path(diretorio)
+        metadados = json.loads((diretorio / ARQUIVO_METADADOS).read_text(encoding='utf-8'))
+        return cls(
+            SerieIndice(nome, mes_inicial, *(
+                np.load(diretorio / f"{nome}.{campo}.npy", mmap_mode='r')
+                for campo in ('taxas', 'acumulado', 'soma')
+            ))
+            for nome, mes_inicial in metadados.items()
+        )
+
+
+def indices_exemplo():
+    """Séries mensais equivalentes aos percentuais anuais do caso de exemplo"""
+    evolucao = CASO_EXEMPLO['evolucao_beneficio']
+    diferencas = CASO_EXEMPLO['diferencas_acumuladas']
+    return TabelaIndices([
+        SerieIndice('reajuste', evolucao[0]['ano'] * 12,
+                    taxas_mensais_de_anuais([linha['reajuste'] for linha in evolucao])),
+        SerieIndice('sinapi', evolucao[0]['ano'] * 12,
+                    taxas_mensais_de_anuais([linha['indiceSinapi'] for linha in evolucao])),
+        SerieIndice('selic', diferencas[0]['ano'] * 12,
+                    taxas_mensais_de_anuais([linha['indiceSelic'] for linha in diferencas]))
+    ])
+
+
+_TABELA = None
+_LOCK_TABELA = threading.Lock()
+
+
+def tabela_indices():
+    """Tabela de índices do processo, carregada uma única vez"""
+    global _TABELA
+    if _TABELA is None:
+        with _LOCK_TABELA:
+            if _TABELA is None:
+                _TABELA = indices_exemplo()
+    return _TABELA
+
+
+def configurar_indices(origem):
+    """Substitui a tabela do processo por uma ``TabelaIndices``, um CSV ou um diretório salvo"""
+    global _TABELA
+    if not isinstance(origem, TabelaIndices):
+        origem = TabelaIndices.abrir(origem) if Path(origem).is_dir() else TabelaIndices.de_csv(origem)
+    with _LOCK_TABELA:
+        _TABELA = origem
+    return origem
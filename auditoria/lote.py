@@ -0,0 +1,171 @@
+"""Auditoria em lote de uma carteira de segurados, sem interface Streamlit
+
+Uso:
+    python -m auditoria.lote CASOS --saida resumo.csv [--processos 4] [--lote 16]
+                                [--carteira carteira.jsonl] [--indice indice_busca.jsonl]
+
+CASOS é um diretório com um arquivo JSON por caso (no formato de
+``auditoria.exemplo.CASO_EXEMPLO``) ou um manifesto de texto com um
+caminho de arquivo por linha. Com ``--carteira``, o resumo de cada caso
+também é registrado no arquivo da carteira (``auditoria.carteira``) e, com
+``--indice``, o caso é incluído no índice de busca (``auditoria.busca``).
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+from auditoria.casos import analisar_fonte, resumir_caso, versao_fonte
+
+COLUNAS_RESUMO = [
+    "arquivo", "situacao", "erro",
+    "numBeneficio", "nome", "cpf", "nit",
+    "salarioBeneficioInss", "salarioBeneficioAuditoria", "diferencaMensal", "percentualDiferenca",
+    "fatorInss", "fatorAuditoria",
+    "totalRegistros", "registrosConsiderados", "mediaMaioresSalarios", "periodosIncorretos",
+    "totalGeral", "versao"
+]
+
+
+def carregar_fonte(caminho):
+    """Lê os dados de origem de um caso a partir de um arquivo JSON"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def listar_casos(entrada):
+    """Lista os arquivos de caso de um diretório ou de um manifesto"""
+    entrada = Path(entrada)
+    if entrada.is_dir():
+        return sorted(str(caminho) for caminho in entrada.glob('*.json'))
+
+    caminhos = []
+    with open(entrada, encoding='utf-8') as manifesto:
+        for linha in manifesto:
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            caminho = Path(linha)
+            if not caminho.is_absolute():
+                caminho = entrada.parent / caminho
+            caminhos.append(str(caminho))
+    return caminhos
+
+
+def auditar_arquivo(caminho, indexar=False):
+    """Audita um caso; falhas viram uma linha com a mensagem de erro
+
+    Com ``indexar``, a linha traz também os ``vinculos`` para o índice de busca.
+    """
+    try:
+        fonte = carregar_fonte(caminho)
+        linha = resumir_caso(analisar_fonte(fonte))
+        linha.update(arquivo=caminho, situacao="ok", erro="", versao=versao_fonte(fonte))
+        if indexar:
+            linha["vinculos"] = fonte['vinculos_empregaticos']
+    except Exception as erro:
+        linha = {"arquivo": caminho, "situacao": "falha", "erro": f"{type(erro).__name__}: {erro}"}
+    return linha
+
+
+def auditar_lote(caminhos, saida, processos=None, tamanho_lote=16, progresso=None, carteira=None, indice=None):
+    """Audita os casos em um pool de processos e grava o resumo em CSV
+
+    As linhas são gravadas à medida que os processos terminam cada bloco de
+    ``tamanho_lote`` casos, então a memória não cresce com a carteira.
+    ``progresso``, se informado, recebe ``(processados, total, segundos)``.
+    ``carteira`` (``auditoria.carteira.Carteira``), se informada, recebe os
+    resumos dos casos auditados em blocos, e ``indice``
+    (``auditoria.busca.IndiceBusca``) os identificadores e empregadores; o
+    índice é compactado ao final. Devolve as estatísticas da execução, incluindo as falhas por caso.
+    """
+    total = len(caminhos)
+    processados = 0
+    falhas = []
+    pendentes = []
+    indexar = []
+    inicio = time.perf_counter()
+
+    with open(saida, 'w', newline='', encoding='utf-8') as arquivo_saida, \
+            multiprocessing.Pool(processos) as pool:
+        escritor = csv.DictWriter(arquivo_saida, fieldnames=COLUNAS_RESUMO)
+        escritor.writeheader()
+        auditar = partial(auditar_arquivo, indexar=indice is not None)
+        for linha in pool.imap_unordered(auditar, caminhos, chunksize=tamanho_lote):
+            vinculos = linha.pop("vinculos", None)
+            escritor.writerow(linha)
+            processados += 1
+            if linha["situacao"] == "falha":
+                falhas.append((linha["arquivo"], linha["erro"]))
+            else:
+                if carteira is not None:
+                    pendentes.append((linha, linha["versao"]))
+                if indice is not None:
+                    origem = str(Path(linha["arquivo"]).resolve())
+                    indexar.append((linha["numBeneficio"], linha["versao"], linha, vinculos, origem))
+                if len(pendentes) + len(indexar) >= 1000:
+                    if carteira is not None:
+                        carteira.registrar_lote(pendentes)
+                    if indice is not None:
+                        indice.registrar_lote(indexar)
+                    pendentes.clear()
+                    indexar.clear()
+            if progresso is not None:
+                progresso(processados, total, time.perf_counter() - inicio)
+    if carteira is not None:
+        carteira.registrar_lote(pendentes)
+    if indice is not None:
+        indice.registrar_lote(indexar)
+        indice.compactar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "casos": total,
+        "sucessos": total - len(falhas),
+        "falhas": falhas,
+        "segundos": segundos,
+        "casosPorSegundo": total / segundos if segundos > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auditoria previdenciária em lote")
+    parser.add_argument('entrada', help="diretório de casos JSON ou manifesto com um caminho por linha")
+    parser.add_argument('--saida', default='resumo_auditoria.csv', help="arquivo CSV de resumo")
+    parser.add_argument('--processos', type=int, default=None, help="processos no pool (padrão: número de CPUs)")
+    parser.add_argument('--lote', type=int, default=16, help="casos enviados por vez a cada processo")
+    parser.add_argument('--carteira', metavar='ARQUIVO', help="arquivo da carteira onde registrar os resumos")
+    parser.add_argument('--indice', metavar='ARQUIVO', help="arquivo do índice de busca onde incluir os casos")
+    args = parser.parse_args(argv)
+
+    caminhos = listar_casos(args.entrada)
+
+    def progresso(processados, total, segundos):
+        if processados % 500 == 0 or processados == total:
+            print(f"{processados}/{total} casos ({processados / segundos:.1f} casos/s)", file=sys.stderr)
+
+    carteira = None
+    if args.carteira:
+        from auditoria.carteira import Carteira
+        carteira = Carteira(args.carteira)
+    indice = None
+    if args.indice:
+        from auditoria.busca import IndiceBusca
+        indice = IndiceBusca(args.indice)
+    resultado = auditar_lote(caminhos, args.saida, args.processos, args.lote, progresso, carteira, indice)
+
+    print(f"Casos auditados: {resultado['casos']} "
+          f"({resultado['sucessos']} ok, {len(resultado['falhas'])} falhas) "
+          f"em {resultado['segundos']:.2f}s - {resultado['casosPorSegundo']:.1f} casos/s")
+    for arquivo, erro in resultado['falhas']:
+        print(f"  FALHA {arquivo}: {erro}", file=sys.stderr)
+    return 1 if resultado['falhas'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,537 @@
+"""Relatório de auditoria em PDF, gravado em fluxo, com os gráficos do dashboard
+
+O PDF é escrito objeto a objeto direto no arquivo de destino: cada página e
+cada imagem são gravadas assim que ficam prontas e só os deslocamentos dos
+objetos ficam em memória. Por isso um PDF com centenas de casos ocupa a
+mesma memória que um PDF de um caso só.
+
+O texto usa as fontes padrão Helvetica (sem embutir fontes) com a
+codificação WinAnsi, que cobre a acentuação do português. Os gráficos são
+as mesmas imagens PNG do dashboard, obtidas por ``renderizar_grafico``; a
+versão já convertida para o PDF fica no ``CACHE_GRAFICOS``, então exportar
+de novo o mesmo caso não redesenha nem reconverte nada.
+"""
+
+import hashlib
+import io
+import struct
+import unicodedata
+import zlib
+from datetime import datetime
+
+from auditoria.graficos import CACHE_GRAFICOS, renderizar_grafico
+from auditoria.perfil import medir
+from auditoria.relatorio import valores_relatorio
+
+# Página A4 em pontos e margens
+LARGURA_PAGINA = 595
+ALTURA_PAGINA = 842
+MARGEM = 50
+
+DPI_GRAFICOS = 150
+
+# Larguras (em milésimos do corpo) dos caracteres 32 a 126 da Helvetica
+_LARGURAS = {
+    False: (
+        278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+        556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778,
+        722, 278, 500, 667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+        278, 278, 469, 556, 222, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584
+    ),
+    True: (
+        278, 333, 474, 556, 556, 889, 722, 278, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+        556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611, 975, 722, 722, 722, 722, 667, 611, 778,
+        722, 278, 556, 722, 611, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+        278, 333, 584, 556, 278, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584
+    )
+}
+
+VERDE_PRIMARIO = (0.118, 0.318, 0.157)
+PRETO = (0.067, 0.067, 0.067)
+CINZA = (0.4, 0.4, 0.4)
+
+# Gráficos do anexo, na ordem do dashboard
+GRAFICOS_PDF = (
+    ('evolucao_beneficio', "Evolução do Valor do Benefício"),
+    ('indices_economicos', "Reajustes do INSS x Índice SINAPI"),
+    ('distribuicao_status', "Distribuição das Contribuições por Status"),
+    ('composicao_devido', "Composição do Valor Total Devido"),
+    ('comparativo', "Comparativo INSS x Auditoria"),
+    ('diferencas_acumuladas', "Evolução do Valor Acumulado por Ano")
+)
+
+_RESUMO_EXECUTIVO = (
+    "A presente auditoria previdenciária teve por objetivo verificar a regularidade do cálculo do benefício "
+    "previdenciário concedido ao segurado em questão.",
+    "A análise técnica realizada no CNIS (Cadastro Nacional de Informações Sociais) e demais documentos "
+    "previdenciários revelou inconsistências graves no cálculo efetuado pelo INSS, resultando em pagamento "
+    "mensal inferior ao devido."
+)
+
+_DIVERGENCIAS = (
+    "Contagem incorreta do número de contribuições;",
+    "Aplicação inadequada da regra dos 80% maiores salários;",
+    "Desconsideração de períodos contributivos relevantes;",
+    "Cálculo incorreto do fator previdenciário."
+)
+
+_PROVIDENCIAS = (
+    "Ingressar com pedido administrativo de revisão junto ao INSS;",
+    "Em caso de indeferimento ou demora injustificada, ajuizar ação revisional com pedido de tutela de "
+    "urgência para imediata correção do valor mensal do benefício;",
+    "Requerer o pagamento das diferenças vencidas desde a concessão, observado o prazo prescricional de 5 anos;",
+    "Solicitar a aplicação de correção monetária e juros legais sobre as parcelas em atraso."
+)
+
+# Muda quando o conteúdo ou a diagramação do PDF mudam; identifica PDFs gravados em disco
+VERSAO_PDF = hashlib.sha1(repr((
+    _RESUMO_EXECUTIVO, _DIVERGENCIAS, _PROVIDENCIAS, GRAFICOS_PDF, DPI_GRAFICOS, 1
+)).encode('utf-8')).hexdigest()[:12]
+
+
+def largura_texto(texto, tamanho, negrito=False):
+    """Largura do texto em pontos; acentuados medem como a letra base"""
+    larguras = _LARGURAS[negrito]
+    total = 0
+    for caractere in texto:
+        codigo = ord(caractere)
+        if not 32 <= codigo <= 126:
+            codigo = ord(unicodedata.normalize('NFD', caractere)[0])
+        total += larguras[codigo - 32] if 32 <= codigo <= 126 else 556
+    return total * tamanho / 1000
+
+
+def quebrar_linhas(texto, largura, tamanho, negrito=False):
+    """Divide o texto em linhas que cabem na largura, quebrando entre palavras"""
+    linhas = []
+    atual = ''
+    for palavra in texto.split():
+        candidata = f"{atual} {palavra}" if atual else palavra
+        if atual and largura_texto(candidata, tamanho, negrito) > largura:
+            linhas.append(atual)
+            atual = palavra
+        else:
+            atual = candidata
+    if atual:
+        linhas.append(atual)
+    return linhas
+
+
+def _literal(texto):
+    """Texto como string literal do PDF na codificação WinAnsi"""
+    codificado = texto.encode('cp1252', errors='replace')
+    return b'(' + codificado.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _cor(cor):
+    return ('%.3f %.3f %.3f' % cor).encode('ascii')
+
+
+def _converter_png(png):
+    """Converte o PNG RGBA do matplotlib em ``(largura, altura, dados)`` para o PDF
+
+    O PNG é regravado em RGB e seus blocos IDAT entram no PDF sem
+    recompressão, com o preditor PNG indicado no dicionário da imagem.
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as imagem:
+        rgb = imagem.convert('RGB')
+    buffer = io.BytesIO()
+    rgb.save(buffer, format='PNG')
+    dados = buffer.getvalue()
+    largura, altura = struct.unpack('>II', dados[16:24])
+    idat = []
+    posicao = 8
+    while posicao < len(dados):
+        tamanho, tipo = struct.unpack('>I4s', dados[posicao:posicao + 8])
+        if tipo == b'IDAT':
+            idat.append(dados[posicao + 8:posicao + 8 + tamanho])
+        posicao += 12 + tamanho
+    return struct.pack('>II', largura, altura) + b''.join(idat)
+
+
+def imagem_grafico(caso, tipo, dpi=DPI_GRAFICOS):
+    """Imagem de um gráfico pronta para o PDF: ``(largura, altura, dados)``
+
+    Parte do mesmo PNG do dashboard e guarda a conversão no cache de
+    gráficos, junto das demais imagens do caso.
+    """
+    versao = getattr(caso, 'versao', None)
+    converter = lambda: _converter_png(renderizar_grafico(caso, tipo, 'png', dpi))
+    if versao is None:
+        imagem = converter()
+    else:
+        imagem = CACHE_GRAFICOS.obter((caso.num_beneficio, versao, tipo, 'pdf', dpi), converter)
+    largura, altura = struct.unpack('>II', imagem[:8])
+    return largura, altura, memoryview(imagem)[8:]
+
+
+class EscritorPDF:
+    """Grava um PDF em um arquivo binário, um objeto de cada vez
+
+    Mantém em memória só os deslocamentos dos objetos e as referências das
+    páginas; conteúdo e imagens vão para o arquivo assim que são gravados.
+    """
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.bytes_gravados = 0
+        self._deslocamentos = {}
+        self._proximo = 1
+        self._paginas = []
+        self._catalogo = self.reservar()
+        self._arvore_paginas = self.reservar()
+        self._gravar(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._fontes = {
+            negrito: self.objeto(
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>'
+                % (b'Helvetica-Bold' if negrito else b'Helvetica')
+            )
+            for negrito in (False, True)
+        }
+
+    def _gravar(self, dados):
+        self.arquivo.write(dados)
+        self.bytes_gravados += len(dados)
+
+    def reservar(self):
+        """Reserva o número de um objeto que será gravado depois"""
+        numero = self._proximo
+        self._proximo += 1
+        return numero
+
+    def objeto(self, corpo, numero=None):
+        """Grava um objeto e devolve seu número"""
+        numero = numero or self.reservar()
+        self._deslocamentos[numero] = self.bytes_gravados
+        self._gravar(b'%d 0 obj\n' % numero)
+        self._gravar(corpo)
+        self._gravar(b'\nendobj\n')
+        return numero
+
+    def fluxo(self, dicionario, dados):
+        """Grava um objeto de fluxo (stream) e devolve seu número"""
+        numero = self.reservar()
+        self._deslocamentos[numero] = self.bytes_gravados
+        self._gravar(b'%d 0 obj\n<< %s /Length %d >>\nstream\n' % (numero, dicionario, len(dados)))
+        self._gravar(dados)
+        self._gravar(b'\nendstream\nendobj\n')
+        return numero
+
+    def imagem(self, largura, altura, dados):
+        """Grava uma imagem RGB com preditor PNG e devolve seu número"""
+        return self.fluxo(
+            b'/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB /BitsPerComponent 8 '
+            b'/Filter /FlateDecode /DecodeParms << /Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns %d >>'
+            % (largura, altura, largura),
+            dados
+        )
+
+    def pagina(self, conteudo, imagens=()):
+        """Grava uma página com o fluxo de conteúdo e as imagens (nome, número) usadas"""
+        fluxo = self.fluxo(b'/Filter /FlateDecode', zlib.compress(conteudo, 6))
+        xobjetos = b' '.join(b'/%s %d 0 R' % (nome.encode('ascii'), numero) for nome, numero in imagens)
+        self._paginas.append(self.objeto(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R '
+            b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << %s >> >> >>'
+            % (self._arvore_paginas, LARGURA_PAGINA, ALTURA_PAGINA, fluxo,
+               self._fontes[False], self._fontes[True], xobjetos)
+        ))
+
+    @property
+    def quantidade_paginas(self):
+        return len(self._paginas)
+
+    def finalizar(self):
+        """Grava a árvore de páginas, o catálogo e a tabela de referências"""
+        filhos = b' '.join(b'%d 0 R' % numero for numero in self._paginas)
+        self.objeto(b'<< /Type /Pages /Kids [%s] /Count %d >>' % (filhos, len(self._paginas)), self._arvore_paginas)
+        self.objeto(b'<< /Type /Catalog /Pages %d 0 R >>' % self._arvore_paginas, self._catalogo)
+        inicio_xref = self.bytes_gravados
+        self._gravar(b'xref\n0 %d\n0000000000 65535 f \n' % self._proximo)
+        for numero in range(1, self._proximo):
+            self._gravar(b'%010d 00000 n \n' % self._deslocamentos[numero])
+        self._gravar(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                     % (self._proximo, self._catalogo, inicio_xref))
+        return self.bytes_gravados
+
+
+class _Diagramador:
+    """Posiciona texto, tabelas e imagens nas páginas, de cima para baixo"""
+
+    def __init__(self, escritor):
+        self.escritor = escritor
+        self.largura_util = LARGURA_PAGINA - 2 * MARGEM
+        self._conteudo = None
+        self._imagens = []
+        self.y = 0
+
+    def nova_pagina(self):
+        self.fechar_pagina()
+        self._conteudo = []
+        self._imagens = []
+        self.y = ALTURA_PAGINA - MARGEM
+
+    def fechar_pagina(self):
+        if self._conteudo is None:
+            return
+        numero = self.escritor.quantidade_paginas + 1
+        self.texto(f"OLIVEIRA OFFICE LAW - página {numero}", 8, cor=CINZA, y=MARGEM / 2, alinhamento='centro')
+        self.escritor.pagina(b'\n'.join(self._conteudo), self._imagens)
+        self._conteudo = None
+
+    def garantir(self, altura):
+        """Abre uma nova página se a altura não cabe na atual"""
+        if self._conteudo is None or self.y - altura < MARGEM:
+            self.nova_pagina()
+
+    def texto(self, texto, tamanho=10, negrito=False, cor=PRETO, x=MARGEM, y=None, alinhamento='esquerda'):
+        y = self.y if y is None else y
+        if alinhamento == 'centro':
+            x = (LARGURA_PAGINA - largura_texto(texto, tamanho, negrito)) / 2
+        elif alinhamento == 'direita':
+            x = x - largura_texto(texto, tamanho, negrito)
+        self._conteudo.append(b'BT %s rg /F%d %d Tf %.2f %.2f Td %s Tj ET' % (
+            _cor(cor), 2 if negrito else 1, tamanho, x, y, _literal(texto)
+        ))
+
+    def linha(self, x1, y1, x2, y2, cor=VERDE_PRIMARIO, espessura=1):
+        self._conteudo.append(b'%s RG %.2f w %.2f %.2f m %.2f %.2f l S' % (_cor(cor), espessura, x1, y1, x2, y2))
+
+    def retangulo(self, x, y, largura, altura, cor):
+        self._conteudo.append(b'%s rg %.2f %.2f %.2f %.2f re f' % (_cor(cor), x, y, largura, altura))
+
+    def paragrafo(self, texto, tamanho=10, negrito=False, recuo=0, prefixo='', espaco=6):
+        """Texto com quebra de linhas; ``prefixo`` (marcador) fica antes da primeira linha"""
+        altura_linha = tamanho * 1.4
+        for posicao, linha in enumerate(quebrar_linhas(texto, self.largura_util - recuo, tamanho, negrito)):
+            self.garantir(altura_linha)
+            self.y -= altura_linha
+            if prefixo and posicao == 0:
+                self.texto(prefixo, tamanho, negrito, x=MARGEM + recuo - largura_texto(prefixo + ' ', tamanho))
+            self.texto(linha, tamanho, negrito, x=MARGEM + recuo)
+        self.y -= espaco
+
+    def titulo_secao(self, titulo):
+        self.garantir(60)
+        self.y -= 24
+        self.texto(titulo, 13, True, cor=VERDE_PRIMARIO)
+        self.y -= 6
+
+    def subtitulo(self, titulo):
+        self.garantir(50)
+        self.y -= 18
+        self.texto(titulo, 11, True)
+        self.y -= 2
+
+    def tabela(self, cabecalho, linhas, proporcoes, total=False):
+        """Tabela com cabeçalho verde; com ``total`` a última linha fica em destaque"""
+        altura_linha = 18
+        larguras = [self.largura_util * p / sum(proporcoes) for p in proporcoes]
+        self.garantir(altura_linha * (len(linhas) + 1) + 10)
+        self.y -= altura_linha
+        self.retangulo(MARGEM, self.y - 5, self.largura_util, altura_linha, VERDE_PRIMARIO)
+        self._celulas(cabecalho, larguras, True, (1, 1, 1))
+        for posicao, linha in enumerate(linhas):
+            self.y -= altura_linha
+            destaque = total and posicao == len(linhas) - 1
+            if destaque:
+                self.retangulo(MARGEM, self.y - 5, self.largura_util, altura_linha, PRETO)
+            else:
+                self.linha(MARGEM, self.y - 5, MARGEM + self.largura_util, self.y - 5, cor=(0.867, 0.867, 0.867), espessura=0.5)
+            self._celulas(linha, larguras, destaque, (1, 1, 1) if destaque else PRETO)
+        self.y -= 12
+
+    def _celulas(self, valores, larguras, negrito, cor):
+        x = MARGEM
+        for valor, largura in zip(valores, larguras):
+            self.texto(str(valor), 9, negrito, cor=cor, x=x + 5)
+            x += largura
+
+    def imagem(self, largura_px, altura_px, dados, legenda, largura_max=None):
+        """Imagem centralizada, reduzida à largura útil, com legenda acima"""
+        largura = min(largura_max or self.largura_util, self.largura_util)
+        altura = largura * altura_px / largura_px
+        self.garantir(altura + 30)
+        self.y -= 16
+        self.texto(legenda, 11, True, cor=VERDE_PRIMARIO)
+        numero = self.escritor.imagem(largura_px, altura_px, dados)
+        nome = f"Im{len(self._imagens) + 1}"
+        self._imagens.append((nome, numero))
+        self.y -= altura + 6
+        x = (LARGURA_PAGINA - largura) / 2
+        self._conteudo.append(b'q %.2f 0 0 %.2f %.2f %.2f cm /%s Do Q' % (largura, altura, x, self.y, nome.encode('ascii')))
+        self.y -= 10
+
+
+def _diagramar_caso(diagramador, caso, data_atual, progresso=None):
+    """Diagrama o relatório de um caso a partir de uma página nova"""
+    v = valores_relatorio(caso, data_atual)
+    d = diagramador
+    etapas = 4 + len(GRAFICOS_PDF)
+    avancar = (lambda etapa: progresso(etapa / etapas)) if progresso is not None else (lambda etapa: None)
+
+    d.nova_pagina()
+    d.y -= 16
+    d.texto("OLIVEIRA OFFICE LAW", 18, True)
+    d.texto(f"Data: {v['data_atual']}", 10, x=LARGURA_PAGINA - MARGEM, alinhamento='direita')
+    d.y -= 16
+    d.texto("Consultoria Previdenciária", 11, cor=CINZA)
+    d.texto(f"Processo nº: AP-{v['num_beneficio']}", 10, x=LARGURA_PAGINA - MARGEM, alinhamento='direita')
+    d.y -= 12
+    d.linha(MARGEM, d.y, LARGURA_PAGINA - MARGEM, d.y, espessura=2)
+    d.y -= 30
+    d.texto("RELATÓRIO TÉCNICO DE AUDITORIA PREVIDENCIÁRIA", 14, True, alinhamento='centro')
+    d.y -= 6
+
+    d.titulo_secao("1. IDENTIFICAÇÃO DO SEGURADO")
+    for rotulo, valor in (
+        ("Nome", v['nome']),
+        ("CPF", v['cpf']),
+        ("Data de Nascimento", v['data_nascimento']),
+        ("NIT/PIS", v['nit']),
+        ("Número do Benefício", v['num_beneficio']),
+        ("Espécie do Benefício", v['especie_beneficio']),
+        ("Data de Requerimento", v['data_requerimento']),
+        ("Tempo de Contribuição", f"{v['tc_anos']} anos, {v['tc_meses']} meses e {v['tc_dias']} dias")
+    ):
+        d.y -= 15
+        d.texto(f"{rotulo}:", 10, True)
+        d.texto(str(valor), 10, x=MARGEM + largura_texto(f"{rotulo}: ", 10, True))
+    avancar(1)
+
+    d.titulo_secao("2. RESUMO EXECUTIVO")
+    for texto in _RESUMO_EXECUTIVO:
+        d.paragrafo(texto)
+    d.paragrafo("As principais divergências identificadas foram:")
+    for posicao, texto in enumerate(_DIVERGENCIAS, 1):
+        d.paragrafo(texto, recuo=20, prefixo=f"{posicao}.", espaco=2)
+    d.y -= 4
+    d.paragrafo(
+        f"Em função desses erros, o segurado recebe mensalmente R$ {v['dif_salario_beneficio']:.2f} a menos do que "
+        f"o valor correto, representando uma redução de {v['pct_reducao_beneficio']:.2f}% no benefício."
+    )
+    d.paragrafo(
+        f"O valor total devido ao segurado, considerando as diferenças vencidas desde a concessão "
+        f"({v['data_requerimento']}) até a data atual ({v['data_atual']}), incluindo correção monetária e juros "
+        f"legais, é de R$ {v['total_geral']:.2f}.", negrito=True
+    )
+    avancar(2)
+
+    d.titulo_secao("3. ANÁLISE TÉCNICA DO CÁLCULO")
+    d.subtitulo("3.1. Composição do Período Contributivo")
+    d.tabela(
+        ("Descrição", "Cálculo INSS", "Cálculo Auditoria", "Diferença"),
+        (
+            ("Total de registros analisados", v['total_contribuicoes_inss'], v['total_contribuicoes_auditoria'],
+             v['dif_total_contribuicoes']),
+            ("Contribuições consideradas (80%)", v['consideradas_inss'], v['consideradas_auditoria'],
+             v['dif_consideradas']),
+            ("Períodos ignorados aproveitáveis", 0, v['reaproveitaveis'], f"+{v['reaproveitaveis']}")
+        ),
+        (3, 1.3, 1.5, 1.2)
+    )
+    d.subtitulo("3.2. Média Salarial e Fator Previdenciário")
+    d.tabela(
+        ("Parâmetro", "Cálculo INSS", "Cálculo Auditoria", "Diferença", "Variação (%)"),
+        (
+            ("Média salarial (R$)", f"{v['media_inss']:.2f}", f"{v['media_auditoria']:.2f}",
+             f"+{v['dif_media']:.2f}", f"+{v['pct_dif_media']:.2f}%"),
+            ("Fator previdenciário", f"{v['fator_inss']:.4f}", f"{v['fator_auditoria']:.4f}",
+             f"{v['dif_fator']:.4f}", f"{v['pct_dif_fator']:.2f}%"),
+            ("Salário de Benefício (R$)", f"{v['sb_inss']:.2f}", f"{v['sb_auditoria']:.2f}",
+             f"+{v['dif_salario_beneficio']:.2f}", f"+{v['pct_dif_salario_beneficio']:.2f}%")
+        ),
+        (2.4, 1.2, 1.4, 1.1, 1.1)
+    )
+    d.subtitulo("3.3. Valores Retroativos Devidos")
+    d.tabela(
+        ("Componente", "Valor (R$)", "Participação (%)"),
+        (
+            ("Diferenças vencidas", f"{v['diferencas_vencidas']:.2f}", f"{v['pct_diferencas_vencidas']:.2f}%"),
+            ("Correção monetária", f"{v['correcao_monetaria']:.2f}", f"{v['pct_correcao_monetaria']:.2f}%"),
+            ("Juros legais", f"{v['juros_legais']:.2f}", f"{v['pct_juros_legais']:.2f}%"),
+            ("TOTAL DEVIDO", f"{v['total_geral']:.2f}", "100,00%")
+        ),
+        (3, 1.5, 1.5),
+        total=True
+    )
+    d.paragrafo("Observação: Os valores acima consideram a correção monetária pelo INPC e juros de 0,5% ao mês, "
+                "conforme legislação aplicável.", tamanho=9)
+    avancar(3)
+
+    d.titulo_secao("4. CONCLUSÕES E RECOMENDAÇÕES")
+    d.paragrafo(f"Com base na análise técnica realizada, conclui-se que o benefício previdenciário do segurado "
+                f"{v['nome']} foi calculado de forma incorreta pelo INSS, resultando em pagamento mensal inferior "
+                f"ao devido.")
+    d.paragrafo("Recomenda-se as seguintes providências:")
+    for posicao, texto in enumerate(_PROVIDENCIAS, 1):
+        d.paragrafo(texto, recuo=20, prefixo=f"{posicao}.", espaco=2)
+    d.y -= 4
+    d.paragrafo("Ressalta-se que a chancela de êxito para o caso em tela é considerada muito alta, tendo em vista a "
+                "robustez das provas e a jurisprudência consolidada acerca da matéria.")
+    d.paragrafo("O ajuizamento da ação revisional deve ocorrer preferencialmente na Justiça Federal da Seção "
+                "Judiciária do Maranhão, com fulcro no art. 109, I, da Constituição Federal.", negrito=True)
+    d.garantir(90)
+    d.y -= 20
+    d.texto(f"São Luís, {v['data_atual']}", 10, alinhamento='centro')
+    d.y -= 36
+    d.texto("OLIVEIRA OFFICE LAW", 11, True, alinhamento='centro')
+    d.y -= 14
+    d.texto("Consultoria Jurídica Especializada", 9, alinhamento='centro')
+    avancar(4)
+
+    d.nova_pagina()
+    d.texto("ANEXO - GRÁFICOS DA AUDITORIA", 13, True, cor=VERDE_PRIMARIO)
+    d.y -= 6
+    for etapa, (tipo, legenda) in enumerate(GRAFICOS_PDF, 5):
+        largura, altura, dados = imagem_grafico(caso, tipo)
+        d.imagem(largura, altura, dados, legenda)
+        avancar(etapa)
+
+
+def escrever_pdf(casos, destino, data_atual=None, progresso=None, total=None):
+    """Grava o relatório PDF de vários casos, em sequência, e devolve os bytes gravados
+
+    ``casos`` pode ser um gerador: cada caso é diagramado e gravado antes do
+    próximo ser pedido, então a memória não cresce com a quantidade de
+    casos. ``progresso``, se informado, recebe a fração concluída; sem
+    ``total`` (e sem ``len(casos)``) ela é calculada por caso, de 0 a 1.
+    """
+    if isinstance(destino, (str, bytes)) or hasattr(destino, '__fspath__'):
+        with open(destino, 'wb') as arquivo:
+            return escrever_pdf(casos, arquivo, data_atual, progresso, total)
+    data_atual = data_atual or datetime.now().strftime("%d/%m/%Y")
+    if total is None and hasattr(casos, '__len__'):
+        total = len(casos)
+    escritor = EscritorPDF(destino)
+    diagramador = _Diagramador(escritor)
+    for posicao, caso in enumerate(casos):
+        avancar = None
+        if progresso is not None:
+            if total:
+                avancar = lambda fracao, posicao=posicao: progresso((posicao + fracao) / total)
+            else:
+                avancar = progresso
+        with medir("relatorio:pdf"):
+            _diagramar_caso(diagramador, caso, data_atual, avancar)
+    if escritor.quantidade_paginas == 0:
+        # Sem casos, o PDF ainda precisa de uma página para ser válido
+        diagramador.garantir(0)
+    diagramador.fechar_pagina()
+    return escritor.finalizar()
+
+
+def escrever_relatorio_pdf(data, destino, data_atual=None, progresso=None):
+    """Grava o relatório PDF de um caso e devolve os bytes gravados"""
+    return escrever_pdf([data], destino, data_atual, progresso)
+
+
+def gerar_pdf_relatorio(data, data_atual=None):
+    """Gera o relatório PDF de um caso em memória"""
+    buffer = io.BytesIO()
+    escrever_relatorio_pdf(data, buffer, data_atual)
+    return buffer.getvalue()
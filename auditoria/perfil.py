@@ -0,0 +1,247 @@
+"""Instrumentação de tempo, alocações e chamadas por sessão
+
+Trechos marcados com ``medir(nome)`` ou com o decorador ``perfilado`` só
+são registrados quando há um ``Perfilador`` ativo no contexto atual
+(``with ativar(perfilador):``); fora dele o custo é uma leitura de
+``ContextVar``. Cada sessão do dashboard guarda o próprio perfilador, que
+acumula chamadas entre as reexecuções e exporta um resumo em JSON ou um
+arquivo de trace do Chrome (``chrome://tracing`` / Perfetto).
+
+As alocações vêm do ``tracemalloc``, que é global ao processo: com várias
+sessões medindo ao mesmo tempo, os valores de memória são aproximados.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_ATIVO = ContextVar('perfilador_ativo', default=None)
+
+# Perfiladores com memória ligada; o tracemalloc fica ativo enquanto houver algum
+_LOCK_TRACEMALLOC = threading.Lock()
+_USOS_TRACEMALLOC = 0
+_TRACEMALLOC_PROPRIO = False
+
+
+class _Trecho:
+    """Trecho em execução, com o pico de memória visto até agora"""
+
+    __slots__ = ('nome', 'inicio', 'base', 'pico')
+
+    def __init__(self, nome, inicio, base):
+        self.nome = nome
+        self.inicio = inicio
+        self.base = base
+        self.pico = base
+
+
+class Perfilador:
+    """Coleta os trechos medidos de uma sessão
+
+    ``memoria`` liga a medição de alocações com ``tracemalloc``;
+    ``limite_eventos`` limita os eventos guardados para o trace (os totais
+    por trecho não têm limite).
+    """
+
+    def __init__(self, memoria=False, limite_eventos=20_000):
+        self.memoria = memoria
+        self.origem = time.perf_counter()
+        self.eventos = deque(maxlen=limite_eventos)
+        self.totais = {}
+        self._pilha = threading.local()
+        self._lock = threading.Lock()
+
+    def _trechos(self):
+        pilha = getattr(self._pilha, 'trechos', None)
+        if pilha is None:
+            pilha = self._pilha.trechos = []
+        return pilha
+
+    def _memoria_ativa(self):
+        return self.memoria and tracemalloc.is_tracing()
+
+    def iniciar(self, nome):
+        """Abre um trecho; prefira ``medir``"""
+        pilha = self._trechos()
+        base = 0
+        if self._memoria_ativa():
+            base, pico = tracemalloc.get_traced_memory()
+            if pilha:
+                pilha[-1].pico = max(pilha[-1].pico, pico)
+            tracemalloc.reset_peak()
+        pilha.append(_Trecho(nome, time.perf_counter(), base))
+
+    def encerrar(self):
+        """Fecha o último trecho aberto e registra a medição"""
+        fim = time.perf_counter()
+        pilha = self._trechos()
+        trecho = pilha.pop()
+        alocado = pico = 0
+        if self._memoria_ativa():
+            atual, pico_atual = tracemalloc.get_traced_memory()
+            trecho.pico = max(trecho.pico, pico_atual)
+            alocado, pico = atual - trecho.base, trecho.pico - trecho.base
+            if pilha:
+                pilha[-1].pico = max(pilha[-1].pico, trecho.pico)
+            tracemalloc.reset_peak()
+        self.registrar(trecho.nome, trecho.inicio, fim - trecho.inicio, alocado, pico, len(pilha))
+
+    def registrar(self, nome, inicio, segundos, alocado=0, pico=0, nivel=0):
+        """Acumula uma medição já feita"""
+        with self._lock:
+            total = self.totais.get(nome)
+            if total is None:
+                total = self.totais[nome] = {
+                    "chamadas": 0, "segundos": 0.0, "maxSegundos": 0.0, "ultimoSegundos": 0.0,
+                    "bytesAlocados": 0, "picoBytes": 0
+                }
+            total["chamadas"] += 1
+            total["segundos"] += segundos
+            total["maxSegundos"] = max(total["maxSegundos"], segundos)
+            total["ultimoSegundos"] = segundos
+            total["bytesAlocados"] += alocado
+            total["picoBytes"] = max(total["picoBytes"], pico)
+            self.eventos.append((nome, inicio, segundos, alocado, pico, threading.get_ident(), nivel))
+
+    def limpar(self):
+        """Descarta as medições acumuladas"""
+        with self._lock:
+            self.eventos.clear()
+            self.totais.clear()
+
+    def resumo(self):
+        """Totais por trecho, do mais demorado para o menos"""
+        with self._lock:
+            itens = [(nome, dict(total)) for nome, total in self.totais.items()]
+        itens.sort(key=lambda item: item[1]["segundos"], reverse=True)
+        return [{"trecho": nome, **total} for nome, total in itens]
+
+    def exportar_json(self):
+        """Resumo e eventos em JSON"""
+        with self._lock:
+            eventos = list(self.eventos)
+        return json.dumps({
+            "memoria": self.memoria,
+            "resumo": self.resumo(),
+            "eventos": [
+                {
+                    "trecho": nome, "inicio": inicio - self.origem, "segundos": segundos,
+                    "bytesAlocados": alocado, "picoBytes": pico, "thread": thread, "nivel": nivel
+                }
+                for nome, inicio, segundos, alocado, pico, thread, nivel in eventos
+            ]
+        }, ensure_ascii=False, indent=2)
+
+    def exportar_chrome_trace(self):
+        """Eventos no formato Trace Event do Chrome (eventos completos, em µs)"""
+        with self._lock:
+            eventos = list(self.eventos)
+        pid = os.getpid()
+        return json.dumps({
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": nome, "cat": nome.split(':', 1)[0], "ph": "X", "pid": pid, "tid": thread,
+                    "ts": round((inicio - self.origem) * 1e6, 3), "dur": round(segundos * 1e6, 3),
+                    "args": {"bytesAlocados": alocado, "picoBytes": pico}
+                }
+                for nome, inicio, segundos, alocado, pico, thread, _ in eventos
+            ]
+        }, ensure_ascii=False)
+
+
+def _usar_tracemalloc():
+    global _USOS_TRACEMALLOC, _TRACEMALLOC_PROPRIO
+    with _LOCK_TRACEMALLOC:
+        if _USOS_TRACEMALLOC == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _TRACEMALLOC_PROPRIO = True
+        _USOS_TRACEMALLOC += 1
+
+
+def _liberar_tracemalloc():
+    global _USOS_TRACEMALLOC, _TRACEMALLOC_PROPRIO
+    with _LOCK_TRACEMALLOC:
+        _USOS_TRACEMALLOC -= 1
+        if _USOS_TRACEMALLOC == 0 and _TRACEMALLOC_PROPRIO:
+            tracemalloc.stop()
+            _TRACEMALLOC_PROPRIO = False
+
+
+@contextmanager
+def ativar(perfilador):
+    """Torna ``perfilador`` o destino das medições no contexto atual
+
+    Com ``None`` as medições ficam desligadas dentro do bloco.
+    """
+    memoria = perfilador is not None and perfilador.memoria
+    if memoria:
+        _usar_tracemalloc()
+    token = _ATIVO.set(perfilador)
+    try:
+        yield perfilador
+    finally:
+        _ATIVO.reset(token)
+        if memoria:
+            _liberar_tracemalloc()
+
+
+def perfilador_ativo():
+    """Perfilador do contexto atual, ou None"""
+    return _ATIVO.get()
+
+
+@contextmanager
+def medir(nome):
+    """Mede o bloco como o trecho ``nome`` quando há perfilador ativo"""
+    perfilador = _ATIVO.get()
+    if perfilador is None:
+        yield
+        return
+    perfilador.iniciar(nome)
+    try:
+        yield
+    finally:
+        perfilador.encerrar()
+
+
+def perfilado(nome=None):
+    """Decorador que mede cada chamada da função como o trecho ``nome``"""
+    def decorar(funcao):
+        trecho = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            perfilador = _ATIVO.get()
+            if perfilador is None:
+                return funcao(*args, **kwargs)
+            perfilador.iniciar(trecho)
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                perfilador.encerrar()
+        return envolvida
+    return decorar
+
+
+def vincular(funcao):
+    """Prende ``funcao`` ao perfilador atual, para execução posterior em outra thread
+
+    Usado nas tarefas em segundo plano (``auditoria.tarefas``), que rodam
+    nas threads da fila, fora da reexecução da sessão.
+    """
+    perfilador = _ATIVO.get()
+    if perfilador is None:
+        return funcao
+
+    @functools.wraps(funcao)
+    def vinculada(*args, **kwargs):
+        with ativar(perfilador):
+            return funcao(*args, **kwargs)
+    return vinculada
@@ -0,0 +1,220 @@
+"""Dados de referência compartilhados por todas as sessões do dashboard
+
+CSS, logo, cabeçalho, fundamentos legais e séries de índices são iguais
+para todos os usuários. Eles são montados uma única vez por processo, na
+primeira sessão, e compartilhados somente leitura: as sessões e os casos
+guardam referências aos mesmos objetos, sem cópias por sessão ou por
+reexecução.
+
+``compartilhar_referencia(False)`` faz cada chamada montar um conjunto
+novo, como se cada sessão tivesse o seu; serve apenas para medir o ganho.
+"""
+
+import threading
+from types import MappingProxyType
+
+from auditoria.exemplo import FUNDAMENTOS_LEGAIS
+from auditoria.indices import indices_exemplo, tabela_indices
+
+CSS_DASHBOARD = """
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap');
+        
+        * {
+            font-family: 'Roboto', sans-serif;
+        }
+        
+        h1, h2, h3, h4, h5, h6 {
+            color: #1E5128;
+        }
+        
+        .main-header {
+            display: flex;
+            align-items: center;
+            margin-bottom: 1rem;
+        }
+        
+        .logo-text {
+            font-size: 1.5rem;
+            font-weight: bold;
+            color: #1E5128;
+            margin-left: 0.5rem;
+        }
+        
+        .green-card {
+            background-color: #1E5128;
+            color: white;
+            border-radius: 0.5rem;
+            padding: 1rem;
+            margin-bottom: 1rem;
+        }
+        
+        .black-card {
+            background-color: #111111;
+            color: white;
+            border-radius: 0.5rem;
+            padding: 1rem;
+            margin-bottom: 1rem;
+        }
+        
+        .white-card {
+            background-color: white;
+            border-radius: 0.5rem;
+            padding: 1rem;
+            margin-bottom: 1rem;
+            box-shadow: 0 0.15rem 1.75rem 0 rgba(58, 59, 69, 0.15);
+        }
+        
+        .error-card {
+            background-color: #FFF3F3;
+            border-left: 5px solid #FF5A5A;
+            padding: 0.8rem;
+            margin-bottom: 0.8rem;
+            border-radius: 0.3rem;
+        }
+        
+        .highlight-box {
+            background-color: #F0F9F0;
+            border: 1px solid #C8E6C9;
+            border-radius: 0.5rem;
+            padding: 1rem;
+            margin-bottom: 1rem;
+        }
+        
+        .data-label {
+            color: rgba(255,255,255,0.8);
+            font-size: 0.85rem;
+        }
+        
+        .data-value {
+            font-size: 1.5rem;
+            font-weight: bold;
+        }
+        
+        .download-btn {
+            background-color: #4E9F3D;
+            color: white;
+            padding: 0.5rem 1rem;
+            border-radius: 0.3rem;
+            text-decoration: none;
+            display: inline-block;
+            margin-top: 0.5rem;
+        }
+        
+        .warning-text {
+            color: #FF5A5A;
+            font-weight: bold;
+        }
+        
+        .positive {
+            color: #4E9F3D;
+            font-weight: bold;
+        }
+        
+        .negative {
+            color: #D32F2F;
+            font-weight: bold;
+        }
+        
+        footer {
+            text-align: center;
+            padding: 1rem;
+            background-color: #f5f5f5;
+            margin-top: 2rem;
+            border-top: 1px solid #ddd;
+        }
+        
+        /* Melhorias para tabelas */
+        .styled-table th {
+            background-color: #1E5128;
+            color: white;
+            padding: 8px;
+        }
+        
+        .styled-table td {
+            padding: 8px;
+            border-bottom: 1px solid #ddd;
+        }
+        
+        .styled-table tr:nth-child(even) {
+            background-color: #f2f2f2;
+        }
+        
+        /* Melhorias para a visualização em dispositivos móveis */
+        @media (max-width: 768px) {
+            .hide-mobile {
+                display: none;
+            }
+        }
+    </style>
+    """
+
+LOGO_SVG = '''
+    <svg width="100" height="100" viewBox="0 0 100 100">
+        <circle cx="50" cy="70" r="20" fill="#1E5128" />
+        <rect x="45" y="25" width="10" height="45" fill="#1E5128" />
+        <circle cx="30" cy="30" r="15" fill="#4E9F3D" />
+        <circle cx="50" cy="20" r="15" fill="#4E9F3D" />
+        <circle cx="70" cy="30" r="15" fill="#4E9F3D" />
+        <circle cx="40" cy="40" r="10" fill="#4E9F3D" />
+        <circle cx="60" cy="40" r="10" fill="#4E9F3D" />
+        <circle cx="50" cy="25" r="3" fill="#111111" />
+        <circle cx="65" cy="35" r="3" fill="#111111" />
+        <circle cx="35" cy="35" r="3" fill="#111111" />
+    </svg>
+    '''
+
+_MODELO_CABECALHO = """
+        <div class="main-header">
+            {logo_svg}
+            <span class="logo-text">OLIVEIRA OFFICE LAW</span>
+        </div>
+        """
+
+
+class DadosReferencia:
+    """Conjunto imutável de dados de referência"""
+
+    __slots__ = ('css', 'logo_svg', 'cabecalho_html', 'fundamentos_legais', '_indices')
+
+    def __init__(self, indices=None):
+        object.__setattr__(self, 'css', CSS_DASHBOARD)
+        object.__setattr__(self, 'logo_svg', LOGO_SVG)
+        object.__setattr__(self, 'cabecalho_html', _MODELO_CABECALHO.format(logo_svg=LOGO_SVG))
+        object.__setattr__(self, 'fundamentos_legais', tuple(
+            MappingProxyType(dict(fundamento)) for fundamento in FUNDAMENTOS_LEGAIS
+        ))
+        object.__setattr__(self, '_indices', indices)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("DadosReferencia é imutável")
+
+    @property
+    def indices(self):
+        """Séries de índices econômicos (a ``TabelaIndices`` do processo)"""
+        return self._indices if self._indices is not None else tabela_indices()
+
+
+_REFERENCIA = None
+_LOCK_REFERENCIA = threading.Lock()
+_COMPARTILHAR = True
+
+
+def dados_referencia():
+    """Dados de referência do processo, montados no primeiro uso"""
+    global _REFERENCIA
+    if not _COMPARTILHAR:
+        # Cópias independentes, para medir o custo sem compartilhamento
+        return DadosReferencia(indices_exemplo())
+    if _REFERENCIA is None:
+        with _LOCK_REFERENCIA:
+            if _REFERENCIA is None:
+                _REFERENCIA = DadosReferencia()
+    return _REFERENCIA
+
+
+def compartilhar_referencia(ativo=True):
+    """Liga ou desliga o compartilhamento e devolve o estado anterior"""
+    global _COMPARTILHAR
+    anterior, _COMPARTILHAR = _COMPARTILHAR, bool(ativo)
+    return anterior
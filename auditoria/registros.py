@@ -0,0 +1,140 @@
+"""Representação tipada das contribuições: competência, dinheiro e status
+
+Competências ``"MM/AAAA"`` viram o número do mês (``ano * 12 + mes - 1``),
+valores em reais viram centavos inteiros e o status vira um código. As
+contribuições inteiras cabem em um array estruturado (``DTYPE_CONTRIBUICAO``,
+29 bytes por linha), que serve de base sem cópia para um DataFrame tipado.
+"""
+
+import numpy as np
+
+# Códigos dos status das contribuições (a posição é o código)
+STATUS_CONTRIBUICAO = ('Considerado', 'Indeferido')
+CODIGO_STATUS = {status: codigo for codigo, status in enumerate(STATUS_CONTRIBUICAO)}
+
+
+def competencia_para_mes(competencia):
+    """Converte ``"MM/AAAA"`` no número do mês"""
+    mes, ano = competencia.split('/')
+    return int(ano) * 12 + int(mes) - 1
+
+
+def mes_para_competencia(mes):
+    """Converte o número do mês em ``"MM/AAAA"``"""
+    ano, indice = divmod(int(mes), 12)
+    return f"{indice + 1:02d}/{ano}"
+
+
+def competencias_para_meses(competencias):
+    """Converte uma sequência de competências em array int32 de meses"""
+    return np.fromiter((competencia_para_mes(c) for c in competencias), dtype=np.int32, count=len(competencias))
+
+
+def meses_para_competencias(meses):
+    """Converte um array de meses na lista de competências ``"MM/AAAA"``"""
+    return [mes_para_competencia(mes) for mes in np.asarray(meses).tolist()]
+
+
+def reais_para_centavos(valores):
+    """Converte valores em reais para centavos inteiros (int64), com arredondamento"""
+    return np.rint(np.asarray(valores, dtype=np.float64) * 100).astype(np.int64)
+
+
+def centavos_para_reais(centavos):
+    """Converte centavos inteiros para reais (float64)"""
+    return np.asarray(centavos, dtype=np.int64) / 100
+
+
+# Registro compacto de uma contribuição: 29 bytes por linha, sem alinhamento
+DTYPE_CONTRIBUICAO = np.dtype([
+    ('competencia', '<i4'),  # número do mês
+    ('salario', '<i8'),      # centavos
+    ('indice', '<f8'),
+    ('corrigido', '<i8'),    # centavos
+    ('status', 'u1')         # código de STATUS_CONTRIBUICAO
+])
+
+
+def codigos_status(status):
+    """Converte uma sequência de status no array uint8 dos códigos"""
+    return np.fromiter((CODIGO_STATUS[s] for s in status), dtype=np.uint8, count=len(status))
+
+
+def registros_contribuicoes(contribuicoes):
+    """Monta o array estruturado a partir da lista de dicionários ou do DataFrame do dashboard"""
+    if hasattr(contribuicoes, 'columns'):
+        colunas = {nome: contribuicoes[nome].tolist() for nome in DTYPE_CONTRIBUICAO.names}
+    else:
+        colunas = {nome: [linha[nome] for linha in contribuicoes] for nome in DTYPE_CONTRIBUICAO.names}
+    registros = np.empty(len(colunas['competencia']), dtype=DTYPE_CONTRIBUICAO)
+    registros['competencia'] = competencias_para_meses(colunas['competencia'])
+    registros['salario'] = reais_para_centavos(colunas['salario'])
+    registros['indice'] = colunas['indice']
+    registros['corrigido'] = reais_para_centavos(colunas['corrigido'])
+    registros['status'] = codigos_status(colunas['status'])
+    return registros
+
+
+def quadro_registros(registros):
+    """DataFrame tipado sobre o array estruturado, sem cópia
+
+    Cada coluna é uma visão do campo correspondente; os tipos são os do
+    registro (meses, centavos e códigos). Para a tabela exibida no
+    dashboard use ``dataframe_contribuicoes``.
+    """
+    import pandas as pd
+
+    return pd.DataFrame({nome: registros[nome] for nome in registros.dtype.names}, copy=False)
+
+
+def _origem_estruturada(coluna):
+    """Array estruturado do qual a coluna é uma visão, ou None"""
+    base = coluna.base
+    while base is not None and base.dtype != DTYPE_CONTRIBUICAO and isinstance(base.base, np.ndarray):
+        base = base.base
+    if not isinstance(base, np.ndarray) or base.dtype != DTYPE_CONTRIBUICAO:
+        return None
+    return base
+
+
+def registros_do_quadro(quadro):
+    """Volta de ``quadro_registros`` ao array estruturado, sem cópia quando possível
+
+    Se as colunas ainda são visões de um mesmo array estruturado (inclusive
+    de um intervalo contíguo de linhas), devolve uma visão somente leitura
+    dele; caso contrário, monta um array novo.
+    """
+    colunas = {nome: quadro[nome].to_numpy() for nome in DTYPE_CONTRIBUICAO.names}
+    origem = _origem_estruturada(colunas['competencia'])
+    if origem is not None:
+        inicio_origem = origem.__array_interface__['data'][0]
+        inicio = colunas['competencia'].__array_interface__['data'][0] - inicio_origem
+        linha, resto = divmod(inicio, DTYPE_CONTRIBUICAO.itemsize)
+        compativel = resto == 0 and all(
+            coluna.strides == (DTYPE_CONTRIBUICAO.itemsize,)
+            and len(coluna) == len(quadro)
+            and coluna.__array_interface__['data'][0] - inicio_origem
+            == linha * DTYPE_CONTRIBUICAO.itemsize + DTYPE_CONTRIBUICAO.fields[nome][1]
+            for nome, coluna in colunas.items()
+        )
+        if compativel:
+            registros = origem[linha:linha + len(quadro)].view()
+            registros.flags.writeable = False
+            return registros
+    registros = np.empty(len(quadro), dtype=DTYPE_CONTRIBUICAO)
+    for nome, coluna in colunas.items():
+        registros[nome] = coluna
+    return registros
+
+
+def dataframe_contribuicoes(registros):
+    """DataFrame no formato exibido pelo dashboard (competência em texto, reais e status)"""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'competencia': meses_para_competencias(registros['competencia']),
+        'salario': centavos_para_reais(registros['salario']),
+        'indice': registros['indice'],
+        'corrigido': centavos_para_reais(registros['corrigido']),
+        'status': pd.Categorical.from_codes(registros['status'].astype(np.int8), STATUS_CONTRIBUICAO)
+    })
@@ -0,0 +1,526 @@
+"""Geração do relatório HTML de auditoria com modelo pré-compilado
+
+O modelo estático (CSS, logo e marcação) é analisado e codificado uma única
+vez, na importação do módulo. Para cada caso os valores derivados do
+comparativo são calculados uma vez e o relatório é produzido em partes, que
+podem ser gravadas direto em um arquivo ou enviadas como resposta sem
+montar o documento inteiro em memória.
+"""
+
+import hashlib
+import string
+from datetime import datetime
+
+from auditoria.perfil import medir, perfilado
+
+# Modelo do relatório: campos no formato de str.format, chaves literais dobradas
+_MODELO_RELATORIO = """
+    <!DOCTYPE html>
+    <html lang="pt-br">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Relatório de Auditoria Previdenciária - OLIVEIRA OFFICE LAW</title>
+        <style>
+            /* Estilos globais */
+            :root {{
+                --verde-primario: #1E5128;
+                --verde-secundario: #4E9F3D;
+                --preto: #111111;
+                --cinza-claro: #f5f5f5;
+                --cinza-medio: #e0e0e0;
+                --branco: #ffffff;
+            }}
+            
+            * {{
+                margin: 0;
+                padding: 0;
+                box-sizing: border-box;
+                font-family: 'Segoe UI', Arial, sans-serif;
+            }}
+            
+            body {{
+                font-size: 14px;
+                line-height: 1.6;
+                color: #333;
+                background-color: var(--cinza-claro);
+            }}
+            
+            /* Container principal */
+            .container {{
+                max-width: 1000px;
+                margin: 0 auto;
+                padding: 20px;
+                background-color: var(--branco);
+                box-shadow: 0 0 10px rgba(0,0,0,0.1);
+            }}
+            
+            /* Cabeçalho */
+            .header {{
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                padding-bottom: 20px;
+                border-bottom: 2px solid var(--verde-primario);
+                margin-bottom: 30px;
+            }}
+            
+            .logo-container {{
+                display: flex;
+                align-items: center;
+            }}
+            
+            .logo-svg {{
+                width: 60px;
+                height: 60px;
+            }}
+            
+            .logo-text {{
+                margin-left: 15px;
+            }}
+            
+            .logo-text h1 {{
+                margin: 0;
+                font-size: 24px;
+                color: #333;
+            }}
+            
+            .logo-text p {{
+                margin: 5px 0 0;
+                font-size: 16px;
+                color: #666;
+            }}
+            
+            .header-info {{
+                text-align: right;
+                font-size: 14px;
+            }}
+            
+            /* Título principal */
+            .main-title {{
+                text-align: center;
+                font-size: 22px;
+                margin-bottom: 30px;
+            }}
+            
+            /* Seções do relatório */
+            .section {{
+                margin-bottom: 30px;
+            }}
+            
+            .section-title {{
+                font-size: 20px;
+                margin-bottom: 15px;
+                color: var(--verde-primario);
+            }}
+            
+            .section-content {{
+                background-color: #f9f9f9;
+                padding: 15px;
+                border-radius: 5px;
+            }}
+            
+            /* Tabelas */
+            table {{
+                width: 100%;
+                border-collapse: collapse;
+                margin: 15px 0;
+            }}
+            
+            th {{
+                background-color: var(--verde-primario);
+                color: white;
+                padding: 10px;
+                text-align: left;
+            }}
+            
+            td {{
+                padding: 10px;
+                border-bottom: 1px solid #ddd;
+            }}
+            
+            tr:nth-child(even) {{
+                background-color: #f2f2f2;
+            }}
+            
+            /* Cores para valores */
+            .positive {{
+                color: var(--verde-primario);
+                font-weight: bold;
+            }}
+            
+            .negative {{
+                color: #D32F2F;
+                font-weight: bold;
+            }}
+            
+            /* Rodapé */
+            .footer {{
+                margin-top: 40px;
+                padding-top: 20px;
+                border-top: 2px solid var(--verde-primario);
+                text-align: center;
+            }}
+            
+            /* Versão para impressão */
+            @media print {{
+                body {{
+                    background-color: white;
+                }}
+                
+                .container {{
+                    box-shadow: none;
+                    max-width: 100%;
+                }}
+                
+                @page {{
+                    margin: 2cm;
+                }}
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <div class="logo-container">
+                    <svg class="logo-svg" viewBox="0 0 100 100">
+                        <circle cx="50" cy="70" r="20" fill="#1E5128" />
+                        <rect x="45" y="25" width="10" height="45" fill="#1E5128" />
+                        <circle cx="30" cy="30" r="15" fill="#4E9F3D" />
+                        <circle cx="50" cy="20" r="15" fill="#4E9F3D" />
+                        <circle cx="70" cy="30" r="15" fill="#4E9F3D" />
+                        <circle cx="40" cy="40" r="10" fill="#4E9F3D" />
+                        <circle cx="60" cy="40" r="10" fill="#4E9F3D" />
+                        <circle cx="50" cy="25" r="3" fill="#111111" />
+                        <circle cx="65" cy="35" r="3" fill="#111111" />
+                        <circle cx="35" cy="35" r="3" fill="#111111" />
+                    </svg>
+                    <div class="logo-text">
+                        <h1>OLIVEIRA OFFICE LAW</h1>
+                        <p>Consultoria Previdenciária</p>
+                    </div>
+                </div>
+                <div class="header-info">
+                    <p>Data: {data_atual}</p>
+                    <p>Processo nº: AP-{num_beneficio}</p>
+                </div>
+            </div>
+            
+            <h2 class="main-title">RELATÓRIO TÉCNICO DE AUDITORIA PREVIDENCIÁRIA</h2>
+            
+            <div class="section">
+                <h3 class="section-title">1. IDENTIFICAÇÃO DO SEGURADO</h3>
+                <div class="section-content">
+                    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+                        <div>
+                            <p><strong>Nome:</strong> {nome}</p>
+                            <p><strong>CPF:</strong> {cpf}</p>
+                            <p><strong>Data de Nascimento:</strong> {data_nascimento}</p>
+                            <p><strong>NIT/PIS:</strong> {nit}</p>
+                        </div>
+                        <div>
+                            <p><strong>Número do Benefício:</strong> {num_beneficio}</p>
+                            <p><strong>Espécie do Benefício:</strong> {especie_beneficio}</p>
+                            <p><strong>Data de Requerimento:</strong> {data_requerimento}</p>
+                            <p><strong>Tempo de Contribuição:</strong> {tc_anos} anos, {tc_meses} meses e {tc_dias} dias</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h3 class="section-title">2. RESUMO EXECUTIVO</h3>
+                <div class="section-content">
+                    <p>A presente auditoria previdenciária teve por objetivo verificar a regularidade do cálculo do benefício previdenciário concedido ao segurado em questão.</p>
+                    <p>A análise técnica realizada no CNIS (Cadastro Nacional de Informações Sociais) e demais documentos previdenciários revelou inconsistências graves no cálculo efetuado pelo INSS, resultando em pagamento mensal inferior ao devido.</p>
+                    
+                    <p>As principais divergências identificadas foram:</p>
+                    <ol style="margin-left: 20px;">
+                        <li>Contagem incorreta do número de contribuições;</li>
+                        <li>Aplicação inadequada da regra dos 80% maiores salários;</li>
+                        <li>Desconsideração de períodos contributivos relevantes;</li>
+                        <li>Cálculo incorreto do fator previdenciário.</li>
+                    </ol>
+                    
+                    <p>Em função desses erros, o segurado recebe mensalmente R$ {dif_salario_beneficio:.2f} a menos do que o valor correto, representando uma redução de {pct_reducao_beneficio:.2f}% no benefício.</p>
+                    
+                    <p style="font-weight: bold;">O valor total devido ao segurado, considerando as diferenças vencidas desde a concessão ({data_requerimento}) até a data atual ({data_atual}), incluindo correção monetária e juros legais, é de <span style="color: #1E5128;">R$ {total_geral:.2f}</span>.</p>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h3 class="section-title">3. ANÁLISE TÉCNICA DO CÁLCULO</h3>
+                
+                <div style="margin-bottom: 20px;">
+                    <h4 style="margin-bottom: 10px; font-size: 16px;">3.1. Composição do Período Contributivo</h4>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Descrição</th>
+                                <th>Cálculo INSS</th>
+                                <th>Cálculo Auditoria</th>
+                                <th>Diferença</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr>
+                                <td>Total de registros analisados</td>
+                                <td>{total_contribuicoes_inss}</td>
+                                <td>{total_contribuicoes_auditoria}</td>
+                                <td class="negative">{dif_total_contribuicoes}</td>
+                            </tr>
+                            <tr>
+                                <td>Contribuições consideradas (80%)</td>
+                                <td>{consideradas_inss}</td>
+                                <td>{consideradas_auditoria}</td>
+                                <td class="negative">{dif_consideradas}</td>
+                            </tr>
+                            <tr>
+                                <td>Períodos ignorados que deveriam ser aproveitados</td>
+                                <td>0</td>
+                                <td>{reaproveitaveis}</td>
+                                <td class="positive">+{reaproveitaveis}</td>
+                            </tr>
+                        </tbody>
+                    </table>
+                    <p style="font-size: 13px; margin-top: 10px;"><strong>Erro identificado:</strong> O INSS considerou registros inválidos para cálculo da média salarial, sendo que do total de {total_contribuicoes_inss} registros analisados, apenas {total_contribuicoes_auditoria} eram efetivamente válidos.</p>
+                </div>
+                
+                <div style="margin-bottom: 20px;">
+                    <h4 style="margin-bottom: 10px; font-size: 16px;">3.2. Média Salarial e Fator Previdenciário</h4>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Parâmetro</th>
+                                <th>Cálculo INSS</th>
+                                <th>Cálculo Auditoria</th>
+                                <th>Diferença</th>
+                                <th>Variação (%)</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr>
+                                <td>Média salarial (R$)</td>
+                                <td>{media_inss:.2f}</td>
+                                <td>{media_auditoria:.2f}</td>
+                                <td class="positive">+{dif_media:.2f}</td>
+                                <td class="positive">+{pct_dif_media:.2f}%</td>
+                            </tr>
+                            <tr>
+                                <td>Fator previdenciário</td>
+                                <td>{fator_inss:.4f}</td>
+                                <td>{fator_auditoria:.4f}</td>
+                                <td class="negative">{dif_fator:.4f}</td>
+                                <td class="negative">{pct_dif_fator:.2f}%</td>
+                            </tr>
+                            <tr style="font-weight: bold;">
+                                <td>Salário de Benefício (R$)</td>
+                                <td>{sb_inss:.2f}</td>
+                                <td>{sb_auditoria:.2f}</td>
+                                <td class="positive">+{dif_salario_beneficio:.2f}</td>
+                                <td class="positive">+{pct_dif_salario_beneficio:.2f}%</td>
+                            </tr>
+                        </tbody>
+                    </table>
+                    <p style="font-size: 13px; margin-top: 10px;"><strong>Impacto:</strong> A diferença na média salarial é de +{pct_dif_media:.2f}%, o que, apesar da pequena redução no fator previdenciário, resulta em um salário de benefício consideravelmente maior.</p>
+                </div>
+                
+                <div>
+                    <h4 style="margin-bottom: 10px; font-size: 16px;">3.3. Valores Retroativos Devidos</h4>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Componente</th>
+                                <th>Valor (R$)</th>
+                                <th>Participação (%)</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr>
+                                <td>Diferenças vencidas</td>
+                                <td>{diferencas_vencidas:.2f}</td>
+                                <td>{pct_diferencas_vencidas:.2f}%</td>
+                            </tr>
+                            <tr>
+                                <td>Correção monetária</td>
+                                <td>{correcao_monetaria:.2f}</td>
+                                <td>{pct_correcao_monetaria:.2f}%</td>
+                            </tr>
+                            <tr>
+                                <td>Juros legais</td>
+                                <td>{juros_legais:.2f}</td>
+                                <td>{pct_juros_legais:.2f}%</td>
+                            </tr>
+                            <tr style="background-color: #111111; color: white; font-weight: bold;">
+                                <td>TOTAL DEVIDO</td>
+                                <td>{total_geral:.2f}</td>
+                                <td>100,00%</td>
+                            </tr>
+                        </tbody>
+                    </table>
+                    <p style="font-size: 13px; margin-top: 10px;"><strong>Observação:</strong> Os valores acima consideram a correção monetária pelo INPC e juros de 0,5% ao mês, conforme legislação aplicável.</p>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h3 class="section-title">4. CONCLUSÕES E RECOMENDAÇÕES</h3>
+                <div class="section-content">
+                    <p>Com base na análise técnica realizada, conclui-se que o benefício previdenciário do segurado {nome} foi calculado de forma incorreta pelo INSS, resultando em pagamento mensal inferior ao devido.</p>
+                    
+                    <p>Recomenda-se as seguintes providências:</p>
+                    <ol style="margin-left: 20px;">
+                        <li>Ingressar com pedido administrativo de revisão junto ao INSS;</li>
+                        <li>Em caso de indeferimento ou demora injustificada, ajuizar ação revisional com pedido de tutela de urgência para imediata correção do valor mensal do benefício;</li>
+                        <li>Requerer o pagamento das diferenças vencidas desde a concessão, observado o prazo prescricional de 5 anos;</li>
+                        <li>Solicitar a aplicação de correção monetária e juros legais sobre as parcelas em atraso.</li>
+                    </ol>
+                    
+                    <p>Ressalta-se que a chancela de êxito para o caso em tela é considerada <strong>muito alta</strong>, tendo em vista a robustez das provas e a jurisprudência consolidada acerca da matéria.</p>
+                    
+                    <p style="font-weight: bold;">O ajuizamento da ação revisional deve ocorrer preferencialmente na Justiça Federal da Seção Judiciária do Maranhão, com fulcro no art. 109, I, da Constituição Federal.</p>
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p>São Luís, {data_atual}</p>
+                <p style="font-weight: bold; margin-top: 40px;">OLIVEIRA OFFICE LAW</p>
+                <p style="font-size: 13px;">Consultoria Jurídica Especializada</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def _compilar(modelo):
+    """Separa o modelo em trechos estáticos e referências a campos formatados
+
+    Cada campo (nome, formato) distinto é formatado uma única vez por
+    relatório, mesmo que apareça em vários pontos do documento.
+    """
+    campos = []
+    plano = []
+    for literal, campo, especificacao, _ in string.Formatter().parse(modelo):
+        indice = None
+        if campo is not None:
+            chave = (campo, especificacao or '')
+            if chave not in campos:
+                campos.append(chave)
+            indice = campos.index(chave)
+        plano.append((literal, literal.encode('utf-8'), indice))
+    return tuple(campos), tuple(plano)
+
+
+_CAMPOS, _PLANO = _compilar(_MODELO_RELATORIO)
+CAMPOS_RELATORIO = frozenset(campo for campo, _ in _CAMPOS)
+_QUANTIDADE_PARTES = sum(bool(literal) + (indice is not None) for literal, _, indice in _PLANO)
+
+# Muda sempre que o modelo muda; identifica relatórios gravados em disco
+VERSAO_RELATORIO = hashlib.sha1(_MODELO_RELATORIO.encode('utf-8')).hexdigest()[:12]
+
+
+def valores_relatorio(data, data_atual=None):
+    """Calcula uma única vez os valores e percentuais exibidos no relatório"""
+    segurado = data['segurado']
+    inss = data['comparativo']['inss']
+    auditoria = data['comparativo']['auditoria']
+    total_devido = data['total_devido']
+    total_geral = total_devido['totalGeral']
+
+    dif_salario_beneficio = auditoria['salarioBeneficio'] - inss['salarioBeneficio']
+    dif_media = auditoria['mediaContribuicoes'] - inss['mediaContribuicoes']
+    dif_fator = auditoria['fatorPrevidenciario'] - inss['fatorPrevidenciario']
+
+    return {
+        "data_atual": data_atual or datetime.now().strftime("%d/%m/%Y"),
+        "num_beneficio": segurado['numBeneficio'],
+        "nome": segurado['nome'],
+        "cpf": segurado['cpf'],
+        "data_nascimento": segurado['dataNascimento'],
+        "nit": segurado['nit'],
+        "especie_beneficio": segurado['especieBeneficio'],
+        "data_requerimento": segurado['dataRequerimento'],
+        "tc_anos": segurado['tempoContribuicao']['anos'],
+        "tc_meses": segurado['tempoContribuicao']['meses'],
+        "tc_dias": segurado['tempoContribuicao']['dias'],
+        "total_contribuicoes_inss": inss['totalContribuicoes'],
+        "total_contribuicoes_auditoria": auditoria['totalContribuicoes'],
+        "dif_total_contribuicoes": auditoria['totalContribuicoes'] - inss['totalContribuicoes'],
+        "consideradas_inss": inss['contribuicoesConsideradas'],
+        "consideradas_auditoria": auditoria['contribuicoesConsideradas'],
+        "dif_consideradas": auditoria['contribuicoesConsideradas'] - inss['contribuicoesConsideradas'],
+        "reaproveitaveis": auditoria['contribuicoesReaproveitaveis'],
+        "media_inss": inss['mediaContribuicoes'],
+        "media_auditoria": auditoria['mediaContribuicoes'],
+        "dif_media": dif_media,
+        "pct_dif_media": dif_media / inss['mediaContribuicoes'] * 100,
+        "fator_inss": inss['fatorPrevidenciario'],
+        "fator_auditoria": auditoria['fatorPrevidenciario'],
+        "dif_fator": dif_fator,
+        "pct_dif_fator": dif_fator / inss['fatorPrevidenciario'] * 100,
+        "sb_inss": inss['salarioBeneficio'],
+        "sb_auditoria": auditoria['salarioBeneficio'],
+        "dif_salario_beneficio": dif_salario_beneficio,
+        "pct_dif_salario_beneficio": dif_salario_beneficio / inss['salarioBeneficio'] * 100,
+        "pct_reducao_beneficio": dif_salario_beneficio / auditoria['salarioBeneficio'] * 100,
+        "total_geral": total_geral,
+        "diferencas_vencidas": total_devido['diferencasVencidas'],
+        "pct_diferencas_vencidas": total_devido['diferencasVencidas'] / total_geral * 100,
+        "correcao_monetaria": total_devido['correcaoMonetaria'],
+        "pct_correcao_monetaria": total_devido['correcaoMonetaria'] / total_geral * 100,
+        "juros_legais": total_devido['jurosLegais'],
+        "pct_juros_legais": total_devido['jurosLegais'] / total_geral * 100
+    }
+
+
+def _formatar_campos(data, data_atual):
+    valores = valores_relatorio(data, data_atual)
+    return [format(valores[campo], especificacao) for campo, especificacao in _CAMPOS]
+
+
+def gerar_relatorio_partes(data, data_atual=None):
+    """Produz o relatório HTML em partes de texto, na ordem do documento"""
+    campos = _formatar_campos(data, data_atual)
+    for literal, _, indice in _PLANO:
+        if literal:
+            yield literal
+        if indice is not None:
+            yield campos[indice]
+
+
+def gerar_relatorio_bytes(data, data_atual=None):
+    """Produz o relatório HTML em partes já codificadas em UTF-8
+
+    Os trechos estáticos reutilizam os bytes codificados na importação; só
+    os campos do caso são codificados a cada relatório.
+    """
+    campos = [campo.encode('utf-8') for campo in _formatar_campos(data, data_atual)]
+    for _, literal, indice in _PLANO:
+        if literal:
+            yield literal
+        if indice is not None:
+            yield campos[indice]
+
+
+def escrever_relatorio(data, destino, data_atual=None, progresso=None):
+    """Grava o relatório em um arquivo binário (ou caminho) e devolve os bytes gravados
+
+    ``progresso``, se informado, recebe a fração já gravada (0 a 1).
+    """
+    if isinstance(destino, (str, bytes)) or hasattr(destino, '__fspath__'):
+        with open(destino, 'wb') as arquivo:
+            return escrever_relatorio(data, arquivo, data_atual, progresso)
+    total = 0
+    with medir("relatorio:html"):
+        for posicao, parte in enumerate(gerar_relatorio_bytes(data, data_atual), 1):
+            destino.write(parte)
+            total += len(parte)
+            if progresso is not None:
+                progresso(posicao / _QUANTIDADE_PARTES)
+    return total
+
+
+@perfilado("relatorio:html")
+def gerar_html_relatorio(data):
+    """Gera um relatório HTML completo"""
+    return ''.join(gerar_relatorio_partes(data))
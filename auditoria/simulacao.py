@@ -0,0 +1,179 @@
+"""Simulação "e se" sobre um caso: status das contribuições e datas dos vínculos
+
+As contribuições ficam em uma árvore de Fenwick indexada pela posição de
+cada valor corrigido na ordem decrescente, com contagem e soma das
+contribuições aceitas. Alternar um status custa O(log n) e a soma dos k
+maiores sai de uma busca na árvore, sem reordenar o histórico.
+
+O simulador aplica a variação relativa do modelo sobre os valores apurados
+no caso: sem alterações, ele reproduz a média, o fator, o salário de
+benefício e o ``total_devido`` do caso. Os atrasados variam na proporção da diferença mensal,
+pois correção e juros são lineares no valor devido.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from auditoria.cnis import PROPORCAO_MAIORES_SALARIOS, STATUS_INDEFERIDO
+from auditoria.fator import calcular_fator_previdenciario
+from auditoria.vinculos import data_ordinal, dias_cobertos
+
+DIAS_POR_ANO = 365.25
+
+
+class MaioresAceitos:
+    """Soma dos k maiores valores entre os aceitos, com atualização em O(log n)"""
+
+    def __init__(self, valores, aceitos):
+        valores = np.asarray(valores, dtype=np.float64)
+        # Posição na ordem decrescente; empates pela ordem original
+        ordem = np.argsort(-valores, kind='stable')
+        self._posicao = np.empty(len(valores), dtype=np.int64)
+        self._posicao[ordem] = np.arange(len(valores))
+        self._valores = valores.tolist()
+        self._aceitos = np.zeros(len(valores), dtype=bool)
+        self._n = len(valores)
+        self._contagem = [0] * (self._n + 1)
+        self._soma = [0.0] * (self._n + 1)
+        self.quantidade = 0
+        for indice in np.flatnonzero(aceitos):
+            self.definir(int(indice), True)
+
+    def _atualizar(self, posicao, contagem, valor):
+        posicao += 1
+        while posicao <= self._n:
+            self._contagem[posicao] += contagem
+            self._soma[posicao] += valor
+            posicao += posicao & -posicao
+
+    def aceitos(self):
+        """Máscara das contribuições aceitas (somente leitura)"""
+        mascara = self._aceitos.view()
+        mascara.flags.writeable = False
+        return mascara
+
+    def definir(self, indice, aceito):
+        """Marca a contribuição ``indice`` como aceita ou não"""
+        if self._aceitos[indice] == aceito:
+            return
+        self._aceitos[indice] = aceito
+        sinal = 1 if aceito else -1
+        self._atualizar(int(self._posicao[indice]), sinal, sinal * self._valores[indice])
+        self.quantidade += sinal
+
+    def soma_maiores(self, k):
+        """Soma dos ``k`` maiores valores aceitos"""
+        k = min(k, self.quantidade)
+        posicao, restante, soma = 0, k, 0.0
+        passo = 1 << self._n.bit_length()
+        while passo:
+            proxima = posicao + passo
+            if proxima <= self._n and self._contagem[proxima] <= restante:
+                posicao = proxima
+                restante -= self._contagem[proxima]
+                soma += self._soma[proxima]
+            passo >>= 1
+        return soma
+
+    def media_maiores(self):
+        """Quantidade considerada (80% dos aceitos) e média dos maiores"""
+        k = int(self.quantidade * PROPORCAO_MAIORES_SALARIOS)
+        return k, (self.soma_maiores(k) / k if k else float('nan'))
+
+
+class Simulador:
+    """Estado de uma simulação sobre um caso já calculado"""
+
+    def __init__(self, caso):
+        self.caso = caso
+        contribuicoes = caso['contribuicoes_cnis']
+        self.aceitos_originais = (contribuicoes['status'] != STATUS_INDEFERIDO).to_numpy()
+        self.maiores = MaioresAceitos(contribuicoes['corrigido'].to_numpy(), self.aceitos_originais)
+        self.vinculos_originais = [
+            (inicio, fim) for inicio, fim in zip(caso['vinculos_empregaticos']['inicio'], caso['vinculos_empregaticos']['fim'])
+        ]
+        self.vinculos = list(self.vinculos_originais)
+        self.der = date.fromordinal(data_ordinal(caso['segurado']['dataRequerimento']))
+        self._dias_base = dias_cobertos(self.vinculos_originais, self.der)
+        self._dias = self._dias_base
+        _, self._media_base = self.maiores.media_maiores()
+        self._fator_base = self._fator(0)
+
+    def _fator(self, dias_adicionais):
+        parametros = self.caso['fator_previdenciario']
+        return calcular_fator_previdenciario(
+            parametros['tempoContribuicao'] + dias_adicionais / DIAS_POR_ANO,
+            parametros['aliquota'],
+            parametros['expectativaSobrevida'],
+            parametros['idade']
+        )
+
+    def definir_status(self, indice, aceita):
+        """Aceita ou recusa a contribuição na linha ``indice`` de ``contribuicoes_cnis``"""
+        self.maiores.definir(indice, bool(aceita))
+
+    def aplicar_status(self, aceitas):
+        """Sincroniza com uma máscara completa de aceitas, alterando só as linhas que mudaram"""
+        aceitas = np.asarray(aceitas, dtype=bool)
+        for indice in np.flatnonzero(aceitas != self.maiores.aceitos()):
+            self.maiores.definir(int(indice), bool(aceitas[indice]))
+
+    def aplicar_vinculos(self, periodos):
+        """Sincroniza com a lista completa de períodos ``(inicio, fim)`` dos vínculos"""
+        periodos = [tuple(periodo) for periodo in periodos]
+        if periodos != self.vinculos:
+            self.vinculos = periodos
+            self._dias = dias_cobertos(self.vinculos, self.der)
+
+    def definir_vinculo(self, indice, inicio=None, fim=None):
+        """Altera o início e/ou o fim do vínculo na linha ``indice``"""
+        atual_inicio, atual_fim = self.vinculos[indice]
+        self.vinculos[indice] = (atual_inicio if inicio is None else inicio, atual_fim if fim is None else fim)
+        self._dias = dias_cobertos(self.vinculos, self.der)
+
+    def restaurar(self):
+        """Volta ao estado original do caso"""
+        for indice, aceito in enumerate(self.aceitos_originais):
+            self.maiores.definir(indice, bool(aceito))
+        self.vinculos = list(self.vinculos_originais)
+        self._dias = self._dias_base
+
+    def resultado(self):
+        """Comparativo e total devido simulados, ancorados nos valores do caso"""
+        auditoria = self.caso['comparativo']['auditoria']
+        salario_inss = self.caso['comparativo']['inss']['salarioBeneficio']
+        k, media = self.maiores.media_maiores()
+        fator = self._fator(self._dias - self._dias_base)
+
+        if self._media_base and np.isfinite(self._media_base) and np.isfinite(media):
+            media_simulada = auditoria['mediaContribuicoes'] * media / self._media_base
+        else:
+            media_simulada = media
+        fator_simulado = auditoria['fatorPrevidenciario'] * (
+            fator['calculoFator']['resultadoFinal'] / self._fator_base['calculoFator']['resultadoFinal']
+        )
+        salario = media_simulada * fator_simulado
+        diferenca = salario - salario_inss
+        diferenca_base = auditoria['mediaContribuicoes'] * auditoria['fatorPrevidenciario'] - salario_inss
+        proporcao = diferenca / diferenca_base if diferenca_base else 0.0
+
+        total_devido = self.caso['total_devido']
+        return {
+            "contribuicoesAceitas": self.maiores.quantidade,
+            "contribuicoesConsideradas": k,
+            "tempoContribuicao": fator['tempoContribuicao'],
+            "mediaContribuicoes": media_simulada,
+            "fatorPrevidenciario": fator_simulado,
+            "salarioBeneficio": salario,
+            "diferencaMensal": diferenca,
+            "total_devido": {
+                "diferencasVencidas": total_devido['diferencasVencidas'] * proporcao,
+                "correcaoMonetaria": total_devido['correcaoMonetaria'] * proporcao,
+                "jurosLegais": total_devido['jurosLegais'] * proporcao,
+                "totalGeral": total_devido['totalGeral'] * proporcao,
+                "parcelasMensais": {
+                    chave: valor * proporcao for chave, valor in total_devido['parcelasMensais'].items()
+                }
+            }
+        }
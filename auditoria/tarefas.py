@@ -0,0 +1,329 @@
+"""Fila de tarefas em segundo plano com resultados gravados em disco
+
+Exportações (relatório HTML e PDF, CSV e, no futuro, exportações da
+carteira) são enfileiradas em um pool local de threads, fora da thread da
+sessão do Streamlit. Cada artefato é identificado por uma ``chave``
+``(num_beneficio, versao_caso, artefato, versao_artefato)`` e gravado no
+``ArmazemResultados``; pedir de novo a mesma chave devolve na hora a tarefa
+já concluída, inclusive entre sessões e reinícios do servidor.
+
+Enquanto uma tarefa roda, ``Tarefa.progresso`` traz a fração concluída
+(0 a 1), atualizada pela função de geração. A geração é medida como o
+trecho ``tarefa:<artefato>`` no perfilador da sessão que a enfileirou.
+
+O armazém descarta, de tempos em tempos, os artefatos mais antigos que
+``idade_maxima`` e, acima de ``limite_bytes``, os usados há mais tempo;
+como a data do relatório entra na chave, sem isso os arquivos de cada dia
+se acumulariam.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from auditoria.exportacao import VERSAO_CSV, escrever_csv, gravar_atomico
+from auditoria.perfil import perfilado, vincular
+from auditoria.pdf import VERSAO_PDF, escrever_relatorio_pdf
+from auditoria.relatorio import VERSAO_RELATORIO, escrever_relatorio
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+FALHA = 'falha'
+
+# Diretório padrão dos resultados; pode ser trocado pela variável de ambiente
+VARIAVEL_RESULTADOS = 'AUDITORIA_RESULTADOS'
+
+# Limites padrão do armazém e intervalo entre as limpezas feitas pela fila
+IDADE_MAXIMA = 7 * 24 * 3600.0
+LIMITE_BYTES = 1024 * 2**20
+INTERVALO_LIMPEZA = 600.0
+
+
+class ArmazemResultados:
+    """Artefatos gerados, um arquivo por chave, em ``raiz/<num_beneficio>/``
+
+    ``idade_maxima`` (segundos) e ``limite_bytes`` limitam o que ``limpar``
+    mantém em disco; None desliga o limite.
+    """
+
+    def __init__(self, raiz, idade_maxima=IDADE_MAXIMA, limite_bytes=LIMITE_BYTES):
+        self.raiz = Path(raiz)
+        self.idade_maxima = idade_maxima
+        self.limite_bytes = limite_bytes
+
+    def caminho(self, chave):
+        """Arquivo do artefato de uma chave"""
+        num_beneficio, versao_caso, artefato, versao_artefato = chave
+        prefixo = hashlib.sha1(f"{versao_caso}|{versao_artefato}".encode('utf-8')).hexdigest()[:16]
+        return self.raiz / str(num_beneficio) / f"{prefixo}-{artefato}"
+
+    def __contains__(self, chave):
+        return self.caminho(chave).exists()
+
+    def gravar(self, chave, escrever):
+        """Grava o artefato com ``escrever(arquivo)`` de forma atômica e devolve o caminho"""
+        caminho = self.caminho(chave)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        gravar_atomico(caminho, escrever)
+        return caminho
+
+    def usar(self, chave):
+        """Marca o artefato como usado agora, para que saia por último na limpeza"""
+        try:
+            os.utime(self.caminho(chave))
+        except FileNotFoundError:
+            pass
+
+    def limpar(self, agora=None):
+        """Apaga os artefatos vencidos e os usados há mais tempo acima do limite
+
+        Devolve ``(arquivos, bytes)`` apagados. Temporários de gravações em
+        andamento só saem depois de ``idade_maxima``.
+        """
+        agora = time.time() if agora is None else agora
+        arquivos = []
+        for diretorio in (self.raiz.iterdir() if self.raiz.is_dir() else ()):
+            if not diretorio.is_dir():
+                continue
+            for arquivo in diretorio.iterdir():
+                try:
+                    estado = arquivo.stat()
+                except FileNotFoundError:
+                    continue
+                arquivos.append((estado.st_mtime, estado.st_size, arquivo))
+        arquivos.sort()
+
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        apagados = apagados_bytes = 0
+        for usado_em, tamanho, arquivo in arquivos:
+            vencido = self.idade_maxima is not None and agora - usado_em > self.idade_maxima
+            excede = (
+                self.limite_bytes is not None and total > self.limite_bytes and not arquivo.name.startswith('.')
+            )
+            if not (vencido or excede):
+                continue
+            try:
+                arquivo.unlink()
+            except FileNotFoundError:
+                continue
+            total -= tamanho
+            apagados += 1
+            apagados_bytes += tamanho
+            try:
+                arquivo.parent.rmdir()
+            except OSError:
+                pass
+        return apagados, apagados_bytes
+
+    def remover_caso(self, num_beneficio):
+        """Apaga todos os artefatos de um caso"""
+        diretorio = self.raiz / str(num_beneficio)
+        if diretorio.is_dir():
+            for arquivo in diretorio.iterdir():
+                arquivo.unlink()
+            diretorio.rmdir()
+
+
+class Tarefa:
+    """Geração de um artefato, acompanhada pela interface"""
+
+    def __init__(self, chave, caminho, estado=PENDENTE):
+        self.id = uuid.uuid4().hex
+        self.chave = chave
+        self.caminho = caminho
+        self.estado = estado
+        self.progresso = 1.0 if estado == CONCLUIDA else 0.0
+        self.erro = None
+        self.criada_em = time.time()
+        self.segundos = 0.0
+        self._fim = threading.Event()
+        if estado in (CONCLUIDA, FALHA):
+            self._fim.set()
+
+    @property
+    def finalizada(self):
+        return self._fim.is_set()
+
+    def aguardar(self, timeout=None):
+        """Espera a tarefa terminar; devolve True se terminou"""
+        return self._fim.wait(timeout)
+
+    def abrir(self):
+        """Abre o artefato concluído para leitura binária
+
+        Pode ser passado sem chamar para ``st.download_button(data=...)``: o
+        Streamlit só abre o arquivo quando o usuário clica.
+        """
+        if self.estado != CONCLUIDA:
+            raise RuntimeError(f"Tarefa {self.id} não concluída ({self.estado})")
+        return open(self.caminho, 'rb')
+
+    def _atualizar_progresso(self, fracao):
+        self.progresso = min(max(float(fracao), 0.0), 1.0)
+
+    def _finalizar(self, estado, erro=None):
+        self.estado = estado
+        self.erro = erro
+        if estado == CONCLUIDA:
+            self.progresso = 1.0
+        self._fim.set()
+
+    def __repr__(self):
+        return f"Tarefa(chave={self.chave!r}, estado={self.estado!r}, progresso={self.progresso:.0%})"
+
+
+class FilaTarefas:
+    """Pool de threads que gera artefatos e os grava no armazém
+
+    Pedidos repetidos da mesma chave compartilham a tarefa em andamento ou
+    concluída; só as ``capacidade`` tarefas mais recentes ficam em memória,
+    o que não afeta o reaproveitamento dos arquivos já gravados.
+    """
+
+    def __init__(self, armazem, trabalhadores=2, capacidade=1024):
+        self.armazem = armazem
+        self.capacidade = capacidade
+        self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='tarefa')
+        self._tarefas = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = {
+            "enfileiradas": 0, "reaproveitadas": 0, "concluidas": 0, "falhas": 0, "artefatosDescartados": 0
+        }
+        self._ultima_limpeza = None
+
+    def enfileirar(self, chave, gerar):
+        """Enfileira a geração do artefato de ``chave``
+
+        ``gerar(arquivo, progresso)`` grava o artefato no arquivo binário e
+        pode chamar ``progresso(fracao)``. Se o artefato já existe em disco,
+        ou já está sendo gerado, devolve a tarefa correspondente. A geração
+        é medida no perfilador ativo de quem enfileira.
+        """
+        self._limpar_se_preciso()
+        with self._lock:
+            tarefa = self._tarefas.get(chave)
+            reaproveitavel = tarefa is not None and tarefa.estado != FALHA and (
+                tarefa.estado != CONCLUIDA or tarefa.caminho.exists()
+            )
+            if reaproveitavel:
+                self._tarefas.move_to_end(chave)
+                self._contadores["reaproveitadas"] += 1
+                self.armazem.usar(chave)
+                return tarefa
+            caminho = self.armazem.caminho(chave)
+            if caminho.exists():
+                tarefa = Tarefa(chave, caminho, CONCLUIDA)
+                self._contadores["reaproveitadas"] += 1
+                self.armazem.usar(chave)
+            else:
+                tarefa = Tarefa(chave, caminho)
+                self._contadores["enfileiradas"] += 1
+                gerar = vincular(perfilado(f"tarefa:{chave[2]}")(gerar))
+                self._executor.submit(self._executar, tarefa, gerar)
+            self._tarefas[chave] = tarefa
+            while len(self._tarefas) > self.capacidade:
+                self._tarefas.popitem(last=False)
+        return tarefa
+
+    def _executar(self, tarefa, gerar):
+        tarefa.estado = EXECUTANDO
+        inicio = time.perf_counter()
+        try:
+            self.armazem.gravar(tarefa.chave, lambda arquivo: gerar(arquivo, tarefa._atualizar_progresso))
+        except Exception as erro:
+            tarefa.segundos = time.perf_counter() - inicio
+            tarefa._finalizar(FALHA, f"{type(erro).__name__}: {erro}")
+            with self._lock:
+                self._contadores["falhas"] += 1
+            return
+        tarefa.segundos = time.perf_counter() - inicio
+        tarefa._finalizar(CONCLUIDA)
+        with self._lock:
+            self._contadores["concluidas"] += 1
+
+    def _limpar_se_preciso(self):
+        """Limpa o armazém na primeira chamada e depois a cada ``INTERVALO_LIMPEZA``"""
+        agora = time.monotonic()
+        with self._lock:
+            if self._ultima_limpeza is not None and agora - self._ultima_limpeza < INTERVALO_LIMPEZA:
+                return
+            self._ultima_limpeza = agora
+        apagados, _ = self.armazem.limpar()
+        with self._lock:
+            self._contadores["artefatosDescartados"] += apagados
+
+    def tarefa(self, chave):
+        """Tarefa conhecida de uma chave, ou None"""
+        with self._lock:
+            return self._tarefas.get(chave)
+
+    def estatisticas(self):
+        """Contadores da fila e tarefas ainda em andamento"""
+        with self._lock:
+            em_andamento = sum(not tarefa.finalizada for tarefa in self._tarefas.values())
+            return {**self._contadores, "emAndamento": em_andamento, "conhecidas": len(self._tarefas)}
+
+    def encerrar(self, aguardar=True):
+        """Encerra o pool de threads"""
+        self._executor.shutdown(wait=aguardar)
+
+
+def _versao_caso(caso):
+    versao = getattr(caso, 'versao', None)
+    if versao is None:
+        raise ValueError("Só casos com versão (auditoria.casos.Caso) podem ter resultados armazenados")
+    return versao
+
+
+def tarefa_relatorio(caso, data_atual=None, fila=None):
+    """Enfileira o relatório HTML do caso; a data do relatório faz parte da versão"""
+    data_atual = data_atual or datetime.now().strftime("%d/%m/%Y")
+    chave = (caso.num_beneficio, _versao_caso(caso), 'relatorio_previdenciario.html', f"{VERSAO_RELATORIO}|{data_atual}")
+    return (fila or fila_tarefas()).enfileirar(
+        chave, lambda arquivo, progresso: escrever_relatorio(caso, arquivo, data_atual, progresso)
+    )
+
+
+def tarefa_pdf(caso, data_atual=None, fila=None):
+    """Enfileira o relatório PDF do caso, com os gráficos"""
+    data_atual = data_atual or datetime.now().strftime("%d/%m/%Y")
+    chave = (caso.num_beneficio, _versao_caso(caso), 'relatorio_previdenciario.pdf', f"{VERSAO_PDF}|{data_atual}")
+    return (fila or fila_tarefas()).enfileirar(
+        chave, lambda arquivo, progresso: escrever_relatorio_pdf(caso, arquivo, data_atual, progresso)
+    )
+
+
+def tarefa_csv(caso, tabela, nome_arquivo, fila=None):
+    """Enfileira o CSV de uma tabela do caso"""
+    chave = (caso.num_beneficio, _versao_caso(caso), nome_arquivo, f"{VERSAO_CSV}|{tabela}")
+    return (fila or fila_tarefas()).enfileirar(
+        chave, lambda arquivo, progresso: escrever_csv(caso[tabela], arquivo, progresso=progresso)
+    )
+
+
+_FILA = None
+_LOCK_FILA = threading.Lock()
+
+
+def diretorio_resultados():
+    """Diretório padrão do armazém de resultados"""
+    return os.environ.get(VARIAVEL_RESULTADOS) or os.path.join(tempfile.gettempdir(), 'auditoria_resultados')
+
+
+def fila_tarefas():
+    """Fila de tarefas do processo, criada no primeiro uso"""
+    global _FILA
+    if _FILA is None:
+        with _LOCK_FILA:
+            if _FILA is None:
+                _FILA = FilaTarefas(ArmazemResultados(diretorio_resultados()))
+    return _FILA
+
@@ -0,0 +1,200 @@
+"""União de períodos de vínculos e contagem do tempo de contribuição
+
+Os períodos de todos os segurados são ordenados uma única vez por
+(segurado, início) e varridos com o máximo acumulado do fim: períodos que
+se sobrepõem ou se encostam viram um só, sem comparar vínculos dois a dois.
+O custo total é O(n log n), dominado pela ordenação.
+
+Datas aceitas: ``dd/mm/aaaa``, ``mm/aaaa`` (início no dia 1, fim no último
+dia do mês) e ``-`` para vínculo sem data de fim, que vai até o limite.
+"""
+
+import re
+from calendar import monthrange
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+DIAS_POR_MES = 30
+MESES_POR_ANO = 12
+_FORMATO_DATA = re.compile(r'\d{1,2}/\d{1,2}/\d{4}|\d{1,2}/\d{4}')
+
+
+@lru_cache(maxsize=65536)
+def data_ordinal(texto, fim_do_mes=False):
+    """Converte a data do vínculo em ordinal (``date.toordinal``); ``-`` e vazio viram -1"""
+    partes = texto.strip().split('/') if texto and texto.strip() not in ('-', '') else []
+    if len(partes) == 3:
+        return date(int(partes[2]), int(partes[1]), int(partes[0])).toordinal()
+    if len(partes) == 2:
+        mes, ano = int(partes[0]), int(partes[1])
+        return date(ano, mes, monthrange(ano, mes)[1] if fim_do_mes else 1).toordinal()
+    return -1
+
+
+def data_valida(texto):
+    """Indica se o texto é uma data de vínculo aceita por ``data_ordinal``"""
+    if not texto or texto.strip() in ('-', ''):
+        return True
+    if not _FORMATO_DATA.fullmatch(texto.strip()):
+        return False
+    try:
+        data_ordinal(texto)
+    except ValueError:
+        return False
+    return True
+
+
+def periodos_ordinais(inicios, fins, limite):
+    """Converte datas em arrays de ordinais ``[inicio, fim]`` (inclusivos)
+
+    ``limite`` (uma ``date``, em geral a DER) é exclusivo: o tempo conta até
+    a véspera e vínculos sem fim terminam nela. Períodos sem início ou que
+    começam no limite ou depois ficam vazios (fim < início).
+    """
+    ultimo_dia = limite.toordinal() - 1
+    inicio = np.fromiter((data_ordinal(texto) for texto in inicios), dtype=np.int64, count=len(inicios))
+    fim = np.fromiter((data_ordinal(texto, True) for texto in fins), dtype=np.int64, count=len(fins))
+    fim = np.where(fim < 0, ultimo_dia, np.minimum(fim, ultimo_dia))
+    fim = np.where(inicio < 0, inicio - 1, fim)
+    return inicio, fim
+
+
+class IndiceVinculos:
+    """Períodos de vínculos de uma carteira, unidos por segurado
+
+    ``segurados`` traz um código inteiro (0..m-1) do segurado de cada
+    período; ``inicios`` e ``fins`` são ordinais inclusivos. Períodos vazios
+    (fim < início) são ignorados.
+    """
+
+    def __init__(self, segurados, inicios, fins, quantidade_segurados=None):
+        segurados = np.asarray(segurados, dtype=np.int64)
+        inicios = np.asarray(inicios, dtype=np.int64)
+        fins = np.asarray(fins, dtype=np.int64)
+        self.quantidade_segurados = (
+            int(segurados.max()) + 1 if quantidade_segurados is None and len(segurados) else quantidade_segurados or 0
+        )
+        validos = np.flatnonzero(fins >= inicios)
+        ordem = validos[np.lexsort((fins[validos], inicios[validos], segurados[validos]))]
+        self._ordem = ordem
+        self._total = len(segurados)
+        grupo, inicio, fim = segurados[ordem], inicios[ordem], fins[ordem]
+
+        # Deslocar cada segurado para uma faixa própria permite um único
+        # máximo acumulado para a carteira inteira
+        faixa = (max(int(fins.max()), 0) + 2) if len(fins) else 1
+        fim_max = np.maximum.accumulate(fim + grupo * faixa) - grupo * faixa
+        fim_anterior = np.concatenate(([np.iinfo(np.int64).min], fim_max[:-1]))
+        novo_grupo = np.concatenate(([True], grupo[1:] != grupo[:-1]))
+        fim_anterior[novo_grupo] = np.iinfo(np.int64).min
+
+        # Sobreposição de fato (não apenas períodos contíguos)
+        sobrepoe_anterior = inicio <= fim_anterior
+        mesmo_grupo_seguinte = np.concatenate((grupo[1:] == grupo[:-1], [False]))
+        inicio_seguinte = np.concatenate((inicio[1:], [0]))
+        sobrepoe_seguinte = mesmo_grupo_seguinte & (fim >= inicio_seguinte)
+        self._concomitantes = sobrepoe_anterior | sobrepoe_seguinte
+
+        # Um novo bloco começa quando o período não encosta no anterior
+        comeca_bloco = inicio > fim_anterior + 1
+        blocos = np.cumsum(comeca_bloco) - 1
+        quantidade_blocos = int(blocos[-1]) + 1 if len(blocos) else 0
+        self.segurado_bloco = grupo[comeca_bloco]
+        self.inicio_bloco = inicio[comeca_bloco]
+        self.fim_bloco = np.full(quantidade_blocos, np.iinfo(np.int64).min)
+        np.maximum.at(self.fim_bloco, blocos, fim)
+
+    def concomitantes(self):
+        """Máscara, na ordem de entrada, dos períodos que se sobrepõem a outro do mesmo segurado"""
+        mascara = np.zeros(self._total, dtype=bool)
+        mascara[self._ordem] = self._concomitantes
+        return mascara
+
+    def dias_cobertos(self):
+        """Dias cobertos pela união dos períodos de cada segurado"""
+        return np.bincount(
+            self.segurado_bloco, weights=self.fim_bloco - self.inicio_bloco + 1,
+            minlength=self.quantidade_segurados
+        ).astype(np.int64)
+
+    def tempo_contribuicao(self):
+        """Anos, meses e dias de cada segurado, somando os períodos unidos
+
+        Cada período unido é contado pela diferença de calendário entre o
+        início e o dia seguinte ao fim; a soma é normalizada com meses de
+        30 dias e anos de 12 meses, como na contagem de tempo do INSS.
+        """
+        anos, meses, dias = _diferenca_calendario(_datas(self.inicio_bloco), _datas(self.fim_bloco + 1))
+        anos = np.bincount(self.segurado_bloco, weights=anos, minlength=self.quantidade_segurados).astype(np.int64)
+        meses = np.bincount(self.segurado_bloco, weights=meses, minlength=self.quantidade_segurados).astype(np.int64)
+        dias = np.bincount(self.segurado_bloco, weights=dias, minlength=self.quantidade_segurados).astype(np.int64)
+        meses, dias = meses + dias // DIAS_POR_MES, dias % DIAS_POR_MES
+        anos, meses = anos + meses // MESES_POR_ANO, meses % MESES_POR_ANO
+        return anos, meses, dias
+
+
+ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def _datas(ordinais):
+    """Converte ordinais em ``datetime64[D]``"""
+    return (np.asarray(ordinais, dtype=np.int64) - ORDINAL_EPOCA).astype('datetime64[D]')
+
+
+def _componentes(datas):
+    """Ano, mês (1-12) e dia de um array ``datetime64[D]``"""
+    anos_mes = datas.astype('datetime64[M]')
+    ano = anos_mes.astype('datetime64[Y]').astype(np.int64) + 1970
+    mes = (anos_mes - anos_mes.astype('datetime64[Y]')).astype(np.int64) + 1
+    dia = (datas - anos_mes).astype(np.int64) + 1
+    return ano, mes, dia
+
+
+def _diferenca_calendario(inicio, fim_exclusivo):
+    """Diferença em anos, meses e dias (meses de 30 dias para o resto negativo)"""
+    ano_inicio, mes_inicio, dia_inicio = _componentes(inicio)
+    ano_fim, mes_fim, dia_fim = _componentes(fim_exclusivo)
+    dias = dia_fim - dia_inicio
+    meses = mes_fim - mes_inicio - (dias < 0)
+    dias = np.where(dias < 0, dias + DIAS_POR_MES, dias)
+    anos = ano_fim - ano_inicio - (meses < 0)
+    meses = np.where(meses < 0, meses + MESES_POR_ANO, meses)
+    return anos, meses, dias
+
+
+def dias_cobertos(periodos, limite):
+    """Dias cobertos pela união dos períodos ``(inicio, fim)`` de um segurado, até ``limite``"""
+    periodos = list(periodos)
+    inicios, fins = periodos_ordinais([p[0] for p in periodos], [p[1] for p in periodos], limite)
+    return int(IndiceVinculos(np.zeros(len(periodos), dtype=np.int64), inicios, fins, 1).dias_cobertos()[0])
+
+
+def analisar_vinculos(vinculos, limite):
+    """Tempo de contribuição e concomitâncias dos vínculos de um segurado
+
+    ``vinculos`` é a tabela (ou lista de dicionários) no formato de
+    ``vinculos_empregaticos``; ``limite`` é a DER (exclusiva).
+    """
+    seqs = _coluna(vinculos, 'seq')
+    inicios, fins = periodos_ordinais(_coluna(vinculos, 'inicio'), _coluna(vinculos, 'fim'), limite)
+    indice = IndiceVinculos(np.zeros(len(seqs), dtype=np.int64), inicios, fins, 1)
+    anos, meses, dias = indice.tempo_contribuicao()
+    concomitantes = indice.concomitantes()
+    return {
+        "tempoContribuicao": {"anos": int(anos[0]), "meses": int(meses[0]), "dias": int(dias[0])},
+        "diasCobertos": int(indice.dias_cobertos()[0]),
+        "concomitantes": [seq for seq, concomitante in zip(seqs, concomitantes) if concomitante],
+        "periodos": [
+            (date.fromordinal(int(inicio)).strftime('%d/%m/%Y'), date.fromordinal(int(fim)).strftime('%d/%m/%Y'))
+            for inicio, fim in zip(indice.inicio_bloco, indice.fim_bloco)
+        ]
+    }
+
+
+def _coluna(tabela, nome):
+    """Valores de uma coluna de DataFrame ou de uma lista de dicionários"""
+    if hasattr(tabela, 'columns'):
+        return tabela[nome].tolist()
+    return [linha[nome] for linha in tabela]